@@ -1,8 +1,9 @@
 # EDA_analysis.py
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from date_utils import parse_utc_dates
+from sentiment_engine import DEFAULT_CHUNKSIZE, parallel_score, vader_scorer
+from sentiment_categories import SENTIMENT_THRESHOLDS, categorize_column
 
 class EDA:
     def __init__(self, dataframe):
@@ -17,24 +18,13 @@ class EDA:
         Parses and converts dates to UTC format in the 'date' column. 
         Sorts the DataFrame by the 'date' column after parsing.
         """
-        def parse_date(date):
-            try:
-                # Attempt parsing with the specific format
-                dt = pd.to_datetime(date, format='%Y-%m-%d %H:%M:%S')
-            except:
-                try:
-                    # Attempt automatic inference if the first attempt fails
-                    dt = pd.to_datetime(date, errors='coerce')
-                except:
-                    return pd.NaT  # If all parsing fails, return NaT
-            # Ensure tz-aware (convert to UTC)
-            return dt.tz_convert('UTC') if dt is not pd.NaT and dt.tzinfo else dt.tz_localize('UTC')
-
         if 'date' not in self.dataframe.columns:
             raise ValueError("The dataframe does not contain a 'date' column.")
         
-        # Apply parsing to the 'date' column
-        self.dataframe['date'] = self.dataframe['date'].apply(parse_date)
+        # Parse the 'date' column in vectorized passes (naive timestamps are taken as UTC)
+        self.dataframe['date'], n_coerced = parse_utc_dates(self.dataframe['date'])
+        if n_coerced:
+            print(f"Warning: {n_coerced} dates could not be parsed and were dropped.")
         # Drop rows with invalid dates (NaT)
         self.dataframe = self.dataframe.dropna(subset=['date'])
         # Sort the DataFrame by 'date'
@@ -83,7 +73,8 @@ class EDA:
         """
         Plots a heatmap of correlations for numerical features in the dataset.
         """
-        numerical_data = self.dataframe.select_dtypes(include=['float64', 'int64'])
+        # Any numeric dtype, so compacted int8/int16/float32 columns are kept
+        numerical_data = self.dataframe.select_dtypes('number')
         if numerical_data.empty:
             print("No numerical features found for correlation heatmap.")
             return
@@ -95,35 +86,34 @@ class EDA:
         
 
     
-    def sentiment_score(self):
+    def sentiment_score(self, n_jobs=1, chunksize=DEFAULT_CHUNKSIZE):
         """
         Calculates sentiment scores for text data in the 'headline' column using SentimentIntensityAnalyzer.
-        """
-        
-        analyzer = SentimentIntensityAnalyzer()
 
+        Args:
+            n_jobs (int): Number of worker processes; 1 scores in the current process, None or -1 uses all cores.
+            chunksize (int): Number of headlines sent to a worker per task.
+        """
         if 'headline' not in self.dataframe.columns:
             raise ValueError("The dataframe does not contain a 'headline' column.")
         
-        def calculate_sentiment(text):
-            sentiment = analyzer.polarity_scores(text)
-            return sentiment['compound']  # Use the compound score
-        
-        # Apply sentiment calculation
-        self.dataframe['sentiment'] = self.dataframe['headline'].apply(calculate_sentiment)
+        # Score the headlines, sharded across worker processes when n_jobs > 1
+        scores = parallel_score(self.dataframe['headline'].tolist(), vader_scorer, n_jobs=n_jobs, chunksize=chunksize)
+        self.dataframe['sentiment'] = scores[:, -1]  # Use the compound score
         print(self.dataframe[['headline', 'sentiment']].head())
 
-    def setement_category(self):
+    def setement_category(self, thresholds=SENTIMENT_THRESHOLDS):
         """
         Categorizes sentiment based on sentiment scores and visualizes the proportions.
+
+        Args:
+            thresholds (tuple): (lower, upper) bounds of the neutral band.
         """
         if 'sentiment' not in self.dataframe.columns:
             raise ValueError("The dataframe does not contain a 'sentiment' column. Please calculate sentiment scores first.")
         
         # Categorize sentiments
-        self.dataframe['sentiment_category'] = self.dataframe['sentiment'].apply(
-            lambda x: 'positive' if x > 0.1 else 'negative' if x < -0.1 else 'neutral'
-        )
+        categorize_column(self.dataframe, 'sentiment', thresholds=thresholds)
         
         # Calculate and plot proportions
         sentiment_counts = self.dataframe['sentiment_category'].value_counts(normalize=True)
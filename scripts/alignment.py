@@ -0,0 +1,147 @@
+# alignment.py
+import numpy as np
+import pandas as pd
+
+from date_utils import parse_local_times
+
+_NS_PER_DAY = 86400 * 10**9
+
+# Largest (stock x day) grid, relative to the number of bars, that gets a dense lookup table
+DENSE_TABLE_RATIO = 8
+
+
+def to_local_times(values, timezone=None):
+    """
+    Converts a date column to naive datetimes in the exchange's local time.
+
+    Parameters:
+        values (pd.Series): Date strings or datetimes.
+        timezone (str, optional): Time zone tz-aware values are converted to before dropping the
+            zone (e.g. 'America/New_York'); without it their wall time is kept.
+
+    Returns:
+        pd.Series: Naive datetime64[ns] values, NaT where unparseable.
+    """
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.DatetimeTZDtype) and timezone is not None:
+        values = values.dt.tz_convert(timezone)
+    parsed, _ = parse_local_times(values)
+    return parsed.astype('datetime64[ns]')
+
+
+def session_days(times, session_close=None):
+    """
+    Trading day each timestamp belongs to, as int64 days since the epoch (-1 for NaT).
+
+    Parameters:
+        times (pd.Series): Naive local datetimes.
+        session_close (str, optional): Closing time such as '16:00'; timestamps at or after it
+            count towards the following day.
+    """
+    ns = times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    missing = times.isna().to_numpy()
+    if session_close is not None:
+        ns = ns + (_NS_PER_DAY - pd.to_timedelta(f"{session_close}:00").value)
+    days = np.floor_divide(ns, _NS_PER_DAY)
+    return np.where(missing, -1, days)
+
+
+def days_to_dates(days):
+    """
+    Converts int64 days since the epoch back to naive datetime64[ns] dates.
+    """
+    return (np.asarray(days, dtype=np.int64) * _NS_PER_DAY).astype('datetime64[ns]')
+
+
+class StockDateIndex:
+    def __init__(self, prices, date_column='date', stock_column='stock', timezone=None):
+        """
+        Sorted (stock, trading day) index over price bars, built once and used for exact and as-of lookups.
+
+        Each bar is encoded as one int64 key, stock code * span + day offset, so a lookup for
+        many (stock, day) pairs is a single np.searchsorted over the sorted keys, or a gather
+        from a precomputed slot table when the grid is dense enough.
+
+        Parameters:
+            prices (pd.DataFrame): Price bars with date and stock columns.
+            date_column (str): Column holding the bar dates.
+            stock_column (str): Column holding the tickers.
+            timezone (str, optional): Time zone tz-aware dates are converted to.
+        """
+        self.stocks = pd.Index(pd.unique(prices[stock_column].to_numpy()))
+        codes = self.stocks.get_indexer(prices[stock_column].to_numpy())
+        days = session_days(to_local_times(prices[date_column], timezone))
+        valid = days >= 0
+        # Trading day of every bar, by row position in the price frame
+        self.bar_days = days
+
+        self.first_day = days[valid].min() if valid.any() else 0
+        # Room for one day past the last bar so as-of targets beyond it never wrap into the next stock
+        self.span = (days[valid].max() - self.first_day + 2) if valid.any() else 1
+        keys = codes.astype(np.int64) * self.span + (days - self.first_day)
+
+        positions = np.flatnonzero(valid)
+        order = np.argsort(keys[positions], kind='stable')
+        self.positions = positions[order]
+        self.keys = keys[self.positions]
+        self.codes = codes[self.positions]
+        self.calendar = np.unique(days[valid])
+
+        # Daily bars fill most of the (stock x day) grid, so precompute the searchsorted slot of
+        # every possible key once; a lookup is then a gather instead of a binary search per item
+        n_cells = len(self.stocks) * self.span
+        self.slot_table = None
+        if n_cells <= DENSE_TABLE_RATIO * max(len(self.keys), 1):
+            table = np.full(n_cells, len(self.keys), dtype=np.int64)
+            table[self.keys] = np.arange(len(self.keys))
+            self.slot_table = np.minimum.accumulate(table[::-1])[::-1]
+
+    def _target_keys(self, stocks, days):
+        codes = self.stocks.get_indexer(np.asarray(stocks))
+        # Days outside the indexed range are clipped to its edges, past the end means no match
+        offsets = np.clip(days - self.first_day, 0, self.span - 1)
+        valid = (codes >= 0) & (days >= 0)
+        return codes, codes.astype(np.int64) * self.span + offsets, valid
+
+    def lookup(self, stocks, days, how='exact', max_days=None):
+        """
+        Finds the bar matching each (stock, day) pair.
+
+        Parameters:
+            stocks (array-like): Tickers of the lookups.
+            days (np.ndarray): Trading days as returned by session_days.
+            how (str): 'exact' for the bar of the same day, 'asof' for the first bar on or after the day.
+            max_days (int, optional): For 'asof', largest number of days a match may lie ahead.
+
+        Returns:
+            np.ndarray: Row position in the price frame of the matching bar, -1 where there is none.
+        """
+        if how not in ('exact', 'asof'):
+            raise ValueError("how must be 'exact' or 'asof'.")
+        codes, keys, valid = self._target_keys(stocks, days)
+        if len(self.keys) == 0:
+            return np.full(len(keys), -1)
+        if self.slot_table is not None:
+            slots = self.slot_table[np.where(valid, keys, 0)]
+        else:
+            slots = np.searchsorted(self.keys, keys, side='left')
+        found = valid & (slots < len(self.keys))
+        slots = np.minimum(slots, len(self.keys) - 1)
+        if how == 'exact':
+            found &= (days >= self.first_day) & (self.keys[slots] == keys)
+        else:
+            found &= self.codes[slots] == codes
+            if max_days is not None:
+                # Distance to the unclipped target, so days before the first bar are not pulled onto it
+                found &= (self.keys[slots] - codes.astype(np.int64) * self.span) - (days - self.first_day) <= max_days
+        return np.where(found, self.positions[slots], -1)
+
+    def next_session(self, days):
+        """
+        First trading day (of any stock) on or after each day, -1 where there is none.
+        """
+        if len(self.calendar) == 0:
+            return np.full(len(days), -1)
+        slots = np.searchsorted(self.calendar, days, side='left')
+        inside = (days >= 0) & (slots < len(self.calendar))
+        return np.where(inside, self.calendar[np.minimum(slots, len(self.calendar) - 1)], -1)
@@ -0,0 +1,1033 @@
+# benchmark.py
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from csv_loader import CSVLoader
+from sentiment_engine import DEFAULT_CHUNKSIZE, parallel_score, nltk_scorer
+
+# Vocabulary used to build synthetic analyst-ratings style headlines
+_SUBJECTS = ['Apple', 'Amazon', 'Tesla', 'Google', 'Meta', 'Nvidia', 'Microsoft', 'Shares of AAPL', 'Stocks']
+_VERBS = ['surge', 'fall', 'rise', 'plunge', 'beat estimates', 'miss estimates', 'trade higher', 'trade lower',
+          'hit new highs', 'are downgraded', 'are upgraded', 'remain flat', 'gain', 'drop']
+_TAILS = ['after strong earnings', 'on weak guidance', 'amid market fears', 'despite good news',
+          'following analyst upgrade', 'ahead of the report', 'in premarket trading', 'on record revenue',
+          'as investors worry', '', '']
+
+
+def synthetic_headlines(n, seed=0):
+    """
+    Generates synthetic headlines resembling the analyst-ratings news feed.
+
+    Parameters:
+        n (int): Number of headlines to generate.
+        seed (int): Random seed.
+
+    Returns:
+        list: Headlines as strings.
+    """
+    rng = np.random.default_rng(seed)
+    subjects = rng.choice(_SUBJECTS, n)
+    verbs = rng.choice(_VERBS, n)
+    tails = rng.choice(_TAILS, n)
+    return [f"{s} {v} {t}".strip() for s, v, t in zip(subjects, verbs, tails)]
+
+
+def time_call(func, *args, **kwargs):
+    """
+    Runs a function once and measures its wall time.
+
+    Returns:
+        tuple: (result, elapsed seconds)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def benchmark_parallel_scoring(n_headlines=1000000, worker_counts=(1, 2, 4, 8), chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Measures how sharded sentiment scoring scales with the number of worker processes.
+
+    Parameters:
+        n_headlines (int): Number of synthetic headlines to score.
+        worker_counts (tuple): Worker pool sizes to compare; the first one is the speedup baseline.
+        chunksize (int): Number of headlines per shard.
+
+    Returns:
+        pd.DataFrame: Wall time, speedup and parallel efficiency per worker count.
+    """
+    texts = synthetic_headlines(n_headlines)
+    rows = []
+    for n_jobs in worker_counts:
+        _, elapsed = time_call(parallel_score, texts, nltk_scorer, n_jobs=n_jobs, chunksize=chunksize)
+        rows.append({'n_jobs': n_jobs, 'seconds': elapsed})
+
+    results = pd.DataFrame(rows)
+    results['speedup'] = results['seconds'].iloc[0] / results['seconds']
+    results['efficiency'] = results['speedup'] * results['n_jobs'].iloc[0] / results['n_jobs']
+    print(results)
+    return results
+
+
+def write_synthetic_price_files(folder_path, n_files=300, n_rows=2500, seed=0):
+    """
+    Writes yfinance-style price CSV files with random-walk prices, one per synthetic ticker.
+
+    Parameters:
+        folder_path (str): Folder to write the files into (created if missing).
+        n_files (int): Number of ticker files.
+        n_rows (int): Number of daily bars per file.
+        seed (int): Random seed.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2010-01-04', periods=n_rows).strftime('%Y-%m-%d')
+    for i in range(n_files):
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n_rows)))
+        df = pd.DataFrame({
+            'Date': dates,
+            'Open': close * (1 + rng.normal(0, 0.005, n_rows)),
+            'High': close * 1.01,
+            'Low': close * 0.99,
+            'Close': close,
+            'Adj Close': close * 0.98,
+            'Volume': rng.integers(10 ** 5, 10 ** 8, n_rows),
+            'Dividends': 0.0,
+            'Stock Splits': 0.0,
+        })
+        df.to_csv(os.path.join(folder_path, f"T{i:03d}_historical_data.csv"), index=False)
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return float('nan')
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_isolated(func, *args):
+    # Run in a fresh process so each measurement gets its own peak RSS
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(func, *args).result()
+
+
+def _measure_csv_loader(folder_path, parallel):
+    loader = CSVLoader(folder_path)
+    start = time.perf_counter()
+    if parallel:
+        loader.load_csv_files_parallel()
+    else:
+        loader.load_csv_files()
+    merged = loader.merge_dataframes()
+    elapsed = time.perf_counter() - start
+    return elapsed, _peak_rss_mb(), merged.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def benchmark_csv_loading(folder_path=None, n_files=300, n_rows=2500):
+    """
+    Compares the serial CSVLoader.load_csv_files with the typed parallel loader.
+
+    Parameters:
+        folder_path (str, optional): Folder of price CSV files; synthetic files are generated when omitted.
+        n_files (int): Number of synthetic ticker files to generate.
+        n_rows (int): Number of daily bars per synthetic file.
+
+    Returns:
+        pd.DataFrame: Wall time, peak RSS and merged frame size for each loader.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if folder_path is None:
+            folder_path = tmp_dir
+            write_synthetic_price_files(folder_path, n_files=n_files, n_rows=n_rows)
+
+        rows = []
+        for name, parallel in (('serial', False), ('parallel_typed', True)):
+            seconds, peak_rss_mb, frame_mb = _run_isolated(_measure_csv_loader, folder_path, parallel)
+            rows.append({'loader': name, 'seconds': seconds, 'peak_rss_mb': peak_rss_mb, 'frame_mb': frame_mb})
+
+    results = pd.DataFrame(rows)
+    print(results)
+    return results
+
+
+def write_synthetic_news_file(file_path, n_rows=1000000, n_stocks=500, seed=0):
+    """
+    Writes an analyst-ratings style news CSV file with synthetic headlines.
+
+    Parameters:
+        file_path (str): Path of the CSV file to write.
+        n_rows (int): Number of articles.
+        n_stocks (int): Number of distinct tickers.
+        seed (int): Random seed.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp('2011-01-03') + pd.to_timedelta(rng.integers(0, 10 * 365 * 86400, n_rows), unit='s')
+    dates = timestamps.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+    # Like the real feed, part of the timestamps carry a UTC offset
+    with_offset = rng.random(n_rows) < 0.5
+    dates[with_offset] = dates[with_offset] + '-04:00'
+    df = pd.DataFrame({
+        'headline': synthetic_headlines(n_rows, seed=seed),
+        'url': 'https://www.benzinga.com/news',
+        'publisher': rng.choice(['Benzinga Newsdesk', 'Lisa Levin', 'ETF Professor', 'Paul Quintaro'], n_rows),
+        'date': dates,
+        'stock': np.char.add('T', rng.integers(0, n_stocks, n_rows).astype(str)),
+    })
+    df.to_csv(file_path)
+
+
+def _measure_daily_sentiment(file_path, streaming, chunksize):
+    from news_stream import daily_sentiment, stream_daily_sentiment
+    from sentiment import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+    baseline_rss_mb = _peak_rss_mb()
+    start = time.perf_counter()
+    if streaming:
+        daily = stream_daily_sentiment(file_path, analyzer, chunksize=chunksize)
+    else:
+        daily = daily_sentiment(pd.read_csv(file_path), analyzer)
+    return time.perf_counter() - start, baseline_rss_mb, _peak_rss_mb(), daily
+
+
+def benchmark_news_streaming(file_path=None, n_rows=1000000, n_stocks=50, chunksize=100000):
+    """
+    Compares peak memory of the in-memory and streaming daily sentiment pipelines.
+
+    Parameters:
+        file_path (str, optional): News CSV file; a synthetic one is generated when omitted.
+        n_rows (int): Number of synthetic articles to generate.
+        n_stocks (int): Number of distinct synthetic tickers.
+        chunksize (int): Rows per chunk for the streaming pipeline.
+
+    Returns:
+        pd.DataFrame: Wall time, peak RSS after imports ('baseline_rss_mb') and at the end per pipeline,
+        and the largest difference between their outputs.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if file_path is None:
+            file_path = os.path.join(tmp_dir, 'news.csv')
+            write_synthetic_news_file(file_path, n_rows=n_rows, n_stocks=n_stocks)
+
+        rows, outputs = [], []
+        for name, streaming in (('in_memory', False), ('streaming', True)):
+            seconds, baseline_rss_mb, peak_rss_mb, daily = _run_isolated(_measure_daily_sentiment, file_path,
+                                                                         streaming, chunksize)
+            rows.append({'pipeline': name, 'seconds': seconds, 'baseline_rss_mb': baseline_rss_mb,
+                         'peak_rss_mb': peak_rss_mb})
+            outputs.append(daily)
+
+    results = pd.DataFrame(rows)
+    numeric = outputs[0].select_dtypes('number').columns
+    results['max_abs_diff'] = float((outputs[0][numeric] - outputs[1][numeric]).abs().max().max())
+    print(results)
+    return results
+
+
+def _legacy_parse_date(date):
+    # Per-row parser formerly used by EDA.parse_dates
+    try:
+        dt = pd.to_datetime(date, format='%Y-%m-%d %H:%M:%S')
+    except Exception:
+        try:
+            dt = pd.to_datetime(date, errors='coerce')
+        except Exception:
+            return pd.NaT
+    return dt.tz_convert('UTC') if dt is not pd.NaT and dt.tzinfo else dt.tz_localize('UTC')
+
+
+def benchmark_date_parsing(n_rows=1000000, legacy_rows=None, seed=0):
+    """
+    Compares the vectorized date parsers with the former per-row implementations.
+
+    Parameters:
+        n_rows (int): Number of synthetic analyst-ratings timestamps (half of them with a '-04:00' offset).
+        legacy_rows (int, optional): Number of rows given to the per-row parsers, whose time is
+            extrapolated to n_rows; defaults to n_rows.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Wall time of each parser (per-row ones extrapolated) and the speedup.
+    """
+    from date_utils import parse_local_days, parse_utc_dates
+
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp('2011-01-03') + pd.to_timedelta(rng.integers(0, 10 * 365 * 86400, n_rows), unit='s')
+    dates = pd.Series(timestamps.strftime('%Y-%m-%d %H:%M:%S'))
+    with_offset = rng.random(n_rows) < 0.5
+    dates[with_offset] = dates[with_offset] + '-04:00'
+    legacy_dates = dates.iloc[:legacy_rows or n_rows]
+    scale = n_rows / len(legacy_dates)
+
+    _, utc_seconds = time_call(parse_utc_dates, dates)
+    _, legacy_utc_seconds = time_call(legacy_dates.apply, _legacy_parse_date)
+    _, days_seconds = time_call(parse_local_days, dates)
+    _, legacy_days_seconds = time_call(
+        lambda: pd.to_datetime(legacy_dates.apply(lambda x: x[:10] if len(x) > 10 else x)))
+
+    results = pd.DataFrame([
+        {'parser': 'utc_timestamps', 'legacy_seconds': legacy_utc_seconds * scale, 'seconds': utc_seconds},
+        {'parser': 'local_days', 'legacy_seconds': legacy_days_seconds * scale, 'seconds': days_seconds},
+    ])
+    results['speedup'] = results['legacy_seconds'] / results['seconds']
+    print(results)
+    return results
+
+
+def synthetic_price_frame(n_tickers=500, n_bars=2520, seed=0):
+    """
+    Builds a long price frame of random-walk closing prices, one block of bars per ticker.
+
+    Returns:
+        pd.DataFrame: Columns 'date', 'stock' and 'Close'.
+    """
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_bars, n_tickers)), axis=0))
+    return pd.DataFrame({
+        'date': np.tile(pd.bdate_range('2014-01-02', periods=n_bars).to_numpy(), n_tickers),
+        'stock': np.repeat([f"T{i:03d}" for i in range(n_tickers)], n_bars),
+        'Close': close.T.ravel(),
+    })
+
+
+def benchmark_indicators(n_tickers=500, n_bars=2520):
+    """
+    Compares the NumPy indicator engine (all tickers at once) with pyti 0.3 (one ticker at a time).
+
+    Parameters:
+        n_tickers (int): Number of synthetic tickers.
+        n_bars (int): Daily bars per ticker (2520 is about 10 years).
+
+    Returns:
+        pd.DataFrame: Wall time of both implementations and the largest absolute difference per indicator.
+    """
+    from pyti.exponential_moving_average import exponential_moving_average as pyti_ema
+    from pyti.moving_average_convergence_divergence import moving_average_convergence_divergence as pyti_macd
+    from pyti.relative_strength_index import relative_strength_index as pyti_rsi
+    from pyti.simple_moving_average import simple_moving_average as pyti_sma
+    from indicators import compute_indicators
+
+    df = synthetic_price_frame(n_tickers, n_bars)
+
+    def run_pyti():
+        parts = []
+        for _, group in df.groupby('stock', sort=False):
+            close = group['Close'].tolist()
+            macd_line = pyti_macd(close, short_period=12, long_period=26)
+            parts.append(pd.DataFrame({
+                'SMA': pyti_sma(close, period=50),
+                'RSI': pyti_rsi(close, period=14),
+                'MACD_Line': macd_line,
+                'Signal_Line': pyti_ema(list(macd_line), period=9),
+            }, index=group.index))
+        return pd.concat(parts)
+
+    reference, pyti_seconds = time_call(run_pyti)
+    result, numpy_seconds = time_call(compute_indicators, df, group_column='stock')
+
+    rows = []
+    for column in result.columns:
+        diff = (result[column] - reference[column]).abs()
+        rows.append({'indicator': column, 'max_abs_diff': diff.max(),
+                     'nan_mismatches': int((result[column].isna() != reference[column].isna()).sum())})
+    results = pd.DataFrame(rows)
+    results['pyti_seconds'] = pyti_seconds
+    results['numpy_seconds'] = numpy_seconds
+    results['speedup'] = pyti_seconds / numpy_seconds
+    print(results)
+    return results
+
+
+def benchmark_streaming_indicators(n_tickers=500, n_bars=2520, n_new_bars=20):
+    """
+    Compares appending bars to StreamingIndicators with recomputing all indicators from scratch.
+
+    The state is built from the first n_bars - n_new_bars bars, checkpointed and restored, then
+    fed the remaining bars one at a time; the last update is checked against a full recompute.
+
+    Returns:
+        pd.DataFrame: Seconds per new bar for both approaches and the largest absolute difference per indicator.
+    """
+    from indicators import compute_indicators
+    from streaming_indicators import StreamingIndicators
+
+    df = synthetic_price_frame(n_tickers, n_bars)
+    history = df[df['date'] < df['date'].unique()[n_bars - n_new_bars]]
+    state, warm_up_seconds = time_call(StreamingIndicators.from_history, history)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'indicators.npz')
+        state.save(path)
+        state = StreamingIndicators.load(path)
+
+    new_bars = df[df['date'] >= df['date'].unique()[n_bars - n_new_bars]]
+    start = time.perf_counter()
+    for _, bar in new_bars.groupby('date', sort=True):
+        latest = state.update(bar.set_index('stock')['Close'])
+    update_seconds = (time.perf_counter() - start) / n_new_bars
+
+    full, recompute_seconds = time_call(compute_indicators, df, group_column='stock')
+    expected = full[df['date'] == df['date'].max()].set_index(df.loc[df['date'] == df['date'].max(), 'stock'])
+    results = pd.DataFrame([{'indicator': column, 'max_abs_diff': (latest[column] - expected[column]).abs().max()}
+                            for column in latest.columns])
+    results['warm_up_seconds'] = warm_up_seconds
+    results['update_seconds'] = update_seconds
+    results['recompute_seconds'] = recompute_seconds
+    results['speedup'] = recompute_seconds / update_seconds
+    print(results)
+    return results
+
+
+def benchmark_indicator_sweep(n_tickers=500, n_bars=2520, sma_periods=tuple(range(5, 205, 5)),
+                              rsi_periods=(7, 9, 14, 21, 28), macd_periods=((12, 26), (5, 35), (8, 17), (19, 39))):
+    """
+    Compares a parameter sweep in one pass with one FinancialAnalysis call per period.
+
+    Returns:
+        pd.DataFrame: Wall time of both approaches and the largest absolute difference.
+    """
+    from financial_analysis import FinancialAnalysis
+
+    df = synthetic_price_frame(n_tickers, n_bars)
+
+    def run_per_period():
+        analysis = FinancialAnalysis(df.copy(), group_column='stock')
+        results = {}
+        for period in sma_periods:
+            analysis.SimpleMovingAverage(period)
+            results[f"SMA_{period}"] = analysis.df[f"SMA_{period}"]
+        for period in rsi_periods:
+            analysis.RelativeStrengthIndex(period)
+            results[f"RSI_{period}"] = analysis.df[f"RSI_{period}"]
+        for short_period, long_period in macd_periods:
+            analysis.MovingAverageConvergenceDivergence(short_period, long_period)
+            results[f"MACD_{short_period}_{long_period}"] = analysis.df['MACD_Line']
+            results[f"Signal_{short_period}_{long_period}_9"] = analysis.df['Signal_Line']
+        return pd.DataFrame(results)
+
+    reference, loop_seconds = time_call(run_per_period)
+    analysis = FinancialAnalysis(df, group_column='stock')
+    sweep, sweep_seconds = time_call(analysis.IndicatorSweep, sma_periods, rsi_periods, macd_periods)
+
+    results = pd.DataFrame([{
+        'n_columns': sweep.shape[1],
+        'max_abs_diff': (sweep[reference.columns] - reference).abs().max().max(),
+        'per_period_seconds': loop_seconds,
+        'sweep_seconds': sweep_seconds,
+    }])
+    results['speedup'] = loop_seconds / sweep_seconds
+    print(results)
+    return results
+
+
+def _legacy_aligned_date_stock_price(merged_df, news_df):
+    # Previous Correlation.aligned_date_stock_price: date conversion and isin scans on every call
+    merged_df['date'] = pd.to_datetime(merged_df['date'])
+    news_df['date'] = pd.to_datetime(news_df['date'])
+    common_dates = merged_df['date'].isin(news_df['date'])
+    aligned_stock_data = merged_df[common_dates]
+    aligned_news_data = news_df[news_df['date'].isin(aligned_stock_data['date'])]
+    common_conditions = news_df['date'].isin(merged_df['date']) & news_df['stock'].isin(merged_df['stock'].unique())
+    return aligned_stock_data, aligned_news_data, news_df[common_conditions]
+
+
+def benchmark_alignment(n_news=1000000, n_tickers=500, n_bars=2520, seed=0):
+    """
+    Compares the sorted (stock, date) alignment engine with the previous isin-based alignment.
+
+    News timestamps are spread over the price calendar including weekends and after-hours times.
+
+    Returns:
+        pd.DataFrame: Wall time and number of aligned sentiment rows per method.
+    """
+    from correlation import Correlation
+
+    rng = np.random.default_rng(seed)
+    prices = synthetic_price_frame(n_tickers, n_bars, seed)
+    first, last = prices['date'].min(), prices['date'].max()
+    seconds = rng.integers(0, int((last - first).total_seconds()), n_news)
+    news = pd.DataFrame({
+        'date': (first + pd.to_timedelta(seconds, unit='s')).strftime('%Y-%m-%d %H:%M:%S'),
+        'stock': prices['stock'].unique()[rng.integers(0, n_tickers, n_news)],
+    })
+    news_days = news.assign(date=news['date'].str.slice(0, 10))
+
+    rows = []
+    (_, _, legacy), legacy_seconds = time_call(_legacy_aligned_date_stock_price, prices.copy(), news_days.copy())
+    rows.append({'method': 'legacy_isin', 'seconds': legacy_seconds, 'sentiment_rows': len(legacy)})
+
+    correlation = Correlation(prices, news)
+    for label, kwargs in (('exact_first_call', {}), ('exact', {}),
+                          ('asof_next_session', {'how': 'asof', 'session_close': '16:00'})):
+        (_, _, sentiment), seconds = time_call(correlation.aligned_date_stock_price, **kwargs)
+        rows.append({'method': label, 'seconds': seconds, 'sentiment_rows': len(sentiment)})
+
+    results = pd.DataFrame(rows)
+    results['speedup'] = legacy_seconds / results['seconds']
+    print(results)
+    return results
+
+
+def synthetic_scored_news(prices, n_news=1000000, seed=0):
+    """
+    Builds scored news rows on the trading days of a price frame, with random sentiment scores.
+
+    Returns:
+        pd.DataFrame: Columns 'headline', 'publisher', 'date', 'stock', 'sentiment_score',
+        'sentiment_category' and 'sentiment'.
+    """
+    rng = np.random.default_rng(seed)
+    bars = rng.integers(0, len(prices), n_news)
+    scores = np.round(rng.uniform(-1, 1, n_news), 4)
+    sentiment = np.select([scores > 0, scores < 0], [1, -1], 0)
+    return pd.DataFrame({
+        'headline': 'headline',
+        'publisher': 'publisher',
+        'date': prices['date'].to_numpy()[bars],
+        'stock': prices['stock'].to_numpy()[bars],
+        'sentiment_score': scores,
+        'sentiment_category': np.select([sentiment == 1, sentiment == -1], ['Positive', 'Negative'], 'Neutral'),
+        'sentiment': sentiment,
+    })
+
+
+def benchmark_sentiment_merge(n_tickers=500, n_bars=2520, n_news=1000000):
+    """
+    Compares the per-headline left merge with the pre-aggregated daily merge.
+
+    Returns:
+        pd.DataFrame: Wall time, output rows and output memory of both merge modes.
+    """
+    from sentiment import SentimentAnalyzer
+
+    prices = synthetic_price_frame(n_tickers, n_bars)
+    news = synthetic_scored_news(prices, n_news)
+
+    rows = []
+    for label, aggregate in (('per_article', False), ('daily_aggregate', True)):
+        merged, seconds = time_call(SentimentAnalyzer.merge_sentiment_stock_price, prices, news, aggregate=aggregate)
+        rows.append({'mode': label, 'seconds': seconds, 'rows': len(merged),
+                     'memory_mb': merged.memory_usage(deep=True).sum() / 2**20})
+    results = pd.DataFrame(rows)
+    print(results)
+    return results
+
+
+def benchmark_sentiment_categories(n_scores=1000000, seed=0):
+    """
+    Compares the shared vectorized categorizer with the row-by-row apply chain it replaces.
+
+    Returns:
+        pd.DataFrame: Wall time of both approaches, their memory use and whether they agree.
+    """
+    from sentiment_categories import categorize_sentiment
+
+    rng = np.random.default_rng(seed)
+    scores = pd.Series(np.round(rng.uniform(-1, 1, n_scores), 4))
+    mapping = {'negative': -1, 'neutral': 0, 'positive': 1}
+
+    def run_apply():
+        categories = scores.apply(lambda x: 'positive' if x > 0.1 else 'negative' if x < -0.1 else 'neutral')
+        return categories, categories.apply(lambda category: mapping.get(category, 0))
+
+    (legacy, legacy_numeric), apply_seconds = time_call(run_apply)
+    categories, vectorized_seconds = time_call(categorize_sentiment, scores)
+
+    results = pd.DataFrame([{
+        'apply_seconds': apply_seconds,
+        'vectorized_seconds': vectorized_seconds,
+        'speedup': apply_seconds / vectorized_seconds,
+        'apply_memory_mb': legacy.memory_usage(deep=True) / 2**20,
+        'vectorized_memory_mb': categories.memory_usage(deep=True) / 2**20,
+        'identical': bool((legacy.to_numpy() == np.asarray(categories)).all()
+                          and (legacy_numeric.to_numpy() == categories.codes - 1).all()),
+    }])
+    print(results)
+    return results
+
+
+def benchmark_compaction(n_tickers=500, n_bars=2520, n_news=1000000):
+    """
+    Measures the memory saved by compact() on a merged price/news frame.
+
+    Returns:
+        pd.DataFrame: Per-column memory report of the merged frame.
+    """
+    from compaction import compact, memory_report
+    from sentiment import SentimentAnalyzer
+
+    prices = synthetic_price_frame(n_tickers, n_bars)
+    news = synthetic_scored_news(prices, n_news)
+    news['headline'] = pd.Series(np.arange(n_news)).map('Headline number {}'.format)
+    news['publisher'] = np.array([f"publisher{i}" for i in range(200)])[np.arange(n_news) % 200]
+    merged = SentimentAnalyzer.merge_sentiment_stock_price(prices, news)
+
+    compacted, seconds = time_call(compact, merged, verbose=False)
+    report = memory_report(merged, compacted)
+    print(report)
+    print(f"compact() took {seconds:.2f} s")
+    return report
+
+
+def synthetic_returns(n_assets=200, n_days=1000, seed=0):
+    """
+    Daily returns of correlated synthetic assets, one column per asset.
+
+    Returns:
+        pd.DataFrame: (n_days x n_assets) returns.
+    """
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, (n_days, 1))
+    betas = rng.uniform(0.5, 1.5, n_assets)
+    drift = rng.normal(0.0003, 0.0003, n_assets)
+    returns = drift + market * betas + rng.normal(0, 0.015, (n_days, n_assets))
+    return pd.DataFrame(returns, columns=[f"T{i:03d}" for i in range(n_assets)])
+
+
+def benchmark_portfolio_optimizer(asset_counts=(20, 100, 200), n_days=1000, n_frontier=20, risk_free_rate=0.0):
+    """
+    Compares max-Sharpe SLSQP with finite differences on DataFrames against the analytic-gradient
+    solver on arrays, and cold against warm-started efficient frontier solves.
+
+    Returns:
+        pd.DataFrame: Wall time and Sharpe ratio per universe size.
+    """
+    from scipy.optimize import minimize
+    from portfolio_optimizer import efficient_frontier, max_sharpe_weights
+
+    rows = []
+    for n_assets in asset_counts:
+        returns = synthetic_returns(n_assets, n_days)
+        mu_frame, cov_frame = returns.mean(), returns.cov()
+
+        def legacy_sharpe():
+            def negative_sharpe(weights):
+                return -(np.dot(weights, mu_frame) - risk_free_rate) / np.sqrt(np.dot(weights.T, np.dot(cov_frame, weights)))
+            return minimize(negative_sharpe, np.full(n_assets, 1. / n_assets), bounds=[(0, 1)] * n_assets,
+                            constraints=({'type': 'eq', 'fun': lambda x: np.sum(x) - 1}))
+
+        legacy, legacy_seconds = time_call(legacy_sharpe)
+        mu, cov = mu_frame.to_numpy(), cov_frame.to_numpy()
+        result, seconds = time_call(max_sharpe_weights, mu, cov, risk_free_rate)
+
+        targets = np.linspace(mu.min(), mu.max(), n_frontier)
+        _, warm_seconds = time_call(efficient_frontier, mu, cov, targets)
+        # Cold start: every target solved independently from equal weights
+        _, cold_seconds = time_call(lambda: [efficient_frontier(mu, cov, [target]) for target in targets])
+
+        rows.append({
+            'n_assets': n_assets,
+            'legacy_seconds': legacy_seconds,
+            'analytic_seconds': seconds,
+            'legacy_sharpe': -legacy.fun,
+            'analytic_sharpe': -result.fun,
+            'frontier_cold_seconds': cold_seconds,
+            'frontier_warm_seconds': warm_seconds,
+        })
+    results = pd.DataFrame(rows)
+    results['speedup'] = results['legacy_seconds'] / results['analytic_seconds']
+    print(results.to_string())
+    return results
+
+
+def benchmark_walk_forward(n_assets=200, n_days=1500, window=252, rebalance_every=1):
+    """
+    Compares carrying the rolling covariance forward with rank-one updates against recomputing
+    it from the window at every rebalance date, and times a monthly walk-forward backtest.
+
+    Returns:
+        pd.DataFrame: Wall time of both covariance approaches and of the walk-forward solves.
+    """
+    from walk_forward import RollingMoments, walk_forward_weights
+
+    returns = synthetic_returns(n_assets, n_days)
+    values = returns.to_numpy()
+
+    def recompute():
+        return [np.cov(values[row + 1 - window:row + 1], rowvar=False)
+                for row in range(window - 1, n_days, rebalance_every)]
+
+    def incremental():
+        moments, covariances = RollingMoments(n_assets, window), []
+        for row in range(n_days):
+            moments.add(values[row])
+            if moments.count > window:
+                moments.remove(values[row - window])
+            if moments.ready and (row + 1 - window) % rebalance_every == 0:
+                covariances.append(moments.covariance())
+        return covariances
+
+    expected, recompute_seconds = time_call(recompute)
+    result, incremental_seconds = time_call(incremental)
+    max_diff = max(np.abs(a - b).max() for a, b in zip(expected, result))
+    weights, walk_forward_seconds = time_call(walk_forward_weights, returns, window=window, rebalance_every=21,
+                                              risk_free_rate=0.0)
+
+    results = pd.DataFrame([{
+        'n_assets': n_assets,
+        'rebalances': len(expected),
+        'recompute_seconds': recompute_seconds,
+        'incremental_seconds': incremental_seconds,
+        'speedup': recompute_seconds / incremental_seconds,
+        'max_abs_diff': max_diff,
+        'monthly_rebalances': len(weights),
+        'walk_forward_seconds': walk_forward_seconds,
+    }])
+    print(results.to_string())
+    return results
+
+
+def benchmark_portfolio_returns(n_tickers=500, n_bars=2520, n_news=1000000):
+    """
+    Compares the long-format groupby pipeline with the wide-matrix engine on a per-headline merged frame.
+
+    Returns:
+        pd.DataFrame: Wall time of both pipelines.
+    """
+    from portfolio_analysis import SentimentPortfolioAnalysis
+    from sentiment import SentimentAnalyzer
+
+    prices = synthetic_price_frame(n_tickers, n_bars)
+    merged = SentimentAnalyzer.merge_sentiment_stock_price(prices, synthetic_scored_news(prices, n_news))
+
+    def run_long():
+        df = merged.copy()
+        df['daily_return'] = df.groupby('stock')['Close'].pct_change()
+        df.pivot_table(index='date', columns='stock', values='daily_return')
+        df['weight'] = df['sentiment_score'] / df.groupby('date')['sentiment_score'].transform('sum')
+        df['weighted_return'] = df['weight'] * df['daily_return']
+        returns = df.groupby('date')['weighted_return'].sum().reset_index()
+        returns['cumulative_return'] = (1 + returns['weighted_return']).cumprod()
+        return returns
+
+    def run_wide():
+        analysis = SentimentPortfolioAnalysis(merged.copy())
+        analysis.calculate_daily_returns()
+        analysis.assign_sentiment_weights()
+        analysis.calculate_portfolio_returns()
+        return analysis.portfolio_returns
+
+    _, long_seconds = time_call(run_long)
+    _, wide_seconds = time_call(run_wide)
+    results = pd.DataFrame([{'rows': len(merged), 'long_seconds': long_seconds, 'wide_seconds': wide_seconds,
+                             'speedup': long_seconds / wide_seconds}])
+    print(results)
+    return results
+
+
+def benchmark_significance(n_tickers=500, n_bars=2520, n_resamples=10000, lags=(0,), n_jobs=None, seed=0):
+    """
+    Times the bootstrap / permutation significance engine on synthetic daily sentiment and returns.
+
+    Returns:
+        pd.DataFrame: Wall time in total and per stock and lag.
+    """
+    from significance import correlation_significance
+
+    rng = np.random.default_rng(seed)
+    sentiment = rng.standard_normal((n_tickers, n_bars))
+    frame = pd.DataFrame({
+        'date': np.tile(pd.bdate_range('2010-01-04', periods=n_bars), n_tickers),
+        'stock': np.repeat([f'T{i:03d}' for i in range(n_tickers)], n_bars),
+        'sentiment': sentiment.ravel(),
+        'Price_Change': (0.05 * sentiment + rng.standard_normal((n_tickers, n_bars))).ravel() * 0.01,
+    })
+    results, seconds = time_call(correlation_significance, frame, lags=lags, n_resamples=n_resamples, n_jobs=n_jobs)
+    summary = pd.DataFrame([{'tickers': n_tickers, 'bars': n_bars, 'lags': len(lags), 'resamples': n_resamples,
+                             'n_jobs': n_jobs or os.cpu_count(), 'seconds': seconds,
+                             'seconds_per_stock_lag': seconds / (n_tickers * len(lags)),
+                             'significant': int((results['p_value'] < 0.05).sum())}])
+    print(summary.to_string())
+    return summary
+
+
+def benchmark_lead_lag(n_tickers=500, n_bars=2520, n_news=1000000, max_lag=5, legacy_tickers=50):
+    """
+    Compares a shift + corr loop per stock and lag with the wide-matrix lead/lag correlation.
+
+    The loop is timed on legacy_tickers stocks and scaled to n_tickers.
+
+    Returns:
+        pd.DataFrame: Wall times and the largest difference between both results.
+    """
+    from lead_lag import lead_lag_correlation
+    from sentiment import SentimentAnalyzer
+
+    prices = synthetic_price_frame(n_tickers, n_bars)
+    merged = SentimentAnalyzer.merge_sentiment_stock_price(prices, synthetic_scored_news(prices, n_news))
+    lead_lag, matrix_seconds = time_call(lead_lag_correlation, merged, max_lag)
+
+    def run_loop(stocks):
+        rows = []
+        for stock in stocks:
+            daily = merged[merged['stock'] == stock].groupby('date').agg(
+                close=('Close', 'first'), sentiment=('sentiment_score', 'sum'))
+            returns = daily['close'].pct_change()
+            for lag in range(-max_lag, max_lag + 1):
+                rows.append({'stock': stock, 'lag': lag, 'corr': daily['sentiment'].corr(returns.shift(-lag))})
+        return pd.DataFrame(rows)
+
+    stocks = np.sort(merged['stock'].unique())[:legacy_tickers]
+    loop, loop_seconds = time_call(run_loop, stocks)
+    compared = loop.merge(lead_lag, on=['stock', 'lag'], suffixes=('_loop', '_matrix'))
+    results = pd.DataFrame([{
+        'tickers': n_tickers, 'lags': 2 * max_lag + 1, 'matrix_seconds': matrix_seconds,
+        'loop_seconds_scaled': loop_seconds * n_tickers / len(stocks),
+        'speedup': loop_seconds * n_tickers / len(stocks) / matrix_seconds,
+        'max_abs_diff': (compared['corr_loop'] - compared['corr_matrix']).abs().max(),
+    }])
+    print(results.to_string())
+    return results
+
+
+def _measure_topic_modeling(n_headlines, num_topics, mode, chunksize, model_path=None, n_increment=0):
+    from sklearn.decomposition import LatentDirichletAllocation
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from topic_stream import OnlineTopicModel, iter_text_chunks
+
+    headlines = np.array(synthetic_headlines(n_headlines), dtype=object)
+    start = time.perf_counter()
+    if mode == 'batch':
+        tfidf = TfidfVectorizer(stop_words='english', max_df=0.95, min_df=2).fit_transform(headlines)
+        lda = LatentDirichletAllocation(n_components=num_topics, random_state=42).fit(tfidf)
+        lda.transform(tfidf).argmax(axis=1)
+    else:
+        model = OnlineTopicModel(num_topics=num_topics, total_samples=n_headlines)
+        model.fit_stream(iter_text_chunks(headlines, chunksize))
+        model.dominant_topics(headlines, chunksize)
+        if model_path is not None:
+            model.save(model_path)
+    fit_seconds = time.perf_counter() - start
+
+    increment_seconds = float('nan')
+    if model_path is not None and n_increment:
+        # A daily increment: load the saved model and update it with new headlines only
+        new_headlines = synthetic_headlines(n_increment, seed=1)
+        start = time.perf_counter()
+        OnlineTopicModel.load(model_path).partial_fit(new_headlines).save(model_path)
+        increment_seconds = time.perf_counter() - start
+    return fit_seconds, increment_seconds, _peak_rss_mb()
+
+
+def benchmark_topic_modeling(n_headlines=1000000, num_topics=5, chunksize=50000, n_increment=10000):
+    """
+    Compares batch TF-IDF + LDA with the hashed online LDA on synthetic headlines.
+
+    Each mode runs in a fresh process so its peak RSS is measured separately.
+
+    Returns:
+        pd.DataFrame: Fit (+ dominant topic) time, daily increment time and peak RSS of each mode.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode in ('batch', 'online'):
+            model_path = os.path.join(tmp_dir, 'topics.joblib') if mode == 'online' else None
+            fit_seconds, increment_seconds, peak_rss_mb = _run_isolated(
+                _measure_topic_modeling, n_headlines, num_topics, mode, chunksize, model_path, n_increment)
+            rows.append({'mode': mode, 'headlines': n_headlines, 'fit_seconds': fit_seconds,
+                         'increment_seconds': increment_seconds, 'peak_rss_mb': peak_rss_mb})
+    results = pd.DataFrame(rows)
+    print(results.to_string())
+    return results
+
+
+def benchmark_plot_rendering(n_bars=1000000, max_points=2000, methods=('lttb', 'minmax')):
+    """
+    Compares the figure payload and render-prep time of the StockPlot charts with and without downsampling.
+
+    Render prep is building the figure and serializing it to JSON (what the browser receives).
+    The check column confirms that every downsampled trace respects the point budget.
+
+    Returns:
+        pd.DataFrame: Payload size, prep time and largest trace length per chart and mode.
+    """
+    from indicators import compute_indicators
+    from plot import StockPlot
+
+    # Minute bars: a multi-decade daily history is far shorter than n_bars
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame({'Close': 50 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))},
+                          index=pd.date_range('2000-01-03 09:30', periods=n_bars, freq='min', name='date'))
+    df = pd.concat([prices, compute_indicators(prices)], axis=1)
+    df = df.rename(columns={'SMA': 'SMA_50', 'RSI': 'RSI_14'})
+
+    rows = []
+    for mode in ('full',) + tuple(methods):
+        if mode == 'full':
+            plot = StockPlot(df)
+        else:
+            plot = StockPlot(df, max_points=max_points, downsample_method=mode)
+        for chart in ('StockPrice50DaySMA', 'RSIPlot', 'MACDPlot'):
+            start = time.perf_counter()
+            fig = getattr(plot, chart)(show=False)
+            payload = fig.to_json()
+            seconds = time.perf_counter() - start
+            largest = max(len(trace.y) for trace in fig.data)
+            rows.append({'mode': mode, 'chart': chart, 'payload_mb': len(payload) / 2 ** 20, 'prep_seconds': seconds,
+                         'largest_trace': largest, 'webgl': any(trace.type == 'scattergl' for trace in fig.data),
+                         'within_budget': mode == 'full' or largest <= max_points})
+    results = pd.DataFrame(rows)
+    print(results.to_string())
+    return results
+
+
+def benchmark_report_generation(n_tickers=300, n_bars=2520, formats=('html',), worker_counts=(1, None)):
+    """
+    Times headless per-ticker chart generation with ReportBuilder for several worker counts.
+
+    Returns:
+        pd.DataFrame: Wall time, number of files and megabytes written per worker count.
+    """
+    from report import ReportBuilder
+
+    prices = synthetic_price_frame(n_tickers, n_bars)
+    rows = []
+    for n_jobs in worker_counts:
+        with tempfile.TemporaryDirectory() as output_dir:
+            builder = ReportBuilder(output_dir, formats=formats, n_jobs=n_jobs)
+            _, seconds = time_call(builder.add_ticker_charts, prices)
+            builder.write_manifest()
+            manifest = builder.manifest()
+            rows.append({'n_jobs': builder.n_jobs, 'tickers': n_tickers, 'files': len(manifest),
+                         'mb_written': manifest['bytes'].sum() / 2 ** 20, 'seconds': seconds})
+    results = pd.DataFrame(rows)
+    print(results.to_string())
+    return results
+
+
+# Import-time budgets in milliseconds (cumulative, from python -X importtime) for worker start-up
+IMPORT_BUDGETS_MS = {'sentiment_engine': 150, 'sentiment': 600, 'insight': 600}
+# Dependencies that scoring-only imports must not load
+HEAVY_MODULES = ('nltk', 'sklearn', 'matplotlib', 'seaborn', 'plotly')
+
+
+def _import_time(module):
+    import subprocess
+    import sys
+
+    # The child prints which heavy modules the import loaded; -X importtime reports on stderr
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if line.startswith('import time:') and len(fields) == 3 and fields[2].strip() == module:
+            cumulative_us = int(fields[1])
+    return cumulative_us / 1000, result.stdout.strip()
+
+
+def benchmark_import_time(budgets=None, repeats=3):
+    """
+    Measures the import time of the scoring modules in fresh interpreters and checks them against budgets.
+
+    Parameters:
+        budgets (dict, optional): Milliseconds allowed per module; IMPORT_BUDGETS_MS by default.
+        repeats (int): Number of fresh interpreters per module; the fastest run is kept.
+
+    Returns:
+        pd.DataFrame: Import time, budget, whether it is met and the heavy dependencies loaded per module.
+    """
+    budgets = budgets or IMPORT_BUDGETS_MS
+    rows = []
+    for module, budget_ms in budgets.items():
+        runs = [_import_time(module) for _ in range(repeats)]
+        import_ms = min(ms for ms, _ in runs)
+        rows.append({'module': module, 'import_ms': import_ms, 'budget_ms': budget_ms,
+                     'within_budget': import_ms <= budget_ms, 'heavy_loaded': runs[0][1]})
+    results = pd.DataFrame(rows)
+    print(results.to_string())
+    return results
+
+
+def benchmark_calendar_counts(n_timestamps=1000000, seed=0):
+    """
+    Compares the column-based calendar breakdowns of analyze_publication_dates and analyze_publishing_times
+    with the single-pass calendar_counts kernel on synthetic publication timestamps.
+
+    Returns:
+        pd.DataFrame: Wall time of both and whether every breakdown matches.
+    """
+    from calendar_counts import calendar_counts
+
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 11 * 365 * 86400, n_timestamps)
+    dates = pd.Series(pd.Timestamp('2009-01-01') + pd.to_timedelta(seconds, unit='s'), name='date')
+
+    def run_columns():
+        df = pd.DataFrame({'date': dates})
+        df['year'] = df['date'].dt.year
+        df['month'] = df['date'].dt.month
+        df['day'] = df['date'].dt.day
+        df['day_of_week'] = df['date'].dt.day_name()
+        counts = {
+            'daily': df['date'].dt.date.value_counts().sort_index(),
+            'weekday': df['day_of_week'].value_counts().sort_index(),
+            'month': df['month'].value_counts().sort_index(),
+            'year': df['year'].value_counts().sort_index(),
+        }
+        df['hour'] = df['date'].dt.hour
+        df['day_of_week'] = df['date'].dt.dayofweek
+        counts['hour'] = df['hour'].value_counts().sort_index()
+        counts['hour_weekday'] = pd.crosstab(df['day_of_week'], df['hour'])
+        return counts
+
+    legacy, legacy_seconds = time_call(run_columns)
+    kernel, kernel_seconds = time_call(calendar_counts, dates)
+    matches = all(np.array_equal(legacy[key].to_numpy(), kernel[key].to_numpy())
+                  for key in ('daily', 'month', 'year', 'hour', 'hour_weekday'))
+    matches = matches and np.array_equal(legacy['weekday'].sort_index().to_numpy(), kernel['weekday'].sort_index().to_numpy())
+    results = pd.DataFrame([{'timestamps': n_timestamps, 'columns_seconds': legacy_seconds, 'kernel_seconds': kernel_seconds,
+                             'speedup': legacy_seconds / kernel_seconds, 'matches': matches}])
+    print(results.to_string())
+    return results
+
+
+def _measure_publisher_counts(file_path, streaming, capacity, chunksize):
+    from heavy_hitters import stream_heavy_hitters
+
+    start = time.perf_counter()
+    if streaming:
+        top = stream_heavy_hitters(file_path, capacity=capacity, chunksize=chunksize).top(30)['count']
+    else:
+        top = pd.read_csv(file_path)['publisher'].value_counts().head(30)
+    return time.perf_counter() - start, _peak_rss_mb(), list(top.index)
+
+
+def benchmark_heavy_hitters(file_path=None, n_rows=1000000, n_stocks=500, capacity=1000, chunksize=100000):
+    """
+    Compares top-publisher counting on the fully loaded news file with the streamed heavy-hitter sketch,
+    and the per-row domain lambda with the vectorized domain extraction.
+
+    Returns:
+        pd.DataFrame: Wall time, peak RSS and top-30 agreement for each method.
+    """
+    from heavy_hitters import publisher_domains
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if file_path is None:
+            file_path = os.path.join(tmp_dir, 'news.csv')
+            write_synthetic_news_file(file_path, n_rows=n_rows, n_stocks=n_stocks)
+
+        rows = []
+        for name, streaming in (('value_counts', False), ('sketch', True)):
+            seconds, peak_rss_mb, top = _run_isolated(_measure_publisher_counts, file_path, streaming, capacity, chunksize)
+            rows.append({'method': name, 'seconds': seconds, 'peak_rss_mb': peak_rss_mb, 'top': top})
+        publishers = pd.read_csv(file_path, usecols=['publisher'])['publisher']
+
+    _, lambda_seconds = time_call(publishers.apply, lambda x: x.split('@')[-1] if isinstance(x, str) else None)
+    _, vectorized_seconds = time_call(publisher_domains, publishers)
+    rows.append({'method': 'domain_lambda', 'seconds': lambda_seconds})
+    rows.append({'method': 'domain_vectorized', 'seconds': vectorized_seconds})
+    results = pd.DataFrame(rows)
+    results['top30_matches'] = results['top'].apply(lambda top: top == rows[0]['top'] if isinstance(top, list) else None)
+    results = results.drop(columns='top')
+    print(results.to_string())
+    return results
+
@@ -0,0 +1,77 @@
+# calendar_counts.py
+import numpy as np
+import pandas as pd
+
+try:
+    from date_utils import parse_local_times
+except ImportError:  # imported as scripts.calendar_counts, e.g. by the top-level preprocessing module
+    from .date_utils import parse_local_times
+
+_NS_PER_HOUR = 3600 * 10**9
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _epoch_hours(values):
+    # Hours since the epoch in local wall-clock time, also across mixed UTC offsets; NaT dropped
+    times, _ = parse_local_times(values)
+    ns = times.to_numpy(dtype='datetime64[ns]').view(np.int64)[times.notna().to_numpy()]
+    return ns // _NS_PER_HOUR
+
+
+def calendar_counts(values):
+    """
+    Counts timestamps by date, hour, weekday, day of month, month, year and hour x weekday in one pass.
+
+    Every timestamp is reduced to its hour since the epoch and counted once with np.bincount
+    into a (days x 24) table; all breakdowns are then sums over that small table, so no
+    per-row year/month/day/weekday columns are built. Missing or invalid timestamps are ignored.
+
+    Parameters:
+        values (array-like): Timestamps, e.g. the 'date' column of the news frame.
+
+    Returns:
+        dict: 'daily' (pd.Series per date with at least one timestamp), 'hour' (0-23), 'weekday'
+              (Monday-Sunday), 'day' (1-31), 'month' (1-12), 'year' (pd.Series) and 'hour_weekday'
+              (pd.DataFrame, weekdays x hours).
+    """
+    hours = _epoch_hours(values)
+    if len(hours) == 0:
+        table = np.zeros((0, 24), dtype=np.int64)
+        first_day = 0
+    else:
+        first_day = hours.min() // 24
+        counts = np.bincount(hours - first_day * 24)
+        table = np.zeros(-(-len(counts) // 24) * 24, dtype=np.int64)
+        table[:len(counts)] = counts
+        table = table.reshape(-1, 24)
+
+    days = first_day + np.arange(len(table))
+    dates = days.astype('datetime64[D]')
+    months = dates.astype('datetime64[M]')
+    month_numbers = months.astype(np.int64) % 12 + 1
+    years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+    day_numbers = (dates - months).astype(np.int64) + 1
+    # 1970-01-01 was a Thursday (Monday = 0)
+    weekdays = (days + 3) % 7
+
+    daily = table.sum(axis=1)
+    observed = daily > 0
+    hour_weekday = np.zeros((7, 24), dtype=np.int64)
+    np.add.at(hour_weekday, weekdays, table)
+
+    # The table starts and ends on observed days, so its first and last years bound the range
+    first_year = years[0] if len(years) else 0
+    year_counts = np.bincount(years - first_year, weights=daily).astype(np.int64)
+    return {
+        'daily': pd.Series(daily[observed], index=pd.DatetimeIndex(dates[observed], name='date'), name='count'),
+        'hour': pd.Series(table.sum(axis=0), index=pd.RangeIndex(24, name='hour'), name='count'),
+        'weekday': pd.Series(hour_weekday.sum(axis=1), index=pd.Index(WEEKDAY_NAMES, name='day_of_week'), name='count'),
+        'day': pd.Series(np.bincount(day_numbers - 1, weights=daily, minlength=31).astype(np.int64),
+                         index=pd.RangeIndex(1, 32, name='day'), name='count'),
+        'month': pd.Series(np.bincount(month_numbers - 1, weights=daily, minlength=12).astype(np.int64),
+                           index=pd.RangeIndex(1, 13, name='month'), name='count'),
+        'year': pd.Series(year_counts, index=pd.RangeIndex(first_year, first_year + len(year_counts), name='year'),
+                          name='count'),
+        'hour_weekday': pd.DataFrame(hour_weekday, index=pd.Index(WEEKDAY_NAMES, name='day_of_week'),
+                                     columns=pd.RangeIndex(24, name='hour')),
+    }
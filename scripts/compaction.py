@@ -0,0 +1,103 @@
+# compaction.py
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+# Object columns with at most this share of distinct values become categorical
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _compact_strings(column, max_category_ratio, string_storage):
+    # Repeated strings (stock, publisher, sentiment_category) become categorical, unique ones
+    # (headline) optionally a pyarrow-backed string column
+    if pd.api.types.infer_dtype(column, skipna=True) != 'string':
+        return column
+    if column.nunique(dropna=True) <= max_category_ratio * len(column):
+        return column.astype('category')
+    if string_storage == 'pyarrow' and importlib.util.find_spec('pyarrow'):
+        return column.astype('string[pyarrow]')
+    return column
+
+
+def _compact_float(column, float_tolerance, integer_floats=False):
+    # With integer_floats, whole numbers without NaN (e.g. Volume) become integers; floats become
+    # float32 only when the values survive the round trip (exactly, or within float_tolerance)
+    values = column.to_numpy()
+    if (integer_floats and len(values) and np.isfinite(values).all() and np.abs(values).max() < 2**53
+            and (values == np.round(values)).all()):
+        return pd.to_numeric(column.astype(np.int64), downcast='integer')
+    with np.errstate(over='ignore'):
+        narrowed = values.astype(np.float32)
+    restored = narrowed.astype(np.float64)
+    if float_tolerance is None:
+        lossless = np.array_equal(restored, values, equal_nan=True)
+    else:
+        with np.errstate(invalid='ignore'):
+            error = np.abs(restored - values) <= float_tolerance * np.abs(values)
+        lossless = bool(np.all(error | (np.isnan(values) & np.isnan(restored))))
+    return pd.Series(narrowed, index=column.index, name=column.name) if lossless else column
+
+
+def memory_report(before, after):
+    """
+    Compares the memory use of a DataFrame before and after compaction.
+
+    Parameters:
+        before (pd.DataFrame): Original frame.
+        after (pd.DataFrame): Compacted frame.
+
+    Returns:
+        pd.DataFrame: dtype and megabytes (deep) per column before and after, with a 'total' row.
+    """
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'mb_before': before.memory_usage(deep=True, index=False) / 2**20,
+        'mb_after': after.memory_usage(deep=True, index=False) / 2**20,
+    })
+    report.loc['total', ['mb_before', 'mb_after']] = report[['mb_before', 'mb_after']].sum()
+    return report
+
+
+def compact(df, max_category_ratio=MAX_CATEGORY_RATIO, float_tolerance=None, string_storage=None,
+            integer_floats=False, verbose=True):
+    """
+    Returns a copy of a DataFrame with memory-compact dtypes.
+
+    Repeated strings become categorical, integers are downcast to the smallest type holding
+    their values (e.g. 'sentiment' in {-1, 0, 1} becomes int8) and float64 columns become
+    float32 where precision allows. Float columns stay floats unless integer_floats is set, so
+    e.g. Dividends and Stock Splits keep their meaning. Datetime, boolean and categorical
+    columns are kept.
+
+    Parameters:
+        df (pd.DataFrame): Frame to compact, e.g. the merged price/news frame.
+        max_category_ratio (float): Largest share of distinct values for a string column to become categorical.
+        float_tolerance (float, optional): Largest relative error accepted when narrowing floats;
+            by default floats are only narrowed when float32 holds them exactly.
+        string_storage (str, optional): 'pyarrow' stores the remaining string columns as pyarrow strings.
+        integer_floats (bool): Downcast float columns holding only whole numbers without NaN
+            (e.g. Volume) to integers.
+        verbose (bool): Print the before/after memory report.
+
+    Returns:
+        pd.DataFrame: The compacted copy.
+    """
+    compacted = {}
+    for name, column in df.items():
+        if column.dtype == object:
+            column = _compact_strings(column, max_category_ratio, string_storage)
+        elif pd.api.types.is_integer_dtype(column.dtype) and not isinstance(column.dtype, pd.CategoricalDtype):
+            column = pd.to_numeric(column, downcast='integer')
+        elif column.dtype == np.float64:
+            column = _compact_float(column, float_tolerance, integer_floats)
+        compacted[name] = column
+    result = pd.DataFrame(compacted, index=df.index)
+
+    if verbose:
+        report = memory_report(df, result)
+        before, after = report.loc['total', 'mb_before'], report.loc['total', 'mb_after']
+        print(report)
+        print(f"Memory: {before:.1f} MB -> {after:.1f} MB ({1 - after / before:.0%} saved)")
+    return result
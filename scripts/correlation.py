@@ -1,42 +1,65 @@
 # correlation.py
 
-import pandas as pd
+import numpy as np
+
+from alignment import StockDateIndex, days_to_dates, session_days, to_local_times
 
 class Correlation:
-    def __init__(self, merged_df, news_df):
+    def __init__(self, merged_df, news_df, timezone=None):
         """
         Initializes the Correlation class with two dataframes.
         :param merged_df: DataFrame with stock data
         :param news_df: DataFrame with news data
+        :param timezone: Exchange time zone tz-aware dates are converted to (e.g. 'America/New_York')
         """
         self.merged_df = merged_df
         self.news_df = news_df
+        self.timezone = timezone
+        # Built on first use and reused by every later alignment
+        self._index = None
+        self._news_times = None
 
-    def aligned_date_stock_price(self):
+    def _prepare(self):
+        """
+        Builds the sorted (stock, date) index of the stock data and parses the news dates, once.
         """
-        Aligns stock data by finding rows in the stock data that match dates from the news dataset
-        and displays the corresponding rows from the news data.
-        :return: Three DataFrames - aligned stock data, aligned news data, and filtered sentiment data.
+        if self._index is None:
+            self._index = StockDateIndex(self.merged_df, timezone=self.timezone)
+            self._news_times = to_local_times(self.news_df['date'], self.timezone)
+        return self._index, self._news_times
+
+    def aligned_date_stock_price(self, how='exact', session_close=None, max_days=None):
+        """
+        Aligns news with stock data on (date, stock) pairs.
+
+        With how='exact' a news item matches the bar of its stock on the same day. With how='asof'
+        it matches the first bar of its stock on or after its day, so weekend news maps to the next
+        session; with session_close (e.g. '16:00') news published after the close also moves to
+        the next session.
+        :param how: 'exact' or 'asof'
+        :param session_close: Local closing time; news at or after it counts towards the next day
+        :param max_days: For 'asof', largest number of days a news item may be moved forward
+        :return: Three DataFrames - stock rows with at least one matching news item, news rows
+            whose (session) date is a trading date, and news rows matched to a bar of their own
+            stock, with the matched bar date in 'session_date'.
         """
-        # Ensure both 'date' columns are in datetime format
-        self.merged_df['date'] = pd.to_datetime(self.merged_df['date'])
-        self.news_df['date'] = pd.to_datetime(self.news_df['date'])
-
-        # Find common dates
-        common_dates = self.merged_df['date'].isin(self.news_df['date'])
-
-        # Filter stock data based on common dates
-        aligned_stock_data = self.merged_df[common_dates]
-
-        # Filter news data for the same common dates
-        aligned_news_data = self.news_df[self.news_df['date'].isin(aligned_stock_data['date'])]
-
-        # Filter sentiment data for common dates and specific stocks
-        company_list = self.merged_df['stock'].unique()  # Get unique companies from merged_df
-        common_conditions = (
-            self.news_df['date'].isin(self.merged_df['date']) &
-            self.news_df['stock'].isin(company_list)
-        )
-        aligned_sentiment_data = self.news_df[common_conditions]
+        index, news_times = self._prepare()
+        days = session_days(news_times, session_close)
+
+        # One lookup gives the bar of every news item
+        bars = index.lookup(self.news_df['stock'].to_numpy(), days, how=how, max_days=max_days)
+        matched = bars >= 0
+
+        # Stock rows that received at least one news item
+        bar_hits = np.bincount(bars[matched], minlength=len(self.merged_df)) > 0
+        aligned_stock_data = self.merged_df[bar_hits]
+
+        # News rows falling on a trading date of any stock
+        sessions = index.next_session(days) if how == 'asof' else days
+        on_calendar = np.isin(sessions, index.calendar)
+        aligned_news_data = self.news_df[on_calendar]
+
+        aligned_sentiment_data = self.news_df[matched].copy()
+        aligned_sentiment_data['session_date'] = days_to_dates(index.bar_days[bars[matched]])
 
         return aligned_stock_data, aligned_news_data, aligned_sentiment_data
@@ -1,17 +1,53 @@
 # Import necessary libraries
 import os
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+from frame_cache import read_snapshot, source_fingerprint, write_snapshot
+from news_stream import DEFAULT_NEWS_CHUNKSIZE, iter_news_chunks
+
+# The pyarrow CSV engine is multi-threaded and releases the GIL, but it is an optional dependency
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+# Fixed schema of the yfinance price files; price_dtype is applied to the OHLC columns
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close']
+OTHER_NUMERIC_DTYPES = {'Volume': 'float64', 'Dividends': 'float64', 'Stock Splits': 'float64'}
+
+# Name of the snapshot written into the price folder when caching is enabled
+PRICE_SNAPSHOT_NAME = '.merged_prices.feather'
 
 # Define the CSVLoader class
 class CSVLoader:
-    def __init__(self, folder_path):
-        """Initializes the CSVLoader with the folder path."""
+    def __init__(self, folder_path, use_cache=False):
+        """Initializes the CSVLoader with the folder path.
+
+        Parameters:
+            folder_path (str): Folder containing the price CSV files.
+            use_cache (bool): Keep a memory-mappable Feather snapshot next to the sources and
+                reuse it while the source files' size and modification time are unchanged.
+        """
         self.folder_path = folder_path
         self.dataframes = []
+        self.use_cache = use_cache
+        self._price_fingerprint = None
+
+    def _use_price_snapshot(self, **mode):
+        """Records the loader mode and returns True if a fresh price snapshot makes parsing unnecessary."""
+        if not self.use_cache:
+            return False
+        csv_files = [os.path.join(self.folder_path, f) for f in os.listdir(self.folder_path) if f.endswith('.csv')]
+        self._price_fingerprint = source_fingerprint(csv_files, **mode)
+        snapshot_path = os.path.join(self.folder_path, PRICE_SNAPSHOT_NAME)
+        # Only the schema is read here, the data stays on disk until merge_dataframes()
+        return read_snapshot(snapshot_path, self._price_fingerprint, columns=[]) is not None
 
     def load_csv_files(self):
         """Loads all CSV files in the specified folder into dataframes, 
            adding a 'company' column with the first four characters of the file name."""
+        if self._use_price_snapshot(mode='plain'):
+            return
+
         # List all CSV files in the folder
         csv_files = [f for f in os.listdir(self.folder_path) if f.endswith('.csv')]        
         if not csv_files:
@@ -40,26 +76,102 @@ class CSVLoader:
             except Exception as e:
                 print(f"Error loading {csv_file}: {e}")
                 
-    def merge_dataframes(self):
-        """Merges all loaded dataframes into one."""
+    def load_csv_files_parallel(self, max_workers=None, price_dtype='float64'):
+        """Loads all CSV files in the specified folder concurrently with an explicit schema.
+
+        Files are read in a thread pool (with the pyarrow engine when it is installed), the
+        'Date' column is parsed to datetime64 at read time and renamed to 'date' without a copy,
+        and 'stock' is a categorical shared by all files so merge_dataframes keeps it categorical.
+
+        Parameters:
+            max_workers (int, optional): Number of reader threads (defaults to the executor's default).
+            price_dtype (str): dtype of the OHLC columns, 'float64' or 'float32'.
+        """
+        if self._use_price_snapshot(mode='typed', price_dtype=price_dtype):
+            return
+
+        csv_files = sorted(f for f in os.listdir(self.folder_path) if f.endswith('.csv'))
+        if not csv_files:
+            print("No CSV files found in the folder!")
+            return
+
+        company_names = [csv_file[:4] if len(csv_file) >= 4 else csv_file for csv_file in csv_files]
+        stock_dtype = pd.CategoricalDtype(sorted(set(company_names)))
+        dtypes = {column: price_dtype for column in PRICE_COLUMNS}
+        dtypes.update(OTHER_NUMERIC_DTYPES)
+
+        def read(csv_file, company_name):
+            file_path = os.path.join(self.folder_path, csv_file)
+            try:
+                df = pd.read_csv(file_path, engine=CSV_ENGINE, dtype=dtypes, parse_dates=['Date'])
+            except Exception as e:
+                print(f"Error loading {csv_file}: {e}")
+                return None
+
+            if df.empty:
+                print(f"Warning: {csv_file} is empty and won't be added.")
+                return None
+
+            df.rename(columns={'Date': 'date'}, inplace=True)
+            code = stock_dtype.categories.get_loc(company_name)
+            df['stock'] = pd.Categorical.from_codes(np.full(len(df), code), dtype=stock_dtype)
+            return df
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(read, csv_files, company_names)
+            self.dataframes.extend(df for df in results if df is not None)
+
+    def merge_dataframes(self, columns=None):
+        """Merges all loaded dataframes into one.
+
+        Parameters:
+            columns (list of str, optional): Columns to return. With caching enabled, the other
+                columns are never read from the snapshot.
+        """
+        snapshot_path = os.path.join(self.folder_path, PRICE_SNAPSHOT_NAME)
+        if self.use_cache and self._price_fingerprint is not None:
+            cached = read_snapshot(snapshot_path, self._price_fingerprint, columns=columns)
+            if cached is not None:
+                return cached
+
         if not self.dataframes:
             raise ValueError("No dataframes loaded. Please load CSV files first.")
         
         # Merge all dataframes
         merged_df = pd.concat(self.dataframes, ignore_index=True)
-        return merged_df
+        if self.use_cache and self._price_fingerprint is not None:
+            write_snapshot(merged_df, snapshot_path, self._price_fingerprint)
+        return merged_df if columns is None else merged_df[list(columns)]
     
     
     
-    def load_news_csv(self, file_path):
-        """Loads a single CSV file from a given path and converts it to a DataFrame."""
+    def load_news_csv(self, file_path, columns=None):
+        """Loads a single CSV file from a given path and converts it to a DataFrame.
+
+        Parameters:
+            file_path (str): Path of the news CSV file.
+            columns (list of str, optional): Columns to load, e.g. ['date', 'stock', 'headline'].
+        """
         try:
             # Check if the file exists and is a CSV
             if not os.path.isfile(file_path) or not file_path.endswith('.csv'):
                 raise ValueError("The provided file path is invalid or not a CSV file.")
-            
-            # Load the CSV file into a DataFrame
-            df = pd.read_csv(file_path)
+
+            if self.use_cache:
+                # The snapshot always holds every column, so any projection can be served from it
+                snapshot_path = f"{file_path}.feather"
+                fingerprint = source_fingerprint([file_path])
+                df = read_snapshot(snapshot_path, fingerprint, columns=columns)
+                if df is None:
+                    df = pd.read_csv(file_path)
+                    write_snapshot(df, snapshot_path, fingerprint)
+                    if columns is not None:
+                        df = df[list(columns)]
+            else:
+                # Load the CSV file into a DataFrame
+                df = pd.read_csv(file_path, usecols=columns)
+                if columns is not None:
+                    df = df[list(columns)]
             
             # Check if the DataFrame is empty
             if df.empty:
@@ -70,8 +182,15 @@ class CSVLoader:
         except Exception as e:
             print(f"Error loading file {file_path}: {e}")
             return None
-    
-
-        
 
+    def iter_news_csv(self, file_path, chunksize=DEFAULT_NEWS_CHUNKSIZE, columns=None):
+        """Reads a news CSV file as a generator of DataFrame chunks, for files larger than memory.
 
+        Parameters:
+            file_path (str): Path of the news CSV file.
+            chunksize (int): Number of rows per chunk.
+            columns (list of str, optional): Columns to read.
+        """
+        if not os.path.isfile(file_path) or not file_path.endswith('.csv'):
+            raise ValueError("The provided file path is invalid or not a CSV file.")
+        return iter_news_chunks(file_path, chunksize=chunksize, columns=columns)
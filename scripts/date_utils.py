@@ -0,0 +1,152 @@
+# date_utils.py
+import numpy as np
+import pandas as pd
+
+# Layout of the analyst-ratings timestamps, e.g. '2020-06-05 10:30:54' and '2020-06-05 10:30:54-04:00'
+LOCAL_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOCAL_LENGTH = 19
+OFFSET_LENGTH = 6
+
+# Timestamps ending in a UTC offset such as '-04:00', '+0530' or 'Z'
+_OFFSET_PATTERN = r'(?:[+-]\d{2}:?\d{2}|Z)$'
+
+
+def _offsets_to_timedelta(suffixes):
+    """
+    Converts '+HH:MM'/'-HH:MM' suffixes to timedeltas, parsing each distinct suffix once (NaT if invalid).
+    """
+    codes, uniques = pd.factorize(suffixes)
+    parts = pd.Series(uniques).str.extract(r'^([+-])(\d{2}):(\d{2})$')
+    sign = np.where(parts[0] == '-', -1, 1)
+    minutes = sign * (parts[1].astype(float) * 60 + parts[2].astype(float))
+    offsets = pd.to_timedelta(minutes, unit='min').to_numpy()
+    return offsets[codes]
+
+
+def parse_utc_dates(values):
+    """
+    Parses timestamps with mixed formats into tz-aware UTC datetimes in a few vectorized passes.
+
+    Timestamps with a UTC offset are converted to UTC and naive ones are taken as UTC.
+    The common 'YYYY-MM-DD HH:MM:SS[+HH:MM]' layout is parsed with an exact format, applying
+    each distinct offset once; the remaining rows go through the ISO 8601 parser (offset and
+    naive rows separately, since parsing them together makes pandas apply one row's offset to
+    the naive rows), and whatever still fails is retried with format='mixed'.
+
+    Parameters:
+        values (pd.Series): Date strings or datetimes.
+
+    Returns:
+        tuple: (pd.Series of datetime64[ns, UTC] with unparseable values as NaT,
+                number of non-missing values that were coerced to NaT)
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        parsed = values.dt.tz_localize('UTC') if values.dt.tz is None else values.dt.tz_convert('UTC')
+        return parsed, 0
+
+    # Work on a positional index so masked assignment never aligns on duplicate labels
+    strings = values.astype(object).where(values.notna()).reset_index(drop=True)
+    missing = strings.isna().to_numpy()
+    lengths = strings.str.len().to_numpy()
+    parsed = pd.Series(pd.NaT, index=strings.index, dtype='datetime64[ns, UTC]')
+
+    # Fast path: fixed-width local time, optionally followed by a '+HH:MM' offset
+    fixed = (lengths == LOCAL_LENGTH) | (lengths == LOCAL_LENGTH + OFFSET_LENGTH)
+    if fixed.any():
+        local = pd.to_datetime(strings[fixed].str.slice(0, LOCAL_LENGTH), format=LOCAL_FORMAT, errors='coerce')
+        local = local.to_numpy()
+        with_offset = lengths[fixed] == LOCAL_LENGTH + OFFSET_LENGTH
+        local[with_offset] -= _offsets_to_timedelta(strings[fixed][with_offset].str.slice(LOCAL_LENGTH).to_numpy())
+        parsed[fixed] = pd.to_datetime(local, utc=True)
+
+    # ISO 8601 pass for the other layouts, offset and naive rows separately
+    remaining = parsed.isna().to_numpy() & ~missing
+    if remaining.any():
+        has_offset = strings[remaining].str.contains(_OFFSET_PATTERN, regex=True).to_numpy(dtype=bool)
+        for subset in (has_offset, ~has_offset):
+            if subset.any():
+                rows = np.flatnonzero(remaining)[subset]
+                parsed[rows] = pd.to_datetime(strings[rows], format='ISO8601', utc=True, errors='coerce')
+
+    # Slow path only for the rows no fixed format could handle
+    retry = parsed.isna().to_numpy() & ~missing
+    if retry.any():
+        parsed[retry] = pd.to_datetime(strings[retry], format='mixed', utc=True, errors='coerce')
+
+    n_coerced = int((parsed.isna().to_numpy() & ~missing).sum())
+    parsed.index = values.index
+    return parsed, n_coerced
+
+
+def parse_local_days(values, date_format='%Y-%m-%d'):
+    """
+    Parses the calendar day of publication from timestamps, ignoring time and UTC offset.
+
+    Parameters:
+        values (pd.Series): Date strings starting with the day, e.g. '2020-06-05 10:30:54-04:00'.
+        date_format (str): Format of the leading day part.
+
+    Returns:
+        tuple: (pd.Series of naive datetime64[ns] days with unparseable values as NaT,
+                number of non-missing values that were coerced to NaT)
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        if values.dt.tz is not None:
+            # Drop the time zone but keep the local wall time
+            values = values.dt.tz_localize(None)
+        return values.dt.normalize(), 0
+
+    # News timestamps share few distinct days, so parse each distinct day once
+    day_length = len(pd.Timestamp('2000-01-01').strftime(date_format))
+    codes, uniques = pd.factorize(values.astype(object).str.slice(0, day_length))
+    unique_days = pd.to_datetime(pd.Series(uniques, dtype=object), format=date_format, errors='coerce')
+
+    # Retry values of other layouts in full, e.g. '06/05/2020 10:30'
+    failed = np.flatnonzero(unique_days.isna().to_numpy())
+    if len(failed):
+        first_rows = pd.Series(np.arange(len(codes))).groupby(codes).first()
+        originals = values.iloc[first_rows[failed].to_numpy()]
+        # Drop any UTC offset first so the local day is kept
+        local_times = originals.astype(object).str.replace(_OFFSET_PATTERN, '', regex=True)
+        unique_days[failed] = pd.to_datetime(local_times, format='mixed', errors='coerce').dt.normalize().to_numpy()
+
+    days = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[ns]')
+    days[codes >= 0] = unique_days.to_numpy()[codes[codes >= 0]]
+    days = pd.Series(days, index=values.index)
+
+    n_coerced = int((days.isna() & values.notna()).sum())
+    return days, n_coerced
+
+
+def parse_local_times(values):
+    """
+    Parses timestamps as naive local wall-clock times, ignoring any UTC offset.
+
+    The 'YYYY-MM-DD HH:MM:SS' prefix is parsed with an exact format; other layouts are
+    retried with format='mixed' after dropping the offset.
+
+    Parameters:
+        values (pd.Series): Date strings or datetimes; tz-aware datetimes keep their wall time.
+
+    Returns:
+        tuple: (pd.Series of naive datetime64[ns] with unparseable values as NaT,
+                number of non-missing values that were coerced to NaT)
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return (values.dt.tz_localize(None) if values.dt.tz is not None else values), 0
+
+    strings = values.astype(object).where(values.notna()).reset_index(drop=True)
+    missing = strings.isna().to_numpy()
+    parsed = pd.to_datetime(strings.str.slice(0, LOCAL_LENGTH), format=LOCAL_FORMAT, errors='coerce')
+
+    retry = parsed.isna().to_numpy() & ~missing
+    if retry.any():
+        local_times = strings[retry].str.replace(_OFFSET_PATTERN, '', regex=True)
+        parsed[retry] = pd.to_datetime(local_times, format='mixed', errors='coerce')
+
+    n_coerced = int((parsed.isna().to_numpy() & ~missing).sum())
+    parsed.index = values.index
+    return parsed, n_coerced
@@ -0,0 +1,114 @@
+# downsample.py
+import numpy as np
+import pandas as pd
+
+# Number of points kept per trace by default in the downsampled rendering mode
+DEFAULT_MAX_POINTS = 2000
+# Traces with more points than this are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_MIN_POINTS = 5000
+
+
+def _numeric_axis(x):
+    # Datetimes become nanoseconds so distances along the axis can be computed
+    x = pd.Index(x) if not isinstance(x, pd.Index) else x
+    if isinstance(x, pd.DatetimeIndex):
+        return x.asi8.astype(np.float64)
+    if pd.api.types.is_numeric_dtype(x.dtype):
+        return x.to_numpy(dtype=np.float64)
+    return np.arange(len(x), dtype=np.float64)
+
+
+def lttb_indices(x, y, max_points):
+    """
+    Largest-Triangle-Three-Buckets selection of max_points points that keep the visual shape of a line.
+
+    The first and last points are kept; every bucket in between contributes the point forming the
+    largest triangle with the point kept from the previous bucket and the mean of the next bucket.
+
+    Parameters:
+        x (np.ndarray): Increasing positions (float).
+        y (np.ndarray): Values without NaN.
+        max_points (int): Number of points to keep (at least 3).
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (max_points - 2)
+    bounds = np.empty(max_points, dtype=np.int64)
+    bounds[:-1] = np.floor(np.arange(max_points - 1) * every).astype(np.int64) + 1
+    bounds[-2], bounds[-1] = n - 1, n
+    # Mean position of every bucket from cumulative sums
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = bounds[1:] - bounds[:-1]
+    x_means = (x_sums[bounds[1:]] - x_sums[bounds[:-1]]) / sizes
+    y_means = (y_sums[bounds[1:]] - y_sums[bounds[:-1]]) / sizes
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        x_a, y_a = x[previous], y[previous]
+        # Twice the triangle area, up to sign
+        areas = np.abs((x_a - x_means[bucket + 1]) * (y[start:end] - y_a)
+                       - (x_a - x[start:end]) * (y_means[bucket + 1] - y_a))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_indices(y, max_points):
+    """
+    Keeps the minimum and the maximum of max_points / 2 equal buckets, preserving every spike.
+
+    Returns:
+        np.ndarray: Sorted, unique indices of the kept points.
+    """
+    n = len(y)
+    n_buckets = max(max_points // 2, 1)
+    if max_points >= n:
+        return np.arange(n)
+
+    width = -(-n // n_buckets)
+    padded = np.full(n_buckets * width, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(n_buckets, width)
+    offsets = np.arange(n_buckets) * width
+    low = offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    high = offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    selected = np.unique(np.concatenate((low, high)))
+    return selected[selected < n]
+
+
+def downsample(x, y, max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """
+    Reduces a line to at most max_points points for plotting; missing values are dropped.
+
+    Parameters:
+        x (array-like): Positions, e.g. a DatetimeIndex.
+        y (array-like): Values.
+        max_points (int, optional): Point budget; None keeps every point.
+        method (str): 'lttb' (shape-preserving) or 'minmax' (keeps every local extreme).
+
+    Returns:
+        tuple: (x, y) of the kept points.
+    """
+    if method not in ('lttb', 'minmax'):
+        raise ValueError("method must be 'lttb' or 'minmax'.")
+    x = x if isinstance(x, pd.Index) else pd.Index(x)
+    y = np.asarray(y, dtype=np.float64)
+    if max_points is None or len(y) <= max_points:
+        return x, y
+
+    valid = np.flatnonzero(~np.isnan(y))
+    if method == 'lttb':
+        kept = lttb_indices(_numeric_axis(x[valid]), y[valid], max_points)
+    else:
+        kept = minmax_indices(y[valid], max_points)
+    positions = valid[kept]
+    return x[positions], y[positions]
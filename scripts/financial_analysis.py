@@ -1,35 +1,84 @@
 import pandas as pd
-from pyti.simple_moving_average import simple_moving_average as sma
-from pyti.relative_strength_index import relative_strength_index as rsi
-from pyti.moving_average_convergence_divergence import moving_average_convergence_divergence as macd
-from pyti.exponential_moving_average import exponential_moving_average as ema
 import pynance as pn
+import indicators
+from streaming_indicators import StreamingIndicators
 
 class FinancialAnalysis:
-    def __init__(self, dataframe):
+    def __init__(self, dataframe, group_column=None):
+        """
+        Initializes the FinancialAnalysis class with price data.
+
+        Parameters:
+            dataframe (pd.DataFrame): Price data with a 'Close' column.
+            group_column (str, optional): Column identifying each ticker (e.g. 'stock'); indicators
+                are then computed per ticker, for all tickers at once.
+        """
         self.df = dataframe
+        self.group_column = group_column
+
+    def _close_matrix(self):
+        """
+        Packs the closing prices into a (bars x tickers) matrix.
+        """
+        groups = self.df[self.group_column].to_numpy() if self.group_column else None
+        return indicators.pack_groups(self.df['Close'].to_numpy(), groups)
 
     def SimpleMovingAverage(self, period=50):
         """
-        Calculate the Simple Moving Average (SMA) of the stock's closing price.
+        Calculate the Simple Moving Average (SMA) of the stock's closing price into 'SMA_{period}'.
         """
-        self.df['SMA_50'] = sma(self.df['Close'].tolist(), period=period)
+        matrix, rows, columns = self._close_matrix()
+        self.df[f'SMA_{period}'] = indicators.sma(matrix, period)[rows, columns]
 
     def RelativeStrengthIndex(self, period=14):
         """
-        Calculate the Relative Strength Index (RSI) of the stock's closing price.
+        Calculate the Relative Strength Index (RSI) of the stock's closing price into 'RSI_{period}'.
         """
-        self.df['RSI_14'] = rsi(self.df['Close'].tolist(), period=period)
+        matrix, rows, columns = self._close_matrix()
+        self.df[f'RSI_{period}'] = indicators.rsi(matrix, period)[rows, columns]
 
-    def MovingAverageConvergenceDivergence(self, short_period=12, long_period=26):
+    def MovingAverageConvergenceDivergence(self, short_period=12, long_period=26, signal_period=9):
         """
         Calculate the MACD and Signal Line.
         """
-        macd_values = macd(self.df['Close'].tolist(), short_period=short_period, long_period=long_period)
-        self.df['MACD_Line'] = macd_values
+        matrix, rows, columns = self._close_matrix()
+        macd_line, signal_line = indicators.macd(matrix, short_period, long_period, signal_period)
+        self.df['MACD_Line'] = macd_line[rows, columns]
+
+        # The Signal Line is the EMA of the MACD line
+        self.df['Signal_Line'] = signal_line[rows, columns]
+
+    def IndicatorSweep(self, sma_periods=(), rsi_periods=(), macd_periods=(), signal_period=9, join=False):
+        """
+        Calculate indicators over grids of periods in one pass over the closing prices.
 
-        # Calculate the Signal Line (EMA of the MACD line)
-        self.df['Signal_Line'] = ema(self.df['MACD_Line'].tolist(), period=9)
+        Parameters:
+            sma_periods (list of int): SMA window lengths, e.g. [10, 20, 50, 200].
+            rsi_periods (list of int): RSI periods.
+            macd_periods (list of tuple): (short, long) EMA period pairs, e.g. [(12, 26), (5, 35)].
+            signal_period (int): EMA period of the MACD signal lines.
+            join (bool): Also add the columns to the DataFrame.
+
+        Returns:
+            pd.DataFrame: Columns 'SMA_{period}', 'RSI_{period}', 'MACD_{short}_{long}' and
+            'Signal_{short}_{long}_{signal}', indexed like the price data.
+        """
+        sweep = indicators.compute_indicator_sweep(self.df, group_column=self.group_column,
+                                                   sma_periods=sma_periods, rsi_periods=rsi_periods,
+                                                   macd_periods=macd_periods, signal_period=signal_period)
+        if join:
+            self.df[sweep.columns] = sweep
+        return sweep
+
+    def IndicatorState(self, sma_period=50, rsi_period=14, short_period=12, long_period=26, signal_period=9):
+        """
+        Build incremental indicator state from the loaded history, so new bars can be added
+        with StreamingIndicators.update instead of recomputing every indicator.
+        """
+        return StreamingIndicators.from_history(self.df, group_column=self.group_column,
+                                                sma_period=sma_period, rsi_period=rsi_period,
+                                                short_period=short_period, long_period=long_period,
+                                                signal_period=signal_period)
 
     def FinancialMetrics(self, symbol='AAPL', start='2020-01-01', end='2024-12-15'):
         """
@@ -0,0 +1,88 @@
+# frame_cache.py
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # the snapshot cache is disabled without pyarrow
+    pa = None
+
+# Schema metadata key holding the fingerprint of the source files
+FINGERPRINT_KEY = b'source_fingerprint'
+
+
+def source_fingerprint(paths, **extra):
+    """
+    Describes a set of source files by name, size and modification time.
+
+    Parameters:
+        paths (list of str): Source files the snapshot is built from.
+        **extra: Additional settings that change the loaded frame (e.g. the loader mode).
+
+    Returns:
+        str: JSON fingerprint; any change to a source file changes it.
+    """
+    files = []
+    for path in sorted(paths):
+        stat = os.stat(path)
+        files.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return json.dumps({'files': files, **extra}, sort_keys=True)
+
+
+def read_snapshot(path, fingerprint, columns=None):
+    """
+    Memory-maps a Feather snapshot and returns it if it was built from the same sources.
+
+    Parameters:
+        path (str): Snapshot file.
+        fingerprint (str): Current fingerprint of the sources (see source_fingerprint).
+        columns (list of str, optional): Columns to return; the others are never materialized.
+
+    Returns:
+        pd.DataFrame or None: The cached frame, or None when the snapshot is missing or stale.
+    """
+    if pa is None or not os.path.isfile(path):
+        return None
+    try:
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            metadata = reader.schema.metadata or {}
+            if metadata.get(FINGERPRINT_KEY) != fingerprint.encode('utf-8'):
+                return None
+            table = reader.read_all()
+            if columns is not None:
+                table = table.select(list(columns))
+            return table.to_pandas()
+    except (pa.ArrowException, OSError) as e:
+        print(f"Warning: ignoring unreadable snapshot {path}: {e}")
+        return None
+
+
+def write_snapshot(df, path, fingerprint):
+    """
+    Writes a DataFrame as an uncompressed (memory-mappable) Feather snapshot.
+
+    Parameters:
+        df (pd.DataFrame): Frame to cache.
+        path (str): Snapshot file.
+        fingerprint (str): Fingerprint of the sources the frame was loaded from.
+
+    Returns:
+        bool: True if the snapshot was written.
+    """
+    if pa is None:
+        return False
+    tmp_path = f"{path}.tmp"
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[FINGERPRINT_KEY] = fingerprint.encode('utf-8')
+        feather.write_feather(table.replace_schema_metadata(metadata), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+        return True
+    except (pa.ArrowException, OSError) as e:
+        print(f"Warning: could not write snapshot {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
@@ -0,0 +1,208 @@
+# heavy_hitters.py
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from news_stream import DEFAULT_NEWS_CHUNKSIZE, iter_news_chunks
+from parallel import resolve_n_jobs
+
+# Number of keys tracked exactly by default; keys outside the summary have at most `floor` occurrences
+DEFAULT_CAPACITY = 1000
+# Count-Min dimensions: estimates exceed the true count by at most e / width * total with probability 1 - exp(-depth)
+DEFAULT_WIDTH = 2 ** 14
+DEFAULT_DEPTH = 5
+
+
+def publisher_domains(publishers):
+    """
+    Domain of each publisher: the part after the last '@' of e-mail style names, the name itself otherwise.
+
+    Each distinct publisher is parsed once (via its categorical code) instead of once per row.
+
+    Parameters:
+        publishers (pd.Series): Publisher names, object or categorical.
+
+    Returns:
+        pd.Series: Categorical domains aligned with publishers, NaN where the publisher is missing.
+    """
+    publishers = pd.Series(publishers)
+    if isinstance(publishers.dtype, pd.CategoricalDtype):
+        codes, names = publishers.cat.codes.to_numpy(), publishers.cat.categories
+    else:
+        codes, names = pd.factorize(publishers)
+    domains = pd.Series(names.astype(str), dtype=object).str.extract(r'([^@]*)$', expand=False)
+    domain_codes, domain_names = pd.factorize(domains)
+    mapped = np.where(codes >= 0, domain_codes[np.maximum(codes, 0)] if len(domain_codes) else -1, -1)
+    return pd.Series(pd.Categorical.from_codes(mapped, categories=domain_names), index=publishers.index,
+                     name='publisher_domain')
+
+
+def _hash_keys(keys):
+    return pd.util.hash_array(np.asarray(keys, dtype=object))
+
+
+class HeavyHitters:
+    def __init__(self, capacity=DEFAULT_CAPACITY, width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH):
+        """
+        Mergeable top-k summary of a stream of keys (e.g. publishers), with error bounds.
+
+        Keeps a Space-Saving style summary of the `capacity` heaviest keys, where every tracked
+        key has an upper bound (count) and an error (count - error is a lower bound) and any
+        untracked key occurs at most `floor` times, plus a Count-Min sketch for point queries of
+        any key. Both are updated with one value_counts per chunk and merge exactly across
+        chunks or parallel shards.
+
+        Parameters:
+            capacity (int): Number of keys kept in the summary.
+            width (int): Count-Min columns; 0 disables the Count-Min sketch.
+            depth (int): Count-Min rows.
+        """
+        self.capacity = int(capacity)
+        self.width, self.depth = int(width), int(depth)
+        self.counts = pd.Series(dtype=np.int64)
+        self.errors = pd.Series(dtype=np.int64)
+        self.floor = 0
+        self.total = 0
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64) if self.width else None
+
+    def _rows_columns(self, hashes):
+        # Kirsch-Mitzenmacher: depth hash functions from the two halves of one 64-bit hash
+        low, high = hashes & np.uint64(0xFFFFFFFF), (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low[None, :] + rows * high[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def _merge_summary(self, counts, errors, floor):
+        keys = self.counts.index.union(counts.index)
+        # Untracked keys are bounded by the floor of their summary: upper bound floor, lower bound 0
+        merged_counts = self.counts.reindex(keys, fill_value=self.floor) + counts.reindex(keys, fill_value=floor)
+        merged_errors = self.errors.reindex(keys, fill_value=self.floor) + errors.reindex(keys, fill_value=floor)
+        order = np.argsort(-merged_counts.to_numpy(), kind='stable')
+        kept, dropped = order[:self.capacity], order[self.capacity:]
+        dropped_max = merged_counts.iloc[dropped].max() if len(dropped) else 0
+        self.floor = int(max(self.floor + floor, dropped_max))
+        self.counts = merged_counts.iloc[kept].astype(np.int64)
+        self.errors = merged_errors.iloc[kept].astype(np.int64)
+
+    def update(self, values):
+        """
+        Adds a chunk of keys; missing values are ignored.
+        """
+        chunk_counts = pd.Series(values).value_counts(dropna=True, sort=True)
+        chunk_counts = chunk_counts[chunk_counts > 0]
+        chunk_counts.index = chunk_counts.index.astype(object)
+        self.total += int(chunk_counts.sum())
+        if self.table is not None and len(chunk_counts):
+            columns = self._rows_columns(_hash_keys(chunk_counts.index))
+            for row in range(self.depth):
+                np.add.at(self.table[row], columns[row], chunk_counts.to_numpy())
+
+        # The exact counts of the chunk form a summary with no error, truncated to the capacity
+        floor = int(chunk_counts.iloc[self.capacity]) if len(chunk_counts) > self.capacity else 0
+        chunk_counts = chunk_counts.iloc[:self.capacity].astype(np.int64)
+        self._merge_summary(chunk_counts, pd.Series(0, index=chunk_counts.index, dtype=np.int64), floor)
+        return self
+
+    def merge(self, other):
+        """
+        Adds another summary built with the same capacity and Count-Min dimensions (e.g. from another shard).
+        """
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Only sketches with the same Count-Min width and depth can be merged.")
+        self.total += other.total
+        if self.table is not None:
+            self.table += other.table
+        self._merge_summary(other.counts, other.errors, other.floor)
+        return self
+
+    def estimate(self, keys):
+        """
+        Upper bound of the count of each key, the tighter of the summary and the Count-Min sketch.
+
+        Returns:
+            pd.Series: Estimated counts indexed by key.
+        """
+        keys = pd.Index(keys, dtype=object)
+        estimates = self.counts.reindex(keys, fill_value=self.floor).to_numpy()
+        if self.table is not None and len(keys):
+            columns = self._rows_columns(_hash_keys(keys))
+            estimates = np.minimum(estimates, self.table[np.arange(self.depth)[:, None], columns].min(axis=0))
+        return pd.Series(estimates, index=keys, name='count')
+
+    def top(self, n=10):
+        """
+        The n keys with the largest counts and their error bounds.
+
+        Returns:
+            pd.DataFrame: Indexed by key with 'count' (upper bound), 'lower_bound', 'error' and
+                'guaranteed' (True when the key's lower bound shows it truly belongs to the top n).
+        """
+        counts = self.counts.iloc[:n]
+        errors = self.errors.iloc[:n]
+        lower = counts - errors
+        # Largest count any key outside the first n could have
+        threshold = max(int(self.counts.iloc[n]) if len(self.counts) > n else 0, self.floor)
+        return pd.DataFrame({'count': counts, 'lower_bound': lower, 'error': errors, 'guaranteed': lower >= threshold})
+
+    @property
+    def count_min_error(self):
+        """
+        Additive error of Count-Min estimates (e / width * total), exceeded with probability exp(-depth).
+        """
+        return np.e / self.width * self.total if self.width else float('nan')
+
+
+def merge_sketches(sketches):
+    """
+    Merges summaries built on separate chunks or shards into one.
+    """
+    sketches = list(sketches)
+    merged = HeavyHitters(sketches[0].capacity, sketches[0].width, sketches[0].depth)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+def stream_heavy_hitters(file_path, column='publisher', domains=False, capacity=DEFAULT_CAPACITY,
+                         width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH, chunksize=DEFAULT_NEWS_CHUNKSIZE):
+    """
+    Builds a HeavyHitters summary of a column of a news CSV file read chunk by chunk.
+
+    Parameters:
+        file_path (str): News CSV file.
+        column (str): Column holding the keys, e.g. 'publisher'.
+        domains (bool): Count publisher domains (see publisher_domains) instead of raw values.
+        chunksize (int): Number of rows per chunk.
+
+    Returns:
+        HeavyHitters: Summary of the whole file; only one chunk is held in memory at a time.
+    """
+    sketch = HeavyHitters(capacity, width, depth)
+    for chunk in iter_news_chunks(file_path, chunksize=chunksize, columns=[column]):
+        values = chunk[column].astype('category')
+        sketch.update(publisher_domains(values) if domains else values)
+    return sketch
+
+
+def _stream_file(args):
+    file_path, kwargs = args
+    return stream_heavy_hitters(file_path, **kwargs)
+
+
+def heavy_hitters_from_files(file_paths, n_jobs=1, **kwargs):
+    """
+    Builds one summary per file in parallel worker processes and merges them.
+
+    Parameters:
+        file_paths (list of str): News CSV files (e.g. one per year of the archive).
+        n_jobs (int): Number of worker processes; None or -1 uses all cores.
+        **kwargs: Arguments of stream_heavy_hitters.
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    tasks = [(file_path, kwargs) for file_path in file_paths]
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            sketches = list(executor.map(_stream_file, tasks))
+    else:
+        sketches = [_stream_file(task) for task in tasks]
+    return merge_sketches(sketches)
@@ -0,0 +1,282 @@
+# indicators.py
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+def pack_groups(values, groups=None):
+    """
+    Packs a long series into a (bars x groups) matrix, one column per group.
+
+    Each column holds the values of one group in their original order, starting at row 0
+    and padded with NaN at the bottom, so indicators can run down all columns at once.
+
+    Parameters:
+        values (array-like): Values in long format (e.g. the 'Close' column).
+        groups (array-like, optional): Group label of each value (e.g. the 'stock' column);
+            all values form a single group when omitted.
+
+    Returns:
+        tuple: (matrix, rows, columns) where matrix[rows, columns] are the input values in order.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if groups is None:
+        return values.reshape(-1, 1).copy(), np.arange(len(values)), np.zeros(len(values), dtype=np.intp)
+
+    columns, _ = pd.factorize(np.asarray(groups), use_na_sentinel=False)
+    # Position of each value within its group
+    rows = pd.Series(columns).groupby(columns).cumcount().to_numpy()
+    n_rows = rows.max() + 1 if len(rows) else 0
+    matrix = np.full((n_rows, columns.max() + 1 if len(columns) else 0), np.nan)
+    matrix[rows, columns] = values
+    return matrix, rows, columns
+
+
+def _first_valid_rows(matrix):
+    # Row of the first non-NaN value in each column (len(matrix) for all-NaN columns)
+    valid = ~np.isnan(matrix)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(matrix))
+
+
+def _prefix_sums(matrix):
+    # Running sums of each column (NaN counted as 0) and running counts of NaNs
+    nan = np.isnan(matrix)
+    return np.cumsum(np.where(nan, 0.0, matrix), axis=0), np.cumsum(nan, axis=0)
+
+
+def _window_means(sums, nan_counts, period):
+    # Windowed means from prefix sums; windows containing a NaN give NaN
+    result = np.full(sums.shape, np.nan)
+    if period > len(sums):
+        return result
+    window_sums = sums[period - 1:].copy()
+    window_sums[1:] -= sums[:-period]
+    window_nans = nan_counts[period - 1:].copy()
+    window_nans[1:] -= nan_counts[:-period]
+    result[period - 1:] = np.where(window_nans > 0, np.nan, window_sums / period)
+    return result
+
+
+def sma(matrix, period):
+    """
+    Simple moving average of each column, from running sums.
+
+    Windows containing a NaN give NaN, as with a plain windowed mean.
+
+    Parameters:
+        matrix (np.ndarray): Values, one series per column.
+        period (int): Window length.
+
+    Returns:
+        np.ndarray: Moving averages, NaN during the warm-up window.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(len(matrix), -1)
+    return _window_means(*_prefix_sums(matrix), int(period))
+
+
+def sma_sweep(matrix, periods):
+    """
+    Simple moving averages of each column for several window lengths, sharing one pass of running sums.
+
+    Returns:
+        dict: {period: np.ndarray of moving averages}.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(len(matrix), -1)
+    sums, nan_counts = _prefix_sums(matrix)
+    return {period: _window_means(sums, nan_counts, int(period)) for period in periods}
+
+
+def ema(matrix, period):
+    """
+    Exponential moving average of each column, EMA_t = alpha * P_t + (1 - alpha) * EMA_t-1.
+
+    Each column is seeded with the simple mean of its first `period` values after any leading
+    NaNs (e.g. another indicator's warm-up), and the recursion runs as a compiled IIR filter.
+
+    Parameters:
+        matrix (np.ndarray): Values, one series per column.
+        period (int): EMA period; alpha = 2 / (period + 1).
+
+    Returns:
+        np.ndarray: Moving averages, NaN before each column's seed.
+    """
+    period = int(period)
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(len(matrix), -1)
+    alpha = 2 / float(period + 1)
+    result = np.full(matrix.shape, np.nan)
+
+    # Align every column on its first valid value so all seeds sit on the same row
+    starts = _first_valid_rows(matrix)
+    n_rows = len(matrix) - starts.min() if matrix.size else 0
+    if n_rows < period:
+        return result
+    offsets = np.arange(n_rows)[:, None]
+    source_rows = starts[None, :] + offsets
+    inside = source_rows < len(matrix)
+    aligned = np.where(inside, matrix[np.minimum(source_rows, len(matrix) - 1), np.arange(matrix.shape[1])], np.nan)
+
+    seeds = aligned[:period].mean(axis=0)
+    smoothed = np.empty_like(aligned)
+    smoothed[:period - 1] = np.nan
+    smoothed[period - 1] = seeds
+    if n_rows > period:
+        smoothed[period:], _ = lfilter([alpha], [1, -(1 - alpha)], aligned[period:], axis=0,
+                                       zi=((1 - alpha) * seeds)[None, :])
+
+    columns = np.broadcast_to(np.arange(matrix.shape[1]), aligned.shape)
+    result[source_rows[inside], columns[inside]] = smoothed[inside]
+    return result
+
+
+def _price_moves(matrix):
+    # Gains and losses between consecutive rows; np.maximum propagates NaN like the builtin max(change, 0)
+    changes = np.diff(matrix, axis=0)
+    return np.maximum(changes, 0), np.maximum(-changes, 0)
+
+
+def _wilder_rsi(gains, losses, period):
+    # RSI from the price moves of a (bars x series) matrix, which has one row more than the moves
+    result = np.full((len(gains) + 1, gains.shape[1]), np.nan)
+    if len(gains) < period:
+        return result
+
+    decay = (period - 1) / period
+    averages = []
+    for moves in (gains, losses):
+        seeds = moves[:period].mean(axis=0)
+        smoothed = np.empty((len(moves) - period + 1, moves.shape[1]))
+        smoothed[0] = seeds
+        if len(smoothed) > 1:
+            smoothed[1:], _ = lfilter([1 / period], [1, -decay], moves[period:], axis=0,
+                                      zi=(decay * seeds)[None, :])
+        averages.append(smoothed)
+    avg_gain, avg_loss = averages
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100 - (100 / (1 + avg_gain / avg_loss))
+    result[period:] = np.where(avg_loss == 0, 100.0, values)
+    return result
+
+
+def rsi(matrix, period=14):
+    """
+    Relative Strength Index of each column with Wilder smoothing.
+
+    Average gain/loss are seeded with the mean of the first `period` changes and then updated
+    as avg_t = (avg_t-1 * (period - 1) + value_t) / period. RSI is 100 when the average loss is 0.
+
+    Parameters:
+        matrix (np.ndarray): Prices, one series per column.
+        period (int): RSI period.
+
+    Returns:
+        np.ndarray: RSI values, NaN for the first `period` rows.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(len(matrix), -1)
+    if len(matrix) <= int(period):
+        return np.full(matrix.shape, np.nan)
+    return _wilder_rsi(*_price_moves(matrix), int(period))
+
+
+def rsi_sweep(matrix, periods):
+    """
+    RSI of each column for several periods, sharing one pass of price differences.
+
+    Returns:
+        dict: {period: np.ndarray of RSI values}.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(len(matrix), -1)
+    if len(matrix) == 0:
+        return {period: np.full(matrix.shape, np.nan) for period in periods}
+    gains, losses = _price_moves(matrix)
+    return {period: _wilder_rsi(gains, losses, int(period)) for period in periods}
+
+
+def macd(matrix, short_period=12, long_period=26, signal_period=9):
+    """
+    MACD line (EMA(short) - EMA(long)) and its signal line (EMA of the MACD line).
+
+    Returns:
+        tuple: (macd_line, signal_line) arrays shaped like matrix.
+    """
+    macd_line = ema(matrix, short_period) - ema(matrix, long_period)
+    return macd_line, ema(macd_line, signal_period)
+
+
+def compute_indicators(df, price_column='Close', group_column=None, sma_period=50, rsi_period=14,
+                       short_period=12, long_period=26, signal_period=9):
+    """
+    Computes SMA, RSI, MACD and signal line for every group of a long DataFrame in one pass.
+
+    Rows of each group are assumed to be in chronological order.
+
+    Parameters:
+        df (pd.DataFrame): Price data in long format.
+        price_column (str): Column holding the prices.
+        group_column (str, optional): Column identifying the series (e.g. 'stock').
+        sma_period, rsi_period, short_period, long_period, signal_period (int): Indicator periods.
+
+    Returns:
+        pd.DataFrame: Columns 'SMA', 'RSI', 'MACD_Line' and 'Signal_Line', indexed like df.
+    """
+    groups = df[group_column].to_numpy() if group_column else None
+    matrix, rows, columns = pack_groups(df[price_column].to_numpy(), groups)
+    macd_line, signal_line = macd(matrix, short_period, long_period, signal_period)
+    return pd.DataFrame({
+        'SMA': sma(matrix, sma_period)[rows, columns],
+        'RSI': rsi(matrix, rsi_period)[rows, columns],
+        'MACD_Line': macd_line[rows, columns],
+        'Signal_Line': signal_line[rows, columns],
+    }, index=df.index)
+
+
+def macd_sweep(matrix, period_pairs, signal_period=9):
+    """
+    MACD and signal lines for several (short, long) period pairs, computing each distinct EMA once.
+
+    Returns:
+        dict: {(short, long): (macd_line, signal_line)}.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(len(matrix), -1)
+    emas = {period: ema(matrix, period) for period in sorted({int(p) for pair in period_pairs for p in pair})}
+    results = {}
+    for short_period, long_period in period_pairs:
+        macd_line = emas[int(short_period)] - emas[int(long_period)]
+        results[(short_period, long_period)] = (macd_line, ema(macd_line, signal_period))
+    return results
+
+
+def compute_indicator_sweep(df, price_column='Close', group_column=None, sma_periods=(), rsi_periods=(),
+                            macd_periods=(), signal_period=9):
+    """
+    Computes indicators over grids of periods for every group of a long DataFrame.
+
+    Running sums are computed once for all SMA windows, price differences once for all RSI
+    periods and each distinct EMA once for all MACD pairs, so a grid costs little more than
+    a single pass.
+
+    Parameters:
+        df (pd.DataFrame): Price data in long format, each group's rows in chronological order.
+        price_column (str): Column holding the prices.
+        group_column (str, optional): Column identifying the series (e.g. 'stock').
+        sma_periods (list of int): SMA window lengths.
+        rsi_periods (list of int): RSI periods.
+        macd_periods (list of tuple): (short, long) EMA period pairs.
+        signal_period (int): EMA period of the signal lines.
+
+    Returns:
+        pd.DataFrame: Columns 'SMA_{period}', 'RSI_{period}', 'MACD_{short}_{long}' and
+        'Signal_{short}_{long}_{signal}', indexed like df.
+    """
+    groups = df[group_column].to_numpy() if group_column else None
+    matrix, rows, columns = pack_groups(df[price_column].to_numpy(), groups)
+
+    results = {}
+    for period, values in sma_sweep(matrix, sma_periods).items():
+        results[f"SMA_{period}"] = values[rows, columns]
+    for period, values in rsi_sweep(matrix, rsi_periods).items():
+        results[f"RSI_{period}"] = values[rows, columns]
+    for (short_period, long_period), (macd_line, signal_line) in macd_sweep(matrix, macd_periods, signal_period).items():
+        results[f"MACD_{short_period}_{long_period}"] = macd_line[rows, columns]
+        results[f"Signal_{short_period}_{long_period}_{signal_period}"] = signal_line[rows, columns]
+    return pd.DataFrame(results, index=df.index)
@@ -1,11 +1,12 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
 import numpy as np
-import nltk
-nltk.download('vader_lexicon')
+from lazy_imports import lazy_import
+from sentiment_engine import DEFAULT_CHUNKSIZE, parallel_score, nltk_scorer
+from sentiment_categories import SENTIMENT_THRESHOLDS, categorize_column
+from topic_stream import DEFAULT_TOPIC_CHUNKSIZE, OnlineTopicModel, iter_text_chunks
+
+# Plotting is only loaded when a figure is drawn, so scoring-only jobs start fast
+plt = lazy_import('matplotlib.pyplot')
 
 class Insight:
     def __init__(self, dataframe):
@@ -13,30 +14,28 @@ class Insight:
         Initializes the Insight class with the provided DataFrame.
         """
         self.dataframe = dataframe
+        # Online topic model of the last topic_modeling(mode='online') call
+        self.topic_model = None
 
-    def sentiment_analysis(self):
+    def sentiment_analysis(self, n_jobs=1, chunksize=DEFAULT_CHUNKSIZE, thresholds=SENTIMENT_THRESHOLDS):
         """
         Perform sentiment analysis on the headlines to gauge the sentiment (positive, negative, neutral)
         and visualize the sentiment distribution.
+
+        Args:
+            n_jobs (int): Number of worker processes; 1 scores in the current process, None or -1 uses all cores.
+            chunksize (int): Number of headlines sent to a worker per task.
+            thresholds (tuple): (lower, upper) bounds of the neutral band.
         """
         if 'headline' not in self.dataframe.columns:
             raise ValueError("The dataframe does not contain a 'headline' column. Please provide the correct input.")
         
-        # Initialize sentiment analyzer
-        analyzer = SentimentIntensityAnalyzer()
-
-        # Function to calculate sentiment score
-        def calculate_sentiment(text):
-            sentiment = analyzer.polarity_scores(text)
-            return sentiment['compound']  # Return the compound score
-
-        # Apply the sentiment analysis
-        self.dataframe['sentiment'] = self.dataframe['headline'].apply(calculate_sentiment)
+        # Apply the sentiment analysis, sharded across worker processes when n_jobs > 1
+        scores = parallel_score(self.dataframe['headline'].tolist(), nltk_scorer, n_jobs=n_jobs, chunksize=chunksize)
+        self.dataframe['sentiment'] = scores[:, -1]  # Use the compound score
 
         # Categorize sentiment as positive, negative, or neutral
-        self.dataframe['sentiment_category'] = self.dataframe['sentiment'].apply(
-            lambda x: 'positive' if x > 0.1 else 'negative' if x < -0.1 else 'neutral'
-        )
+        categorize_column(self.dataframe, 'sentiment', thresholds=thresholds)
 
         # Plot sentiment distribution
         sentiment_counts = self.dataframe['sentiment_category'].value_counts(normalize=True)
@@ -46,16 +45,59 @@ class Insight:
         plt.xlabel("Sentiment")
         plt.show()
 
-    def topic_modeling(self, num_topics=5, num_words=10):
+    def topic_modeling(self, num_topics=5, num_words=10, mode='batch', model_path=None,
+                       chunksize=DEFAULT_TOPIC_CHUNKSIZE, n_jobs=1):
         """
         Perform topic modeling using Latent Dirichlet Allocation (LDA) to extract key topics from headlines.
 
         Args:
             num_topics (int): The number of topics to extract (default is 5).
             num_words (int): The number of top words to display for each topic (default is 10).
+            mode (str): 'batch' fits TF-IDF and batch LDA on all headlines in memory; 'online' hashes
+                the headlines and trains an online LDA chunk by chunk (see OnlineTopicModel).
+            model_path (str, optional): Online mode only; a saved model is loaded from this path and
+                updated with the headlines instead of refitting, then saved back; num_topics must
+                match the saved model.
+            chunksize (int): Online mode only; number of headlines vectorized at a time.
+            n_jobs (int): Number of jobs used by LDA; None or -1 uses all cores.
         """
         if 'headline' not in self.dataframe.columns:
             raise ValueError("The dataframe does not contain a 'headline' column. Please provide the correct input.")
+        if mode not in ('batch', 'online'):
+            raise ValueError("mode must be 'batch' or 'online'.")
+
+        if mode == 'online':
+            self.topic_model = OnlineTopicModel.load_or_create(model_path, num_topics=num_topics, n_jobs=n_jobs)
+            headlines = self.dataframe['headline'].fillna('').to_numpy()
+            self.topic_model.fit_stream(iter_text_chunks(headlines, chunksize))
+            if model_path is not None:
+                self.topic_model.save(model_path)
+            print(f"Online topic model updated with {len(headlines)} headlines "
+                  f"({self.topic_model.n_documents} in total).")
+
+            # Name the hashed features after the most recent headlines
+            for topic_idx, top_words in enumerate(self.topic_model.top_words(headlines[-chunksize:], num_words)):
+                print(f"Topic {topic_idx + 1}:")
+                print(" ".join(top_words))
+                print("\n")
+            self.dataframe['dominant_topic'] = self.topic_model.dominant_topics(headlines, chunksize)
+        else:
+            self._batch_topic_modeling(num_topics, num_words, n_jobs)
+
+        # Plot the distribution of topics across articles
+        topic_counts = self.dataframe['dominant_topic'].value_counts()
+        topic_counts.plot(kind='bar', color='purple', alpha=0.7)
+        plt.title("Topic Distribution Across Articles")
+        plt.xlabel("Topic")
+        plt.ylabel("Number of Articles")
+        plt.show()
+
+    def _batch_topic_modeling(self, num_topics, num_words, n_jobs):
+        """
+        Fits TF-IDF and batch LDA on all headlines and sets the 'dominant_topic' column.
+        """
+        from sklearn.decomposition import LatentDirichletAllocation
+        from sklearn.feature_extraction.text import TfidfVectorizer
 
         # Create a TF-IDF vectorizer
         vectorizer = TfidfVectorizer(stop_words='english', max_df=0.95, min_df=2)
@@ -64,7 +106,7 @@ class Insight:
         tfidf_matrix = vectorizer.fit_transform(self.dataframe['headline'])
 
         # Apply Latent Dirichlet Allocation (LDA)
-        lda = LatentDirichletAllocation(n_components=num_topics, random_state=42)
+        lda = LatentDirichletAllocation(n_components=num_topics, random_state=42, n_jobs=n_jobs)
         lda.fit(tfidf_matrix)
 
         # Get the top words for each topic
@@ -80,14 +122,6 @@ class Insight:
         topic_distribution = lda.transform(tfidf_matrix)
         self.dataframe['dominant_topic'] = topic_distribution.argmax(axis=1)
 
-        # Plot the distribution of topics across articles
-        topic_counts = self.dataframe['dominant_topic'].value_counts()
-        topic_counts.plot(kind='bar', color='purple', alpha=0.7)
-        plt.title("Topic Distribution Across Articles")
-        plt.xlabel("Topic")
-        plt.ylabel("Number of Articles")
-        plt.show()
-
     def plot_sentiment_vs_topic_distribution(self):
         """
         Plots sentiment distribution against topic distribution.
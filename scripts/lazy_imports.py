@@ -0,0 +1,40 @@
+# lazy_imports.py
+import importlib
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Module placeholder that imports the real module on first attribute access.
+
+    Every access is forwarded to the real module (a sys.modules lookup once it is loaded), so
+    attributes patched on the real module, e.g. plt.show, are seen through the placeholder.
+    """
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = name
+
+    def _load(self):
+        return importlib.import_module(self.__dict__['_lazy_target'])
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """
+    Returns a placeholder for a heavy module (e.g. 'matplotlib.pyplot') that is only imported when first used.
+
+    Parameters:
+        name (str): Absolute module name.
+
+    Returns:
+        module: Placeholder usable like the module itself, e.g. plt = lazy_import('matplotlib.pyplot').
+    """
+    return _LazyModule(name)
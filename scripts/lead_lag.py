@@ -0,0 +1,126 @@
+# lead_lag.py
+import numpy as np
+import pandas as pd
+from scipy.fft import irfft, next_fast_len, rfft
+
+from portfolio_engine import build_panel, returns_matrix
+
+# Number of lags from which the FFT formulation is used instead of shifted slices
+FFT_MIN_LAGS = 64
+
+
+def _direct_cross_sums(pairs, lags):
+    # sum_t a[t] * b[t + lag] for every (a, b) pair and lag, with shifted slices of the whole matrix
+    n_rows = pairs[0][0].shape[0]
+    sums = np.zeros((len(pairs), len(lags), pairs[0][0].shape[1]))
+    for j, lag in enumerate(lags):
+        if abs(lag) >= n_rows:
+            continue
+        for i, (a, b) in enumerate(pairs):
+            if lag >= 0:
+                sums[i, j] = np.einsum('ij,ij->j', a[:n_rows - lag], b[lag:])
+            else:
+                sums[i, j] = np.einsum('ij,ij->j', a[-lag:], b[:n_rows + lag])
+    return sums
+
+
+def _fft_cross_sums(pairs, lags):
+    # Same sums for all lags at once: the cross-correlation of each column pair through a zero-padded FFT
+    n_rows = pairs[0][0].shape[0]
+    size = next_fast_len(2 * n_rows - 1, real=True)
+    spectra = {}
+
+    def spectrum(values):
+        if id(values) not in spectra:
+            spectra[id(values)] = rfft(values, size, axis=0)
+        return spectra[id(values)]
+
+    positions = np.asarray(lags) % size
+    sums = np.zeros((len(pairs), len(lags), pairs[0][0].shape[1]))
+    for i, (a, b) in enumerate(pairs):
+        sums[i] = irfft(np.conj(spectrum(a)) * spectrum(b), size, axis=0)[positions]
+    sums[:, np.abs(np.asarray(lags)) >= n_rows] = 0
+    return sums
+
+
+def lagged_correlations(x, y, lags, method='auto'):
+    """
+    Pearson correlation of x[t] with y[t + lag] in every column, for every lag, ignoring missing pairs.
+
+    The correlation only needs the pairwise counts and sums of x, y, x^2, y^2 and xy over the
+    overlapping rows, which are cross-correlations of the (zero-filled) columns and their masks.
+    They are computed for all columns at once, either with shifted slices per lag or, for many
+    lags, with one FFT per series.
+
+    Parameters:
+        x, y (np.ndarray): (dates x stocks) matrices with NaN for missing values.
+        lags (list of int): Lags in rows; positive lags pair x with later y (x leads).
+        method (str): 'direct', 'fft' or 'auto' (FFT from FFT_MIN_LAGS lags).
+
+    Returns:
+        tuple: (correlations, counts) as (lags x stocks) arrays; NaN where fewer than 3 pairs or no variance.
+    """
+    if method == 'auto':
+        method = 'fft' if len(lags) >= FFT_MIN_LAGS else 'direct'
+    if method not in ('direct', 'fft'):
+        raise ValueError("method must be 'direct', 'fft' or 'auto'.")
+
+    x_valid, y_valid = ~np.isnan(x), ~np.isnan(y)
+    # Centering each column first keeps the variance differences below well conditioned
+    x0, y0 = np.where(x_valid, x, 0.0), np.where(y_valid, y, 0.0)
+    x0 = np.where(x_valid, x0 - x0.sum(axis=0) / np.maximum(x_valid.sum(axis=0), 1), 0.0)
+    y0 = np.where(y_valid, y0 - y0.sum(axis=0) / np.maximum(y_valid.sum(axis=0), 1), 0.0)
+    x_mask, y_mask = x_valid.astype(np.float64), y_valid.astype(np.float64)
+    pairs = [(x_mask, y_mask), (x0, y_mask), (x_mask, y0), (x0 * x0, y_mask), (x_mask, y0 * y0), (x0, y0)]
+
+    cross_sums = _fft_cross_sums if method == 'fft' else _direct_cross_sums
+    count, sx, sy, sxx, syy, sxy = cross_sums(pairs, list(lags))
+    count = np.rint(count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = sxy - sx * sy / count
+        x_variance = sxx - sx * sx / count
+        y_variance = syy - sy * sy / count
+        correlations = covariance / np.sqrt(x_variance * y_variance)
+    tiny = 1e-12 * np.maximum(sxx, 1e-300) * np.maximum(syy, 1e-300)
+    correlations[(count < 3) | ~(x_variance * y_variance > tiny)] = np.nan
+    return np.clip(correlations, -1, 1), count.astype(np.int64)
+
+
+def lead_lag_correlation(df, max_lag=5, price_column='Close', sentiment_column='sentiment_score',
+                         date_column='date', stock_column='stock', method='auto'):
+    """
+    Correlation of daily sentiment with returns from max_lag days before to max_lag days after, for every stock.
+
+    The merged frame is pivoted once into aligned (dates x stocks) matrices: daily sentiment is
+    the sum of the scores of a (date, stock) and the return is the percent change of the close.
+
+    Parameters:
+        df (pd.DataFrame): Merged price/sentiment frame.
+        max_lag (int): Largest lag k; lags run from -k to +k. Lag k pairs sentiment on date t
+            with the return k trading dates later (sentiment leads for k > 0).
+        method (str): 'direct', 'fft' or 'auto', see lagged_correlations.
+
+    Returns:
+        pd.DataFrame: Tidy frame with 'stock', 'lag', 'corr' and 'n' (number of paired dates).
+    """
+    panel = build_panel(df, price_column, sentiment_column, date_column, stock_column)
+    returns = returns_matrix(panel['close'])
+    # Sentiment only where the stock has a price, so the pairs count trading dates of that stock
+    sentiment = np.where(np.isnan(panel['close']), np.nan, panel['sentiment'])
+
+    lags = np.arange(-int(max_lag), int(max_lag) + 1)
+    correlations, counts = lagged_correlations(sentiment, returns, lags, method)
+    n_stocks = len(panel['stocks'])
+    return pd.DataFrame({
+        'stock': np.tile(np.asarray(panel['stocks']), len(lags)),
+        'lag': np.repeat(lags, n_stocks),
+        'corr': correlations.ravel(),
+        'n': counts.ravel(),
+    })
+
+
+def lead_lag_matrix(lead_lag):
+    """
+    Pivots a tidy lead/lag frame into a (stock x lag) correlation matrix, e.g. for StockPlot.stock_sentiment_correlation.
+    """
+    return lead_lag.pivot(index='stock', columns='lag', values='corr')
@@ -0,0 +1,185 @@
+# news_stream.py
+import numpy as np
+import pandas as pd
+
+from date_utils import parse_local_days
+
+# Number of news rows read per chunk
+DEFAULT_NEWS_CHUNKSIZE = 100000
+
+# Partial aggregates that can be merged across chunks, and how to merge them
+_MERGE_AGGREGATIONS = {
+    'article_count': 'sum',
+    'sentiment_sum': 'sum',
+    'sentiment_min': 'min',
+    'sentiment_max': 'max',
+    'positive_count': 'sum',
+    'neutral_count': 'sum',
+    'negative_count': 'sum',
+}
+
+
+def iter_news_chunks(file_path, chunksize=DEFAULT_NEWS_CHUNKSIZE, columns=None):
+    """
+    Reads a news CSV file chunk by chunk.
+
+    Parameters:
+        file_path (str): Path of the news CSV file.
+        chunksize (int): Number of rows per chunk.
+        columns (list of str, optional): Columns to read.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the file.
+    """
+    with pd.read_csv(file_path, chunksize=chunksize, usecols=columns) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def prepare_news(df, analyzer, text_column='headline', n_jobs=1):
+    """
+    Reduces the 'date' column to the publication day and adds sentiment columns.
+
+    The day is taken from the first ten characters of the timestamp, i.e. the local date
+    of publication, and rows without a valid date are dropped.
+
+    Parameters:
+        df (pd.DataFrame): News rows with 'date', 'stock' and text columns.
+        analyzer (SentimentAnalyzer): Analyzer used to score the text column.
+        text_column (str): Name of the column containing the headlines.
+        n_jobs (int): Number of worker processes used for scoring.
+
+    Returns:
+        pd.DataFrame: The rows with a valid date, with 'sentiment_score', 'sentiment_category' and 'sentiment'.
+    """
+    df = df.copy()
+    df['date'], _ = parse_local_days(df['date'])
+    df = df.dropna(subset=['date'])
+    return analyzer.calculate_sentiment(df, text_column, n_jobs=n_jobs)
+
+
+def aggregate_daily_sentiment(df):
+    """
+    Computes mergeable per-(date, stock) sentiment aggregates of scored news rows.
+
+    Parameters:
+        df (pd.DataFrame): Rows with 'date', 'stock', 'sentiment_score' and 'sentiment' columns.
+
+    Returns:
+        pd.DataFrame: Partial aggregates indexed by ('date', 'stock').
+    """
+    grouped = df.assign(
+        positive=df['sentiment'] == 1,
+        neutral=df['sentiment'] == 0,
+        negative=df['sentiment'] == -1,
+    ).groupby(['date', 'stock'], observed=True, sort=False)
+    return grouped.agg(
+        article_count=('sentiment_score', 'size'),
+        sentiment_sum=('sentiment_score', 'sum'),
+        sentiment_min=('sentiment_score', 'min'),
+        sentiment_max=('sentiment_score', 'max'),
+        positive_count=('positive', 'sum'),
+        neutral_count=('neutral', 'sum'),
+        negative_count=('negative', 'sum'),
+    )
+
+
+def merge_daily_sentiment(partials):
+    """
+    Merges partial aggregates computed on disjoint sets of news rows.
+
+    Parameters:
+        partials (list of pd.DataFrame): Outputs of aggregate_daily_sentiment.
+
+    Returns:
+        pd.DataFrame: Merged partial aggregates indexed by ('date', 'stock').
+    """
+    combined = pd.concat(partials)
+    return combined.groupby(level=['date', 'stock'], observed=True, sort=False).agg(_MERGE_AGGREGATIONS)
+
+
+def merge_into_running(running, partial):
+    """
+    Merges the partial aggregate of one chunk into the running aggregate.
+
+    Groups already present in the running aggregate are updated in place by position, and
+    only the new groups are appended, so the running aggregate is never regrouped.
+
+    Parameters:
+        running (pd.DataFrame or None): Running aggregate indexed by ('date', 'stock').
+        partial (pd.DataFrame): Output of aggregate_daily_sentiment for the next chunk.
+
+    Returns:
+        pd.DataFrame: The updated running aggregate.
+    """
+    if running is None:
+        return partial
+    positions = running.index.get_indexer(partial.index)
+    shared = positions >= 0
+    if shared.any():
+        rows = positions[shared]
+        for column, how in _MERGE_AGGREGATIONS.items():
+            values = running[column].to_numpy(copy=True)
+            incoming = partial[column].to_numpy()[shared]
+            if how == 'sum':
+                values[rows] += incoming
+            elif how == 'min':
+                values[rows] = np.minimum(values[rows], incoming)
+            else:
+                values[rows] = np.maximum(values[rows], incoming)
+            running[column] = values
+    if shared.all():
+        return running
+    return pd.concat([running, partial[~shared]])
+
+
+def finalize_daily_sentiment(partial):
+    """
+    Turns partial aggregates into the final per-(date, stock) sentiment table.
+
+    Returns:
+        pd.DataFrame: One row per (date, stock), sorted, with 'sentiment_mean' added.
+    """
+    daily = partial.sort_index().reset_index()
+    daily.insert(daily.columns.get_loc('sentiment_sum') + 1, 'sentiment_mean',
+                 daily['sentiment_sum'] / daily['article_count'])
+    return daily
+
+
+def daily_sentiment(df, analyzer, text_column='headline', n_jobs=1):
+    """
+    In-memory pipeline: scores a whole news frame and aggregates it per (date, stock).
+
+    Returns:
+        pd.DataFrame: Same table as stream_daily_sentiment.
+    """
+    scored = prepare_news(df, analyzer, text_column=text_column, n_jobs=n_jobs)
+    return finalize_daily_sentiment(aggregate_daily_sentiment(scored))
+
+
+def stream_daily_sentiment(file_path, analyzer, chunksize=DEFAULT_NEWS_CHUNKSIZE, text_column='headline', n_jobs=1):
+    """
+    Streaming pipeline: parses, scores and aggregates a news CSV file chunk by chunk.
+
+    Only one chunk of raw rows is held in memory at a time; the running aggregate has one
+    row per (date, stock), so peak memory is bounded by the chunk size rather than the file size.
+
+    Parameters:
+        file_path (str): Path of the news CSV file.
+        analyzer (SentimentAnalyzer): Analyzer used to score the headlines.
+        chunksize (int): Number of rows per chunk.
+        text_column (str): Name of the column containing the headlines.
+        n_jobs (int): Number of worker processes used for scoring each chunk.
+
+    Returns:
+        pd.DataFrame: One row per (date, stock) with article count, sum, mean, min and max
+        sentiment score and the number of positive, neutral and negative articles.
+    """
+    running = None
+    for chunk in iter_news_chunks(file_path, chunksize=chunksize, columns=['date', 'stock', text_column]):
+        partial = aggregate_daily_sentiment(prepare_news(chunk, analyzer, text_column=text_column, n_jobs=n_jobs))
+        running = merge_into_running(running, partial)
+
+    if running is None:
+        raise ValueError(f"No news rows found in {file_path}.")
+    return finalize_daily_sentiment(running)
@@ -0,0 +1,11 @@
+# parallel.py
+import os
+
+
+def resolve_n_jobs(n_jobs):
+    """
+    Converts an n_jobs argument into a number of worker processes (None or -1 means all cores).
+    """
+    if n_jobs is None or n_jobs < 0:
+        return os.cpu_count() or 1
+    return max(int(n_jobs), 1)
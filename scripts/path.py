@@ -1,6 +1,7 @@
 import pandas as pd 
 import os 
 import os
+from news_stream import DEFAULT_NEWS_CHUNKSIZE, iter_news_chunks
 
 # Get the current working directory
 current_dir = os.getcwd()
@@ -43,3 +44,9 @@ def load_news_csv(file_path):
         print(f"Error loading file {file_path}: {e}")
         return None
 
+
+def iter_news_csv(file_path, chunksize=DEFAULT_NEWS_CHUNKSIZE, columns=None):
+    """Reads a news CSV file as a generator of DataFrame chunks, for files larger than memory."""
+    if not os.path.isfile(file_path) or not file_path.endswith('.csv'):
+        raise ValueError("The provided file path is invalid or not a CSV file.")
+    return iter_news_chunks(file_path, chunksize=chunksize, columns=columns)
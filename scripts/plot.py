@@ -3,22 +3,41 @@ import plotly.graph_objects as go
 import seaborn as sns
 import matplotlib.pyplot as plt
 from sklearn.cluster import KMeans
+from downsample import WEBGL_MIN_POINTS, downsample
 
 class StockPlot:
-    def __init__(self, dataframe):
+    def __init__(self, dataframe, max_points=None, downsample_method='lttb'):
+        """
+        Parameters:
+            dataframe (pd.DataFrame): Price and indicator data indexed by date.
+            max_points (int, optional): Point budget per Plotly trace; long series are downsampled
+                to it before plotting. None plots every bar.
+            downsample_method (str): 'lttb' or 'minmax', see downsample.downsample.
+        """
         self.df = dataframe
+        self.max_points = max_points
+        self.downsample_method = downsample_method
+
+    def _line_trace(self, y, method=None, **kwargs):
+        """
+        Line trace of a column against the index, downsampled to the point budget and drawn
+        with WebGL when it still has many points.
+        """
+        x, y = downsample(self.df.index, y, self.max_points, method or self.downsample_method)
+        trace = go.Scattergl if len(y) > WEBGL_MIN_POINTS else go.Scatter
+        return trace(x=x, y=y, mode='lines', **kwargs)
 
-    def StockPrice50DaySMA(self):
+    def StockPrice50DaySMA(self, show=True):
         """
         Plot Stock Price with 50-Day Simple Moving Average (SMA).
         """
         fig = go.Figure()
 
         # Add Close Price
-        fig.add_trace(go.Scatter(x=self.df.index, y=self.df['Close'], mode='lines', name='Close Price', line=dict(color='blue')))
+        fig.add_trace(self._line_trace(self.df['Close'], name='Close Price', line=dict(color='blue')))
         
         # Add 50-Day SMA
-        fig.add_trace(go.Scatter(x=self.df.index, y=self.df['SMA_50'], mode='lines', name='50-Day SMA', line=dict(color='orange')))
+        fig.add_trace(self._line_trace(self.df['SMA_50'], name='50-Day SMA', line=dict(color='orange')))
 
         # Customize layout
         fig.update_layout(
@@ -30,20 +49,22 @@ class StockPlot:
             paper_bgcolor='rgba(255, 255, 255, 1)',  # White paper background
             font=dict(color='black')  # Black text color
         )
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
-    def RSIPlot(self):
+    def RSIPlot(self, show=True):
         """
         Plot the RSI (Relative Strength Index).
         """
         fig = go.Figure()
 
         # Add RSI line
-        fig.add_trace(go.Scatter(x=self.df.index, y=self.df['RSI_14'], mode='lines', name='RSI (14)', line=dict(color='green')))
+        fig.add_trace(self._line_trace(self.df['RSI_14'], name='RSI (14)', line=dict(color='green')))
         
-        # Add Overbought and Oversold levels
-        fig.add_trace(go.Scatter(x=self.df.index, y=[70] * len(self.df), mode='lines', name='Overbought (70)', line=dict(color='red', dash='dash')))
-        fig.add_trace(go.Scatter(x=self.df.index, y=[30] * len(self.df), mode='lines', name='Oversold (30)', line=dict(color='blue', dash='dash')))
+        # Add Overbought and Oversold levels as layout shapes instead of one point per bar
+        fig.add_hline(y=70, line=dict(color='red', dash='dash'), annotation_text='Overbought (70)')
+        fig.add_hline(y=30, line=dict(color='blue', dash='dash'), annotation_text='Oversold (30)')
 
         # Customize layout
         fig.update_layout(
@@ -55,22 +76,25 @@ class StockPlot:
             paper_bgcolor='rgba(255, 255, 255, 1)',  # White paper background
             font=dict(color='black')  # Black text color
         )
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
-    def MACDPlot(self):
+    def MACDPlot(self, show=True):
         """
         Plot MACD (Moving Average Convergence Divergence) and Signal Line.
         """
         fig = go.Figure()
 
         # Add MACD line
-        fig.add_trace(go.Scatter(x=self.df.index, y=self.df['MACD_Line'], mode='lines', name='MACD Line', line=dict(color='purple')))
+        fig.add_trace(self._line_trace(self.df['MACD_Line'], name='MACD Line', line=dict(color='purple')))
         
         # Add Signal line
-        fig.add_trace(go.Scatter(x=self.df.index, y=self.df['Signal_Line'], mode='lines', name='Signal Line', line=dict(color='red', dash='dash')))
+        fig.add_trace(self._line_trace(self.df['Signal_Line'], name='Signal Line', line=dict(color='red', dash='dash')))
         
-        # Add MACD Histogram
-        fig.add_trace(go.Bar(x=self.df.index, y=self.df['MACD_Line'] - self.df['Signal_Line'], name='MACD Histogram', marker=dict(color='gray', opacity=0.3)))
+        # Add MACD Histogram; bars keep the extremes of each bucket so no spike disappears
+        hist_x, hist_y = downsample(self.df.index, self.df['MACD_Line'] - self.df['Signal_Line'], self.max_points, 'minmax')
+        fig.add_trace(go.Bar(x=hist_x, y=hist_y, name='MACD Histogram', marker=dict(color='gray', opacity=0.3)))
 
         # Customize layout
         fig.update_layout(
@@ -82,7 +106,9 @@ class StockPlot:
             paper_bgcolor='rgba(255, 255, 255, 1)',  # White paper background
             font=dict(color='black')  # Black text color
         )
-        fig.show()
+        if show:
+            fig.show()
+        return fig
 
 
 
@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import minimize
+from portfolio_optimizer import efficient_frontier, max_sharpe_weights, portfolio_performance
+from walk_forward import walk_forward_weights
+from portfolio_engine import build_panel, portfolio_returns, returns_matrix, sentiment_weights
 
 class SentimentPortfolioAnalysis:
     def __init__(self, merged_df):
@@ -14,35 +16,59 @@ class SentimentPortfolioAnalysis:
         self.merged_df = merged_df
         self.portfolio_returns = None
         self.daily_returns = None
+        self.weights = None
         self.assets = None
+        # Aligned (dates x stocks) matrices, built on first use
+        self.panel = None
+
+    def _build_panel(self):
+        """
+        Pivot the merged data once into aligned (dates x stocks) price and sentiment matrices.
+        """
+        if self.panel is None:
+            self.panel = build_panel(self.merged_df)
+        return self.panel
 
     def calculate_daily_returns(self):
         """
         Calculate daily returns for each stock in the merged dataset.
         """
-        # Calculate daily returns using percent change for each stock
-        self.merged_df['daily_return'] = self.merged_df.groupby('stock')['Close'].pct_change()
+        panel = self._build_panel()
+        returns = returns_matrix(panel['close'])
+
+        # Percent change of each stock against its previous bar, also written back to every row
+        self.merged_df['daily_return'] = returns[panel['date_codes'], panel['stock_codes']]
         print("Daily Returns Calculated Successfully.")
-        self.daily_returns = self.merged_df.pivot_table(index='date', columns='stock', values='daily_return')
+        self.daily_returns = pd.DataFrame(returns, index=pd.Index(panel['dates'], name='date'),
+                                          columns=pd.Index(panel['stocks'], name='stock'))
 
-    def assign_sentiment_weights(self):
+    def assign_sentiment_weights(self, normalization='gross'):
         """
         Assign weights to stocks based on sentiment scores.
+
+        Parameters:
+            normalization (str): 'gross' (default) divides each stock's daily sentiment by the sum of
+                absolute sentiment (short on negative news), 'net' by the plain sum on days where it is
+                clearly positive, 'long_only' keeps positive sentiment only. Days whose total is zero (or,
+                for 'net', near zero or negative) hold no position instead of getting inf/NaN weights.
         """
-        # Normalize sentiment scores to determine portfolio weights
-        self.merged_df['weight'] = self.merged_df['sentiment_score'] / self.merged_df.groupby('date')['sentiment_score'].transform('sum')
+        panel = self._build_panel()
+        weights = sentiment_weights(panel['sentiment'], normalization)
+        self.weights = pd.DataFrame(weights, index=pd.Index(panel['dates'], name='date'),
+                                    columns=pd.Index(panel['stocks'], name='stock'))
         print("Sentiment Weights Assigned Successfully.")
 
     def calculate_portfolio_returns(self):
         """
         Calculate portfolio returns by weighting daily returns based on sentiment scores.
         """
-        # Calculate weighted return: Weight * Daily Return
-        self.merged_df['weighted_return'] = self.merged_df['weight'] * self.merged_df['daily_return']
+        if self.daily_returns is None or self.weights is None:
+            raise ValueError("Call calculate_daily_returns() and assign_sentiment_weights() first.")
 
-        # Aggregate weighted returns for each date
-        self.portfolio_returns = self.merged_df.groupby('date')['weighted_return'].sum().reset_index()
-        self.portfolio_returns['cumulative_return'] = (1 + self.portfolio_returns['weighted_return']).cumprod()
+        # Weighted return of each day as one matrix product over the aligned arrays
+        daily, cumulative = portfolio_returns(self.weights.to_numpy(), self.daily_returns.to_numpy())
+        self.portfolio_returns = pd.DataFrame({'date': self.daily_returns.index, 'weighted_return': daily,
+                                               'cumulative_return': cumulative})
         print("Portfolio Returns Calculated Successfully.")
 
     def plot_portfolio_performance(self):
@@ -62,38 +88,22 @@ class SentimentPortfolioAnalysis:
         plt.show()
         print("Portfolio Performance Plot Generated.")
 
-    def optimize_portfolio(self):
+    def optimize_portfolio(self, risk_free_rate=0.01):
         """
         Optimize the portfolio for maximum Sharpe ratio using SciPy optimization.
         """
-        # Step 1: Calculate expected returns and covariance matrix
-        mu = self.daily_returns.mean()  # Mean historical returns
-        cov_matrix = self.daily_returns.cov()  # Covariance matrix of returns
-        num_assets = len(mu)
+        # Step 1: Calculate expected returns and covariance matrix as NumPy arrays
+        mu = self.daily_returns.mean().to_numpy()  # Mean historical returns
+        cov_matrix = self.daily_returns.cov().to_numpy()  # Covariance matrix of returns
+        self.assets = list(self.daily_returns.columns)
 
-        # Step 2: Define objective functions and constraints
-        def portfolio_performance(weights):
-            portfolio_return = np.dot(weights, mu)
-            portfolio_volatility = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
-            return portfolio_return, portfolio_volatility
-        
-        def negative_sharpe_ratio(weights, risk_free_rate=0.01):
-            returns, volatility = portfolio_performance(weights)
-            return -(returns - risk_free_rate) / volatility
-
-        # Constraints: Weights sum to 1, and weights are between 0 and 1
-        constraints = ({'type': 'eq', 'fun': lambda x: np.sum(x) - 1})
-        bounds = tuple((0, 1) for _ in range(num_assets))
-
-        # Initial guess for weights
-        initial_weights = np.array([1. / num_assets] * num_assets)
-
-        # Step 3: Use SciPy minimize function to maximize Sharpe ratio
-        result = minimize(negative_sharpe_ratio, initial_weights, bounds=bounds, constraints=constraints)
+        # Step 2: Maximize the Sharpe ratio with SLSQP, weights between 0 and 1 summing to 1,
+        # using the analytic gradient instead of finite differences
+        result = max_sharpe_weights(mu, cov_matrix, risk_free_rate=risk_free_rate)
 
         if result.success:
             optimized_weights = result.x
-            portfolio_return, portfolio_volatility = portfolio_performance(optimized_weights)
+            portfolio_return, portfolio_volatility = portfolio_performance(optimized_weights, mu, cov_matrix)
             sharpe_ratio = -result.fun
             print("Optimized Portfolio Weights:", optimized_weights)
             print("Portfolio Return:", portfolio_return)
@@ -103,6 +113,48 @@ class SentimentPortfolioAnalysis:
         else:
             raise ValueError("Optimization failed:", result.message)
 
+    def efficient_frontier(self, target_returns=None, n_points=50):
+        """
+        Compute the efficient frontier with warm-started minimum-variance solves.
+
+        Parameters:
+            target_returns (array-like, optional): Portfolio returns to solve for; by default
+                n_points returns evenly spaced between the lowest and highest asset mean return.
+            n_points (int): Number of default target returns.
+
+        Returns:
+            tuple: (frontier DataFrame with return and volatility per target, weights DataFrame)
+        """
+        mu = self.daily_returns.mean().to_numpy()
+        cov_matrix = self.daily_returns.cov().to_numpy()
+        self.assets = list(self.daily_returns.columns)
+        if target_returns is None:
+            target_returns = np.linspace(mu.min(), mu.max(), n_points)
+        return efficient_frontier(mu, cov_matrix, target_returns, assets=self.assets)
+
+    def walk_forward(self, window=252, rebalance_every=21, estimator='rolling', halflife=63, shrinkage=None,
+                     risk_free_rate=0.01, n_jobs=1):
+        """
+        Re-optimize the portfolio on rolling windows of daily returns (walk-forward backtest).
+
+        Parameters:
+            window (int): Number of days in each estimation window.
+            rebalance_every (int): Number of days between rebalances.
+            estimator (str): 'rolling' for a rolling-window covariance, 'ewma' for an exponentially weighted one.
+            halflife (float): Half-life in days of the 'ewma' estimator.
+            shrinkage (float, optional): Shrinkage intensity of the covariance towards a scaled identity.
+            risk_free_rate (float): Daily risk-free rate.
+            n_jobs (int): Number of worker processes for the rebalance solves.
+
+        Returns:
+            pd.DataFrame: Weights with one row per rebalance date and one column per stock.
+        """
+        if self.daily_returns is None:
+            raise ValueError("Daily returns not calculated. Call calculate_daily_returns() first.")
+        return walk_forward_weights(self.daily_returns, window=window, rebalance_every=rebalance_every,
+                                    estimator=estimator, halflife=halflife, shrinkage=shrinkage,
+                                    risk_free_rate=risk_free_rate, n_jobs=n_jobs)
+
     def run_analysis(self):
         """
         Run the entire analysis pipeline with merged data.
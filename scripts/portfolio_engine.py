@@ -0,0 +1,89 @@
+# portfolio_engine.py
+import numpy as np
+import pandas as pd
+
+# Daily sentiment totals smaller than this are treated as zero (no position that day)
+ZERO_SENTIMENT = 1e-12
+# With 'net' weights, days whose net sentiment is below this share of the absolute sentiment hold
+# no position, which caps the gross exposure at 1 / MIN_NET_SHARE and skips net-negative days
+MIN_NET_SHARE = 0.1
+
+
+def build_panel(df, price_column='Close', sentiment_column='sentiment_score', date_column='date', stock_column='stock'):
+    """
+    Pivots a long price/sentiment frame into aligned (dates x stocks) matrices in one pass.
+
+    Rows repeated per headline share one price, so the price of a cell is its first price,
+    while the sentiment of a cell is the sum of its scores (0 without news).
+
+    Returns:
+        dict: 'dates', 'stocks', 'date_codes', 'stock_codes' (row -> cell), 'close' and 'sentiment' matrices.
+    """
+    date_codes, dates = pd.factorize(df[date_column], sort=True)
+    stock_codes, stocks = pd.factorize(df[stock_column], sort=True)
+    shape = (len(dates), len(stocks))
+    cells = date_codes * shape[1] + stock_codes
+
+    close = np.full(shape[0] * shape[1], np.nan)
+    # Reversed assignment so the first row of each cell wins
+    close[cells[::-1]] = df[price_column].to_numpy(dtype=np.float64)[::-1]
+
+    panel = {'dates': dates, 'stocks': stocks, 'date_codes': date_codes, 'stock_codes': stock_codes,
+             'close': close.reshape(shape)}
+    if sentiment_column in df.columns:
+        scores = df[sentiment_column].to_numpy(dtype=np.float64)
+        sentiment = np.bincount(cells, weights=np.nan_to_num(scores), minlength=shape[0] * shape[1])
+        panel['sentiment'] = sentiment.reshape(shape)
+    return panel
+
+
+def returns_matrix(close):
+    """
+    Percent change of each column against its previous available price, NaN where there is no price.
+    """
+    previous = pd.DataFrame(close).ffill().shift(1).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return close / previous - 1
+
+
+def sentiment_weights(sentiment, normalization='gross'):
+    """
+    Portfolio weights of each day from the sentiment of each stock.
+
+    Parameters:
+        sentiment (np.ndarray): (dates x stocks) sentiment totals.
+        normalization (str):
+            'gross': s / sum(|s|), long positive and short negative sentiment, gross exposure 1;
+            'net': s / sum(s), the original scheme, only on days where sum(s) is at least
+                MIN_NET_SHARE * sum(|s|) (a near-zero or negative sum would give huge or
+                sign-flipped weights);
+            'long_only': positive sentiment only, max(s, 0) / sum(max(s, 0)).
+
+    Returns:
+        np.ndarray: Weights; days whose normalizing total is zero get all-zero weights instead of inf/NaN.
+    """
+    gross = np.abs(sentiment).sum(axis=1)
+    if normalization == 'gross':
+        totals = gross
+        safe = totals > ZERO_SENTIMENT
+    elif normalization == 'net':
+        totals = sentiment.sum(axis=1)
+        safe = (totals > ZERO_SENTIMENT) & (totals >= MIN_NET_SHARE * gross)
+    elif normalization == 'long_only':
+        sentiment = np.maximum(sentiment, 0)
+        totals = sentiment.sum(axis=1)
+        safe = totals > ZERO_SENTIMENT
+    else:
+        raise ValueError("normalization must be 'gross', 'net' or 'long_only'.")
+    return np.where(safe[:, None], sentiment / np.where(safe, totals, 1.0)[:, None], 0.0)
+
+
+def portfolio_returns(weights, returns):
+    """
+    Daily portfolio return sum(w * r) (missing returns count as 0) and its cumulative growth.
+
+    Returns:
+        tuple: (daily portfolio returns, cumulative returns) as arrays with one value per date.
+    """
+    daily = np.nansum(weights * returns, axis=1)
+    return daily, np.cumprod(1 + daily)
@@ -0,0 +1,116 @@
+# portfolio_optimizer.py
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+# Constraint that the weights sum to 1, with its constant Jacobian
+_BUDGET_CONSTRAINT = {'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1, 'jac': lambda weights: np.ones_like(weights)}
+
+
+def portfolio_performance(weights, mu, cov):
+    """
+    Expected return and volatility of a portfolio.
+
+    Parameters:
+        weights (np.ndarray): Asset weights.
+        mu (np.ndarray): Expected asset returns.
+        cov (np.ndarray): Covariance matrix of the asset returns.
+
+    Returns:
+        tuple: (portfolio return, portfolio volatility)
+    """
+    return weights @ mu, np.sqrt(weights @ cov @ weights)
+
+
+def negative_sharpe_ratio(weights, mu, cov, risk_free_rate=0.01):
+    """
+    Negative Sharpe ratio -(w.mu - rf) / sqrt(w'Cw) and its analytic gradient.
+
+    With r = w.mu - rf and s = sqrt(w'Cw), the gradient is -mu / s + r * Cw / s^3, so SLSQP
+    needs no finite-difference objective evaluations.
+
+    Returns:
+        tuple: (value, gradient)
+    """
+    cov_weights = cov @ weights
+    volatility = np.sqrt(weights @ cov_weights)
+    excess_return = weights @ mu - risk_free_rate
+    value = -excess_return / volatility
+    gradient = -mu / volatility + excess_return * cov_weights / volatility ** 3
+    return value, gradient
+
+
+def max_sharpe_weights(mu, cov, risk_free_rate=0.01, initial_weights=None, bounds=(0, 1)):
+    """
+    Long-only (by default) weights maximizing the Sharpe ratio, solved with SLSQP and analytic gradients.
+
+    Parameters:
+        mu (np.ndarray): Expected asset returns.
+        cov (np.ndarray): Covariance matrix of the asset returns.
+        risk_free_rate (float): Risk-free rate in the units of mu.
+        initial_weights (np.ndarray, optional): Starting point; equal weights by default.
+        bounds (tuple): (lower, upper) bound of every weight.
+
+    Returns:
+        scipy.optimize.OptimizeResult: Result of the solve; result.x holds the weights.
+    """
+    mu, cov = np.asarray(mu, dtype=np.float64), np.asarray(cov, dtype=np.float64)
+    num_assets = len(mu)
+    if initial_weights is None:
+        initial_weights = np.full(num_assets, 1. / num_assets)
+    return minimize(negative_sharpe_ratio, initial_weights, args=(mu, cov, risk_free_rate), jac=True,
+                    method='SLSQP', bounds=[bounds] * num_assets, constraints=[_BUDGET_CONSTRAINT])
+
+
+def _scaled_variance(weights, cov, scale):
+    # Daily variances (~1e-4) sit below SLSQP's absolute tolerance, so the objective is normalized
+    cov_weights = cov @ weights / scale
+    return weights @ cov_weights, 2 * cov_weights
+
+
+def efficient_frontier(mu, cov, target_returns, bounds=(0, 1), assets=None):
+    """
+    Minimum-variance portfolios for a series of target returns.
+
+    Targets are solved in increasing order and each solve starts from the weights of the
+    previous one, which are already close to optimal, so later solves take few iterations.
+
+    Parameters:
+        mu (np.ndarray): Expected asset returns.
+        cov (np.ndarray): Covariance matrix of the asset returns.
+        target_returns (array-like): Portfolio returns to reach.
+        bounds (tuple): (lower, upper) bound of every weight.
+        assets (list, optional): Asset names used as weight columns.
+
+    Returns:
+        tuple: (pd.DataFrame with 'target_return', 'return', 'volatility', 'success' and 'iterations'
+                per target, pd.DataFrame of weights with one row per target)
+    """
+    mu, cov = np.asarray(mu, dtype=np.float64), np.asarray(cov, dtype=np.float64)
+    num_assets = len(mu)
+    targets = np.sort(np.asarray(target_returns, dtype=np.float64))
+    weights = np.full(num_assets, 1. / num_assets)
+
+    # Bring the objective and the return constraint to order 1
+    variance_scale = np.trace(cov) / num_assets or 1.0
+    return_scale = np.abs(mu).max() or 1.0
+    scaled_mu = mu / return_scale
+
+    rows, all_weights = [], []
+    for target in targets:
+        constraints = [_BUDGET_CONSTRAINT,
+                       {'type': 'eq', 'fun': lambda w, target=target: w @ scaled_mu - target / return_scale,
+                        'jac': lambda w: scaled_mu}]
+        result = minimize(_scaled_variance, weights, args=(cov, variance_scale), jac=True, method='SLSQP',
+                          bounds=[bounds] * num_assets, constraints=constraints)
+        if result.success:
+            # Warm start the next target from this solution
+            weights = result.x
+        portfolio_return, volatility = portfolio_performance(result.x, mu, cov)
+        rows.append({'target_return': target, 'return': portfolio_return, 'volatility': volatility,
+                     'success': result.success, 'iterations': result.nit})
+        all_weights.append(result.x)
+
+    frontier = pd.DataFrame(rows)
+    weights_frame = pd.DataFrame(np.array(all_weights).reshape(len(targets), num_assets), columns=assets)
+    return frontier, weights_frame
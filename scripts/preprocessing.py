@@ -1,5 +1,8 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+from date_utils import parse_local_days
+from calendar_counts import calendar_counts
+from sentiment_categories import SENTIMENT_THRESHOLDS, categorize_column
 
 class Preprocessing:
     def __init__(self, dataframe):
@@ -8,20 +11,19 @@ class Preprocessing:
         """
         self.dataframe = dataframe
 
-    def determine_sentiment_category(self):
+    def determine_sentiment_category(self, thresholds=SENTIMENT_THRESHOLDS):
         """
         Determines sentiment categories based on sentiment scores
         and visualizes the distribution of sentiment categories.
 
         Assumes the DataFrame has a 'sentiment' column with sentiment scores.
+        thresholds (tuple) gives the (lower, upper) bounds of the neutral band.
         """
         if 'sentiment' not in self.dataframe.columns:
             raise ValueError("The dataframe does not contain a 'sentiment' column. Please calculate sentiment scores first.")
 
         # Categorize sentiments
-        self.dataframe['sentiment_category'] = self.dataframe['sentiment'].apply(
-            lambda x: 'positive' if x > 0.1 else 'negative' if x < -0.1 else 'neutral'
-        )
+        categorize_column(self.dataframe, 'sentiment', thresholds=thresholds)
 
         # Calculate sentiment proportions
         sentiment_counts = self.dataframe['sentiment_category'].value_counts(normalize=True)
@@ -60,23 +62,24 @@ class Preprocessing:
         plt.show()
         
     # Count the number of articles per publisher to identify which publishers are most active.
-    def count_articles_per_publisher(self):
+    def count_articles_per_publisher(self, sketch=None):
         """
         Counts the number of articles per publisher and visualizes the most active publishers.
 
         Assumes the DataFrame has a 'publisher' column.
+
+        Parameters:
+            sketch (HeavyHitters, optional): Publisher summary built from a streamed archive (see
+                heavy_hitters.stream_heavy_hitters); its top 30 publishers are shown instead of
+                counting the dataframe.
         """
-        if 'publisher' not in self.dataframe.columns:
+        if sketch is not None:
+            # Upper-bound counts of the archive summary, exact for keys with zero error
+            publisher_counts = sketch.top(30)['count']
+        elif 'publisher' not in self.dataframe.columns:
             raise ValueError("The dataframe does not contain a 'publisher' column. Please provide the correct input.")
-
-        # Count the number of articles per publisher
-        # publisher_counts
-        
-        # publisher_counts = self.dataframe['publisher'].value_counts()
-        # publisher_counts = self.dataframe['publisher'].value_counts().sort_values(ascending=False)
-        publisher_counts = self.dataframe['publisher'].value_counts().sort_values(ascending=False).head(30)
-
-
+        else:
+            publisher_counts = self.dataframe['publisher'].value_counts().sort_values(ascending=False).head(30)
 
         # Print the number of articles per publisher
         print("Number of Articles Per Publisher:")
@@ -98,25 +101,18 @@ class Preprocessing:
         Analyzes the publication dates to identify trends over time,
         such as increased news frequency on particular days or during specific events.
         
-        The method assumes the DataFrame has a 'date' column with datetime objects.
+        All breakdowns come from one counting pass over the timestamps (see calendar_counts);
+        no columns are added to the dataframe and invalid or missing dates are ignored.
+
+        Returns:
+            dict: Article counts per 'daily', 'hour', 'weekday', 'day', 'month', 'year' and 'hour_weekday'.
         """
         if 'date' not in self.dataframe.columns:
             raise ValueError("The dataframe does not contain a 'date' column. Please provide the correct input.")
 
-        # Ensure the 'date' column is in datetime format
-        self.dataframe['date'] = pd.to_datetime(self.dataframe['date'], errors='coerce')
-
-        # Drop rows with invalid or missing dates
-        self.dataframe = self.dataframe.dropna(subset=['date'])
-
-        # Extract additional date components for analysis
-        self.dataframe['year'] = self.dataframe['date'].dt.year
-        self.dataframe['month'] = self.dataframe['date'].dt.month
-        self.dataframe['day'] = self.dataframe['date'].dt.day
-        self.dataframe['day_of_week'] = self.dataframe['date'].dt.day_name()
-
-        # Count the number of articles per day
-        daily_counts = self.dataframe['date'].dt.date.value_counts().sort_index()
+        # Count the articles per date, weekday, month and year in one pass
+        counts = calendar_counts(self.dataframe['date'])
+        daily_counts = counts['daily']
 
         # Plot the trend of articles over time
         plt.figure(figsize=(12, 6))
@@ -127,8 +123,8 @@ class Preprocessing:
         plt.xticks(rotation=45)
         plt.show()
 
-        # Count articles by day of the week
-        weekly_counts = self.dataframe['day_of_week'].value_counts().sort_index()
+        # Articles by day of the week, in calendar order
+        weekly_counts = counts['weekday']
 
         # Plot the frequency of articles by day of the week
         plt.figure(figsize=(10, 6))
@@ -138,8 +134,8 @@ class Preprocessing:
         plt.ylabel("Number of Articles")
         plt.show()
 
-        # Count articles by month
-        monthly_counts = self.dataframe['month'].value_counts().sort_index()
+        # Articles by month
+        monthly_counts = counts['month']
 
         # Plot the frequency of articles by month
         plt.figure(figsize=(10, 6))
@@ -149,8 +145,8 @@ class Preprocessing:
         plt.ylabel("Number of Articles")
         plt.show()
 
-        # Count articles by year
-        yearly_counts = self.dataframe['year'].value_counts().sort_index()
+        # Articles by year
+        yearly_counts = counts['year']
 
         # Plot the frequency of articles by year
         plt.figure(figsize=(10, 6))
@@ -159,7 +155,9 @@ class Preprocessing:
         plt.xlabel("Year")
         plt.ylabel("Number of Articles")
         plt.show()
+        return counts
         
+    @staticmethod
     def process_date_column(df, date_column, date_format=None):
         """
         Processes the date column in a DataFrame.
@@ -176,8 +174,9 @@ class Preprocessing:
         if date_format:
             df[date_column] = pd.to_datetime(df[date_column], format=date_format)
         else:
-            # Handle cases where the date string length might be inconsistent
-            df[date_column] = df[date_column].apply(lambda x: x[:10] if len(x) > 10 else x)
-            df[date_column] = pd.to_datetime(df[date_column])
+            # Keep only the day part, which handles date strings of inconsistent length
+            df[date_column], n_coerced = parse_local_days(df[date_column])
+            if n_coerced:
+                print(f"Warning: {n_coerced} values in '{date_column}' could not be parsed.")
         
         return df
@@ -0,0 +1,253 @@
+# report.py
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from downsample import DEFAULT_MAX_POINTS
+from indicators import compute_indicators
+from parallel import resolve_n_jobs
+
+# Per-ticker Plotly charts of StockPlot
+TICKER_CHARTS = ('StockPrice50DaySMA', 'RSIPlot', 'MACDPlot')
+# File formats each kind of figure can be written to (Plotly images need kaleido)
+MATPLOTLIB_FORMATS = ('png', 'svg', 'pdf')
+PLOTLY_FORMATS = ('html', 'png', 'svg')
+MANIFEST_NAME = 'manifest.json'
+# Non-interactive matplotlib backend the figures are rendered with
+HEADLESS_BACKEND = 'Agg'
+
+
+def use_headless_backend():
+    """
+    Switches matplotlib to the non-interactive Agg backend for the whole process (e.g. a worker),
+    so plt.show() renders nothing on screen.
+    """
+    import matplotlib.pyplot as plt
+    plt.switch_backend(HEADLESS_BACKEND)
+
+
+@contextmanager
+def headless_backend():
+    """
+    Switches matplotlib to the Agg backend for the duration of the block, then restores the
+    previous backend (e.g. a notebook's inline backend).
+    """
+    import matplotlib.pyplot as plt
+
+    previous = matplotlib.get_backend()
+    plt.switch_backend(HEADLESS_BACKEND)
+    try:
+        yield
+    finally:
+        if previous.lower() != HEADLESS_BACKEND.lower():
+            plt.switch_backend(previous)
+
+
+class FigureCapture:
+    def __init__(self):
+        """
+        Context manager collecting the figures a plotting method shows instead of displaying them.
+
+        plt.show() and plotly's Figure.show() are replaced for the duration of the block, so the
+        existing visual methods can be rendered to files unchanged.
+        """
+        self.figures = []
+
+    def __enter__(self):
+        import matplotlib.pyplot as plt
+        import plotly.graph_objects as go
+
+        self._plt, self._go = plt, go
+        self._open = set(plt.get_fignums())
+        self._plt_show, self._plotly_show = plt.show, go.Figure.show
+        plt.show = self._collect_matplotlib
+        go.Figure.show = lambda fig, *args, **kwargs: self.figures.append(fig)
+        return self
+
+    def _collect_matplotlib(self, *args, **kwargs):
+        for number in self._plt.get_fignums():
+            if number not in self._open:
+                self._open.add(number)
+                self.figures.append(self._plt.figure(number))
+
+    def __exit__(self, *exc_info):
+        # Figures drawn but never shown are collected too
+        self._collect_matplotlib()
+        self._plt.show, self._go.Figure.show = self._plt_show, self._plotly_show
+        return False
+
+
+def save_figure(fig, base_path, formats=('png', 'html')):
+    """
+    Writes a matplotlib or Plotly figure to every requested format it supports.
+
+    Formats a figure cannot be written to are skipped; when none apply, matplotlib figures are
+    written as PNG and Plotly figures as HTML. Plotly HTML files share one plotly.min.js per folder.
+
+    Returns:
+        list of str: Written file paths.
+    """
+    is_plotly = hasattr(fig, 'to_plotly_json')
+    supported = PLOTLY_FORMATS if is_plotly else MATPLOTLIB_FORMATS
+    if is_plotly and importlib.util.find_spec('kaleido') is None:
+        supported = ('html',)
+    selected = [fmt for fmt in formats if fmt in supported] or ['html' if is_plotly else 'png']
+
+    paths = []
+    for fmt in selected:
+        path = f"{base_path}.{fmt}"
+        if not is_plotly:
+            fig.savefig(path, bbox_inches='tight')
+        elif fmt == 'html':
+            fig.write_html(path, include_plotlyjs='directory', full_html=True)
+        else:
+            fig.write_image(path)
+        paths.append(path)
+    if not is_plotly:
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+    return paths
+
+
+def _write_plotly_bundle(output_dir):
+    # HTML written with include_plotlyjs='directory' reference this file; writing it once up front
+    # keeps parallel workers from writing it concurrently
+    path = os.path.join(output_dir, 'plotly.min.js')
+    if not os.path.isfile(path):
+        from plotly.offline import get_plotlyjs
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+
+
+def _manifest_entries(paths, seconds, **fields):
+    return [{**fields, 'format': os.path.splitext(path)[1][1:], 'path': path, 'bytes': os.path.getsize(path),
+             'seconds': seconds} for path in paths]
+
+
+def _render_ticker(args):
+    stock, frame, output_dir, charts, formats, max_points = args
+    from plot import StockPlot
+
+    plot = StockPlot(frame, max_points=max_points)
+    entries = []
+    for chart in charts:
+        start = time.perf_counter()
+        fig = getattr(plot, chart)(show=False)
+        paths = save_figure(fig, os.path.join(output_dir, f"{stock}_{chart}"), formats)
+        entries.extend(_manifest_entries(paths, time.perf_counter() - start, stock=stock, chart=chart))
+    return entries
+
+
+class ReportBuilder:
+    def __init__(self, output_dir, formats=('png', 'html'), n_jobs=None):
+        """
+        Renders the figures of the analysis classes to files without displaying them and keeps a manifest.
+
+        The process's matplotlib backend is only switched to Agg while a method is rendered, so
+        a notebook keeps plotting inline around the builder.
+
+        Parameters:
+            output_dir (str): Folder receiving the figures and the manifest.
+            formats (tuple): Requested formats among 'png', 'svg', 'pdf' (matplotlib) and 'html',
+                'png', 'svg' (Plotly; images need kaleido).
+            n_jobs (int): Number of worker processes for per-ticker charts; None or -1 uses all cores.
+        """
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.entries = []
+        # Call time of every add_method capture by name, figure files hold their own save time
+        self.method_seconds = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    def add_method(self, obj, method_name, name=None, **kwargs):
+        """
+        Calls a visual method (e.g. EDA.plot_sentiment_distribution) and saves every figure it shows.
+
+        The manifest rows of each figure hold the time taken to save that figure; the time of the
+        call itself is kept once in method_seconds.
+
+        Returns:
+            The method's return value.
+        """
+        name = name or f"{type(obj).__name__}_{method_name}"
+        with headless_backend():
+            start = time.perf_counter()
+            with FigureCapture() as capture:
+                result = getattr(obj, method_name)(**kwargs)
+            self.method_seconds[name] = time.perf_counter() - start
+            for i, fig in enumerate(capture.figures):
+                suffix = f"_{i + 1}" if len(capture.figures) > 1 else ''
+                start = time.perf_counter()
+                paths = save_figure(fig, os.path.join(self.output_dir, name + suffix), self.formats)
+                self.entries.extend(_manifest_entries(paths, time.perf_counter() - start, stock=None,
+                                                      chart=name + suffix))
+        return result
+
+    def add_ticker_charts(self, prices, price_column='Close', date_column='date', stock_column='stock',
+                          charts=TICKER_CHARTS, max_points=DEFAULT_MAX_POINTS):
+        """
+        Renders the StockPlot indicator charts of every ticker, fanned out across worker processes.
+
+        Indicators are computed once for all tickers in one vectorized pass, then each worker
+        receives the finished frame of its ticker.
+
+        Parameters:
+            prices (pd.DataFrame): Long price frame with date, stock and price columns.
+            charts (tuple): StockPlot chart methods to render per ticker.
+            max_points (int, optional): Point budget per trace, see StockPlot.
+        """
+        prices = prices.sort_values([stock_column, date_column], kind='stable')
+        indicators = compute_indicators(prices, price_column, stock_column)
+        frame = pd.DataFrame({
+            'Close': prices[price_column].to_numpy(),
+            'SMA_50': indicators['SMA'].to_numpy(),
+            'RSI_14': indicators['RSI'].to_numpy(),
+            'MACD_Line': indicators['MACD_Line'].to_numpy(),
+            'Signal_Line': indicators['Signal_Line'].to_numpy(),
+        }, index=pd.DatetimeIndex(prices[date_column], name='Date'))
+        # Rows are sorted by stock, so every ticker is one contiguous slice
+        stocks = prices[stock_column].to_numpy()
+        starts = np.flatnonzero(np.r_[True, stocks[1:] != stocks[:-1]])
+        bounds = np.r_[starts, len(stocks)]
+
+        if 'html' in self.formats:
+            _write_plotly_bundle(self.output_dir)
+        tasks = [(stocks[start], frame.iloc[start:end], self.output_dir, tuple(charts), self.formats, max_points)
+                 for start, end in zip(bounds[:-1], bounds[1:])]
+        if self.n_jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=use_headless_backend) as executor:
+                results = list(executor.map(_render_ticker, tasks, chunksize=max(len(tasks) // (4 * self.n_jobs), 1)))
+        else:
+            results = [_render_ticker(task) for task in tasks]
+        for entries in results:
+            self.entries.extend(entries)
+        print(f"Rendered {len(tasks)} tickers x {len(charts)} charts to {self.output_dir}")
+
+    def manifest(self):
+        """
+        Returns:
+            pd.DataFrame: One row per written file with 'stock', 'chart', 'format', 'path', 'bytes' and 'seconds'.
+        """
+        return pd.DataFrame(self.entries, columns=['stock', 'chart', 'format', 'path', 'bytes', 'seconds'])
+
+    def write_manifest(self):
+        """
+        Writes the manifest of all outputs as JSON next to the figures.
+
+        Returns:
+            str: Path of the manifest.
+        """
+        path = os.path.join(self.output_dir, MANIFEST_NAME)
+        with open(path, 'w') as f:
+            json.dump({'backend': HEADLESS_BACKEND, 'formats': list(self.formats),
+                       'method_seconds': self.method_seconds, 'files': self.entries}, f, indent=2)
+        print(f"Manifest with {len(self.entries)} files written to {path}")
+        return path
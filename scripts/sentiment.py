@@ -1,51 +1,163 @@
+from functools import partial
+import numpy as np
 import pandas as pd
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
+from sentiment_engine import VaderBatchScorer, POLARITY_KEYS, DEFAULT_CHUNKSIZE, parallel_score, nltk_scorer, vader_analyzer
+from sentiment_cache import SentimentCache, lexicon_version
+from alignment import StockDateIndex, days_to_dates, session_days, to_local_times
+from date_utils import parse_local_days
+from news_stream import aggregate_daily_sentiment, finalize_daily_sentiment
+from sentiment_categories import SENTIMENT_THRESHOLDS, SENTIMENT_VALUES, categorize_sentiment, sentiment_codes
+
+# Columns of the daily aggregates that count articles, 0 for bars without news
+COUNT_COLUMNS = ['article_count', 'positive_count', 'neutral_count', 'negative_count']
+
+
+def _bar_dates(values, timezone=None):
+    # Day of each price bar as naive datetime64[ns], NaT where unparseable
+    if timezone is None:
+        dates, _ = parse_local_days(values)
+        return dates
+    return to_local_times(values, timezone).dt.normalize()
 
-# Download the VADER lexicon
-nltk.download('vader_lexicon')
 
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_path=None, lexicon_path=None):
+        """
+        Initializes the analyzer.
+        
+        Parameters:
+            cache_path (str, optional): SQLite file used to persist scores across runs, keyed by
+                a hash of the normalized text and the lexicon version.
+            lexicon_path (str, optional): Local VADER lexicon file; by default the lexicon is looked up
+                locally (see resolve_vader_lexicon) and only downloaded when missing.
+        """
         # Initialize the VADER Sentiment Analyzer
-        self.sia = SentimentIntensityAnalyzer()
+        self.lexicon_path = lexicon_path
+        self.sia = vader_analyzer(lexicon_path)
+        self.scorer = VaderBatchScorer(self.sia)
+        self.cache = SentimentCache(cache_path, lexicon_version(self.sia.lexicon)) if cache_path else None
+
+    def score_batch(self, texts, n_jobs=1, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Calculates VADER polarity scores for a batch of texts in one pass.
+        
+        Only distinct texts are scored, and texts already in the cache are not rescored.
+        
+        Parameters:
+            texts (iterable of str): Texts to score.
+            n_jobs (int): Number of worker processes; 1 scores in the current process, None or -1 uses all cores.
+            chunksize (int): Number of texts sent to a worker per task.
+            
+        Returns:
+            np.ndarray: Array of shape (len(texts), 4) with 'neg', 'neu', 'pos' and 'compound' columns,
+            bit-identical to calling polarity_scores on each text.
+        """
+        # Score each distinct text once and broadcast back through the factorize codes
+        codes, uniques = pd.factorize(np.asarray(list(texts), dtype=object), use_na_sentinel=False)
+        uniques = list(uniques)
+
+        if self.cache is None:
+            unique_scores = self._score_unique(uniques, n_jobs, chunksize)
+        else:
+            unique_scores, found = self.cache.get_many(uniques)
+            missing = [text for text, hit in zip(uniques, found) if not hit]
+            if missing:
+                missing_scores = self._score_unique(missing, n_jobs, chunksize)
+                unique_scores[~found] = missing_scores
+                self.cache.put_many(missing, missing_scores)
 
-    def calculate_sentiment(self, df, text_column):
+        return unique_scores[codes]
+
+    def _score_unique(self, texts, n_jobs, chunksize):
+        return parallel_score(texts, partial(nltk_scorer, self.lexicon_path), n_jobs=n_jobs, chunksize=chunksize,
+                              score=self.scorer.score_batch)
+
+    def cache_stats(self):
+        """
+        Returns the hit/miss counters of the score cache.
+        
+        Returns:
+            dict: 'hits', 'misses' and 'hit_rate' of distinct texts looked up in the cache.
+        """
+        if self.cache is None:
+            raise ValueError("No cache configured. Pass cache_path when creating the SentimentAnalyzer.")
+        return self.cache.stats()
+
+    def calculate_sentiment(self, df, text_column, polarity_columns=False, n_jobs=1, chunksize=DEFAULT_CHUNKSIZE,
+                            thresholds=SENTIMENT_THRESHOLDS):
         """
         Calculates sentiment scores for the given text column in a DataFrame.
         
         Parameters:
             df (pd.DataFrame): DataFrame containing the text data.
             text_column (str): Name of the column containing text for sentiment analysis.
+            polarity_columns (bool): Also add 'sentiment_neg', 'sentiment_neu' and 'sentiment_pos' columns.
+            n_jobs (int): Number of worker processes used for scoring (see score_batch).
+            chunksize (int): Number of texts sent to a worker per task.
+            thresholds (tuple): (lower, upper) bounds of the neutral sentiment band.
             
         Returns:
             pd.DataFrame: DataFrame with additional columns 'sentiment_score' and 'sentiment_category'.
         """
-        # Apply sentiment analysis to calculate scores
-        df['sentiment_score'] = df[text_column].apply(lambda x: self.sia.polarity_scores(x)['compound'])
+        # Score all texts in one batch
+        scores = self.score_batch(df[text_column].tolist(), n_jobs=n_jobs, chunksize=chunksize)
+        df['sentiment_score'] = scores[:, POLARITY_KEYS.index('compound')]
+        if polarity_columns:
+            for key in ('neg', 'neu', 'pos'):
+                df[f'sentiment_{key}'] = scores[:, POLARITY_KEYS.index(key)]
         
         # Determine sentiment category based on sentiment score
-        df['sentiment_category'] = df['sentiment_score'].apply(self.get_sentiment_category)
+        df['sentiment_category'] = self.categorize_scores(df['sentiment_score'].to_numpy(), thresholds)
         
         # Convert sentiment category to numeric values
-        df['sentiment'] = df['sentiment_category'].apply(self.get_sentiment_numeric)
+        df['sentiment'] = self.numeric_scores(df['sentiment_score'].to_numpy(), thresholds)
         
         return df
 
     @staticmethod
-    def get_sentiment_category(score):
+    def categorize_scores(scores, thresholds=SENTIMENT_THRESHOLDS):
+        """
+        Vectorized version of get_sentiment_category for an array of sentiment scores.
+        
+        Parameters:
+            scores (np.ndarray): Sentiment scores from VADER.
+            thresholds (tuple): (lower, upper) bounds of the neutral band.
+            
+        Returns:
+            pd.Categorical: Sentiment categories ('negative', 'neutral', 'positive') with int8 codes.
+        """
+        return categorize_sentiment(scores, thresholds)
+
+    @staticmethod
+    def numeric_scores(scores, thresholds=SENTIMENT_THRESHOLDS):
+        """
+        Vectorized equivalent of get_sentiment_numeric(get_sentiment_category(score)).
+        
+        Parameters:
+            scores (np.ndarray): Sentiment scores from VADER.
+            thresholds (tuple): (lower, upper) bounds of the neutral band.
+            
+        Returns:
+            np.ndarray: Numeric sentiment values (-1, 0, 1).
+        """
+        return sentiment_codes(scores, thresholds).astype(np.int64)
+
+    @staticmethod
+    def get_sentiment_category(score, thresholds=SENTIMENT_THRESHOLDS):
         """
         Classifies sentiment into categories based on the sentiment score.
         
         Parameters:
             score (float): Sentiment score from VADER.
+            thresholds (tuple): (lower, upper) bounds of the neutral band.
             
         Returns:
             str: Sentiment category ('positive', 'negative', 'neutral').
         """
-        if score > 0.1:
+        lower, upper = thresholds
+        if score > upper:
             return 'positive'
-        elif score < -0.1:
+        elif score < lower:
             return 'negative'
         else:
             return 'neutral'
@@ -61,21 +173,42 @@ class SentimentAnalyzer:
         Returns:
             int: Numeric sentiment value (-1, 0, 1).
         """
-        sentiment_mapping = {'negative': -1, 'neutral': 0, 'positive': 1}
-        return sentiment_mapping.get(category, 0)
+        return SENTIMENT_VALUES.get(category, 0)
 
     @staticmethod
-    def merge_sentiment_stock_price(stock_data, sentiment_data):
+    def merge_sentiment_stock_price(stock_data, sentiment_data, aggregate=False, session_close=None,
+                                    timezone=None, next_session=False):
         """
         Merges stock price data with sentiment data based on date and stock.
         
+        By default every headline is joined to its bar, so a bar appears once per article. With
+        aggregate=True the headlines are first reduced to one row per (date, stock) and joined
+        one row per bar, so the result has exactly the rows of stock_data.
+        
         Parameters:
             stock_data (pd.DataFrame): DataFrame containing stock price data.
             sentiment_data (pd.DataFrame): DataFrame containing sentiment data.
+            aggregate (bool): Join per-(date, stock) aggregates instead of individual headlines.
+            session_close (str, optional): With aggregate, local closing time such as '16:00';
+                headlines at or after it count towards the next day.
+            timezone (str, optional): With aggregate, time zone tz-aware dates are converted to
+                before bucketing (e.g. 'America/New_York').
+            next_session (bool): With aggregate, move headlines of days without a bar (weekends,
+                holidays) to the next bar of their stock.
             
         Returns:
             pd.DataFrame: Merged DataFrame containing aligned stock price and sentiment data.
         """
+        if aggregate:
+            daily = SentimentAnalyzer.daily_sentiment(stock_data, sentiment_data, session_close, timezone, next_session)
+            # Join on the bar's day so string or timestamped price dates match the datetime64 days of
+            # the aggregates, while stock_data keeps its own 'date' column
+            merged_data = stock_data.assign(_bar_date=_bar_dates(stock_data['date'], timezone)).merge(
+                daily.rename(columns={'date': '_bar_date'}), on=['_bar_date', 'stock'], how='left'
+            ).drop(columns='_bar_date')
+            merged_data[COUNT_COLUMNS] = merged_data[COUNT_COLUMNS].fillna(0).astype(np.int64)
+            return merged_data
+
         # Select relevant columns from the sentiment data
         sentiment_columns = ['headline', 'publisher', 'date', 'stock', 'sentiment_score', 'sentiment_category', 'sentiment']
         
@@ -89,3 +222,37 @@ class SentimentAnalyzer:
         
         return merged_data
 
+    @staticmethod
+    def daily_sentiment(stock_data, sentiment_data, session_close=None, timezone=None, next_session=False):
+        """
+        Reduces scored headlines to one row per trading session and stock.
+        
+        Parameters:
+            stock_data (pd.DataFrame): Stock price data, used for its dtypes and, with next_session, its bars.
+            sentiment_data (pd.DataFrame): Headlines with 'date', 'stock', 'sentiment_score' and 'sentiment'.
+            session_close, timezone, next_session: Session bucketing, see merge_sentiment_stock_price.
+            
+        Returns:
+            pd.DataFrame: One row per (date, stock) with article count, sum, mean, min and max
+            sentiment score and the number of positive, neutral and negative articles.
+        """
+        if session_close is None and timezone is None and not next_session:
+            dates, _ = parse_local_days(sentiment_data['date'])
+        else:
+            days = session_days(to_local_times(sentiment_data['date'], timezone), session_close)
+            if next_session:
+                index = StockDateIndex(stock_data, timezone=timezone)
+                bars = index.lookup(sentiment_data['stock'].to_numpy(), days, how='asof')
+                days = np.where(bars >= 0, index.bar_days[bars], -1)
+            dates = pd.Series(days_to_dates(days), index=sentiment_data.index).where(days >= 0)
+
+        # Group on categorical stock keys so the groupby works on integer codes
+        news = pd.DataFrame({
+            'date': dates,
+            'stock': sentiment_data['stock'].astype('category'),
+            'sentiment_score': sentiment_data['sentiment_score'],
+            'sentiment': sentiment_data['sentiment'],
+        }).dropna(subset=['date'])
+        daily = finalize_daily_sentiment(aggregate_daily_sentiment(news))
+        daily['stock'] = daily['stock'].astype(stock_data['stock'].dtype)
+        return daily
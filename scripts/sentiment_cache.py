@@ -0,0 +1,129 @@
+# sentiment_cache.py
+import hashlib
+import sqlite3
+
+import numpy as np
+
+# SQLite's default limit on the number of '?' parameters in one statement
+_SQLITE_MAX_PARAMS = 900
+
+
+def lexicon_version(lexicon, scorer_name='nltk-vader'):
+    """
+    Builds a short fingerprint of a sentiment lexicon, so cached scores are invalidated when it changes.
+
+    Parameters:
+        lexicon (dict): Mapping of words to valences.
+        scorer_name (str): Name of the scoring implementation.
+
+    Returns:
+        str: Hex digest identifying the lexicon contents.
+    """
+    digest = hashlib.blake2b(scorer_name.encode('utf-8'), digest_size=8)
+    for word, valence in sorted(lexicon.items()):
+        digest.update(f"{word}\t{valence!r}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def normalize_text(text):
+    """
+    Collapses whitespace in a text. VADER splits on whitespace, so this never changes a score.
+    """
+    return ' '.join(text.split())
+
+
+class SentimentCache:
+    def __init__(self, path, version):
+        """
+        Initializes an on-disk SQLite cache of polarity scores.
+
+        Parameters:
+            path (str): Path of the SQLite database file (created if missing).
+            version (str): Lexicon version (see lexicon_version) included in every key.
+        """
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS scores "
+            "(key BLOB PRIMARY KEY, neg REAL, neu REAL, pos REAL, compound REAL) WITHOUT ROWID"
+        )
+
+    def key(self, text):
+        """
+        Returns the content hash of a text for the current lexicon version.
+        """
+        digest = hashlib.blake2b(self.version.encode('utf-8'), digest_size=16)
+        digest.update(normalize_text(text).encode('utf-8'))
+        return digest.digest()
+
+    def get_many(self, texts):
+        """
+        Looks up cached scores for a list of texts and updates the hit/miss counters.
+
+        Parameters:
+            texts (list of str): Texts to look up.
+
+        Returns:
+            tuple: (np.ndarray of shape (len(texts), 4) with the cached scores,
+                    boolean np.ndarray marking which texts were found)
+        """
+        keys = [self.key(text) for text in texts]
+        found = {}
+        for start in range(0, len(keys), _SQLITE_MAX_PARAMS):
+            batch = keys[start:start + _SQLITE_MAX_PARAMS]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.connection.execute(
+                f"SELECT key, neg, neu, pos, compound FROM scores WHERE key IN ({placeholders})", batch
+            )
+            for key, *values in rows:
+                found[key] = values
+
+        scores = np.zeros((len(keys), 4))
+        mask = np.zeros(len(keys), dtype=bool)
+        for i, key in enumerate(keys):
+            values = found.get(key)
+            if values is not None:
+                scores[i] = values
+                mask[i] = True
+
+        self.hits += int(mask.sum())
+        self.misses += int((~mask).sum())
+        return scores, mask
+
+    def put_many(self, texts, scores):
+        """
+        Stores the scores of a list of texts.
+
+        Parameters:
+            texts (list of str): Scored texts.
+            scores (np.ndarray): Array of shape (len(texts), 4) with their scores.
+        """
+        rows = [(self.key(text), *values) for text, values in zip(texts, scores.tolist())]
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)", rows)
+
+    def stats(self):
+        """
+        Returns the hit/miss counters of the cache.
+
+        Returns:
+            dict: 'hits', 'misses' and 'hit_rate' since the cache was opened or reset.
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def reset_stats(self):
+        """
+        Resets the hit/miss counters.
+        """
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
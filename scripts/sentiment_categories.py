@@ -0,0 +1,54 @@
+# sentiment_categories.py
+import numpy as np
+import pandas as pd
+
+# Scores above the upper threshold are positive, below the lower threshold negative
+SENTIMENT_THRESHOLDS = (-0.1, 0.1)
+
+# Category labels in code order, so the category code minus 1 is the numeric sentiment
+SENTIMENT_LABELS = ('negative', 'neutral', 'positive')
+SENTIMENT_VALUES = {'negative': -1, 'neutral': 0, 'positive': 1}
+
+
+def sentiment_codes(scores, thresholds=SENTIMENT_THRESHOLDS):
+    """
+    Numeric sentiment of each score: -1 (negative), 0 (neutral) or 1 (positive).
+
+    Parameters:
+        scores (array-like): Sentiment scores, e.g. VADER compound scores; NaN counts as neutral.
+        thresholds (tuple): (lower, upper) bounds of the neutral band.
+
+    Returns:
+        np.ndarray: int8 values.
+    """
+    lower, upper = thresholds
+    scores = np.asarray(scores, dtype=np.float64)
+    return (scores > upper).astype(np.int8) - (scores < lower).astype(np.int8)
+
+
+def categorize_sentiment(scores, thresholds=SENTIMENT_THRESHOLDS):
+    """
+    Sentiment category of each score as a Categorical ('negative', 'neutral', 'positive') with int8 codes.
+
+    Parameters:
+        scores (array-like): Sentiment scores; NaN counts as neutral.
+        thresholds (tuple): (lower, upper) bounds of the neutral band.
+
+    Returns:
+        pd.Categorical: Categories of the scores, in their order.
+    """
+    return pd.Categorical.from_codes(sentiment_codes(scores, thresholds) + 1, categories=list(SENTIMENT_LABELS))
+
+
+def categorize_column(df, score_column='sentiment', category_column='sentiment_category',
+                      thresholds=SENTIMENT_THRESHOLDS):
+    """
+    Adds the sentiment category of a score column to a DataFrame.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame holding the scores.
+        score_column (str): Column with the sentiment scores.
+        category_column (str): Column the categories are written to.
+        thresholds (tuple): (lower, upper) bounds of the neutral band.
+    """
+    df[category_column] = pd.Series(categorize_sentiment(df[score_column].to_numpy(), thresholds), index=df.index)
@@ -0,0 +1,303 @@
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from parallel import resolve_n_jobs
+
+# Column order of the arrays returned by VaderBatchScorer.score_batch
+POLARITY_KEYS = ('neg', 'neu', 'pos', 'compound')
+
+# Number of texts sent to a worker process per task
+DEFAULT_CHUNKSIZE = 10000
+
+# Scoring function built once in each worker process by _init_worker
+_worker_score = None
+
+# nltk resource name of the VADER lexicon, the default lexicon_file of SentimentIntensityAnalyzer
+VADER_LEXICON_RESOURCE = 'sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt'
+# Environment variables: a local lexicon file, and a switch that forbids downloading it
+LEXICON_PATH_ENV = 'VADER_LEXICON_PATH'
+OFFLINE_ENV = 'NLTK_OFFLINE'
+
+# Lexicon locations already resolved in this process, by (path, download)
+_resolved_lexicons = {}
+
+
+class _TokenizedText:
+    """
+    Minimal stand-in for nltk's SentiText, holding an already tokenized text.
+    """
+    def __init__(self, words_and_emoticons, is_cap_diff):
+        self.words_and_emoticons = words_and_emoticons
+        self.is_cap_diff = is_cap_diff
+
+
+class VaderBatchScorer:
+    def __init__(self, sia):
+        """
+        Initializes the batch scorer around an existing VADER SentimentIntensityAnalyzer.
+
+        Parameters:
+            sia (SentimentIntensityAnalyzer): Analyzer whose lexicon and rules are reused.
+        """
+        from nltk.sentiment.vader import SentiText
+
+        self.sia = sia
+        self._allcap_differential = SentiText.allcap_differential
+        self.lexicon = sia.lexicon
+        self.constants = sia.constants
+        self.boosters = self.constants.BOOSTER_DICT
+        self.punc_set = frozenset(self.constants.PUNC_LIST)
+
+    def tokenize(self, text):
+        """
+        Splits a text into VADER tokens, stripping leading/trailing punctuation from words.
+
+        Produces the same tokens as SentiText without building its punctuation/word product dictionary.
+
+        Parameters:
+            text (str): Text to tokenize.
+
+        Returns:
+            list: Tokens (words and emoticons) in their original order.
+        """
+        words = [we for we in text.split() if len(we) > 1]
+        words_only = None
+        for i, we in enumerate(words):
+            # Only tokens starting or ending with punctuation can be remapped
+            if we[0] not in string.punctuation and we[-1] not in string.punctuation:
+                continue
+            if words_only is None:
+                no_punc_text = self.constants.REGEX_REMOVE_PUNCTUATION.sub('', text)
+                words_only = {w for w in no_punc_text.split() if len(w) > 1}
+
+            stripped = we.rstrip(string.punctuation)
+            if we[len(stripped):] in self.punc_set and stripped in words_only:
+                words[i] = stripped
+                continue
+            stripped = we.lstrip(string.punctuation)
+            if we[:len(we) - len(stripped)] in self.punc_set and stripped in words_only:
+                words[i] = stripped
+        return words
+
+    def valences(self, words):
+        """
+        Computes the per-token valences of a tokenized text, applying the VADER rules.
+
+        Parameters:
+            words (list): Tokens returned by tokenize().
+
+        Returns:
+            list: One valence per token, after the 'but' adjustment.
+        """
+        sentitext = _TokenizedText(words, self._allcap_differential(None, words))
+        # polarity_scores locates each token with list.index(), i.e. its first occurrence
+        first_index = {}
+        for i, word in enumerate(words):
+            first_index.setdefault(word, i)
+
+        sentiments = []
+        for item in words:
+            i = first_index[item]
+            item_lowercase = item.lower()
+            if (
+                i < len(words) - 1
+                and item_lowercase == 'kind'
+                and words[i + 1].lower() == 'of'
+            ) or item_lowercase in self.boosters:
+                sentiments.append(0)
+                continue
+            sentiments = self.sia.sentiment_valence(0, sentitext, item, i, sentiments)
+
+        return self.sia._but_check(words, sentiments)
+
+    def score_batch(self, texts):
+        """
+        Calculates VADER polarity scores for a batch of texts.
+
+        Texts without any lexicon word are resolved without running the VADER rules,
+        and the final normalization is done on whole arrays. Results are bit-identical
+        to SentimentIntensityAnalyzer.polarity_scores.
+
+        Parameters:
+            texts (iterable of str): Texts to score.
+
+        Returns:
+            np.ndarray: Array of shape (len(texts), 4) with the columns of POLARITY_KEYS.
+        """
+        texts = list(texts)
+        n = len(texts)
+        n_tokens = np.zeros(n, dtype=np.int64)
+        sum_s = np.zeros(n)
+        pos_sum = np.zeros(n)
+        neg_sum = np.zeros(n)
+        neu_count = np.zeros(n, dtype=np.int64)
+        ep_count = np.zeros(n, dtype=np.int64)
+        qm_count = np.zeros(n, dtype=np.int64)
+
+        for k, text in enumerate(texts):
+            if not isinstance(text, str):
+                text = str(text.encode('utf-8'))
+            words = self.tokenize(text)
+            n_tokens[k] = len(words)
+            ep_count[k] = text.count('!')
+            qm_count[k] = text.count('?')
+
+            if not any(word.lower() in self.lexicon for word in words):
+                # Every token has a zero valence
+                neu_count[k] = len(words)
+                continue
+
+            sentiments = self.valences(words)
+            sum_s[k] = float(sum(sentiments))
+            pos_sum[k], neg_sum[k], neu_count[k] = self.sia._sift_sentiment_scores(sentiments)
+
+        # Emphasis from exclamation points (up to 4) and question marks (2 or 3+)
+        ep_amplifier = np.minimum(ep_count, 4) * 0.292
+        qm_amplifier = np.select([qm_count > 3, qm_count > 1], [0.96, qm_count * 0.18], 0.0)
+        amplifier = ep_amplifier + qm_amplifier
+
+        sum_s = np.where(sum_s > 0, sum_s + amplifier, np.where(sum_s < 0, sum_s - amplifier, sum_s))
+        compound = sum_s / np.sqrt((sum_s * sum_s) + 15)
+
+        abs_neg_sum = np.abs(neg_sum)
+        pos_sum, neg_sum = (
+            np.where(pos_sum > abs_neg_sum, pos_sum + amplifier, pos_sum),
+            np.where(pos_sum < abs_neg_sum, neg_sum - amplifier, neg_sum),
+        )
+
+        has_tokens = n_tokens > 0
+        total = np.where(has_tokens, pos_sum + np.abs(neg_sum) + neu_count, 1.0)
+        scores = np.column_stack([
+            np.abs(neg_sum / total),
+            np.abs(neu_count / total),
+            np.abs(pos_sum / total),
+            compound,
+        ])
+        scores[~has_tokens] = 0.0
+
+        # Python's round() is correctly rounded, unlike np.round, so use it to stay bit-identical
+        for column, digits in zip(range(4), (3, 3, 3, 4)):
+            scores[:, column] = [round(value, digits) for value in scores[:, column].tolist()]
+        return scores
+
+
+def resolve_vader_lexicon(path=None, download=None):
+    """
+    Locates the VADER lexicon without touching the network when a local copy exists.
+
+    Looked up in order: the given path, the VADER_LEXICON_PATH environment variable, the nltk
+    data directories (NLTK_DATA, ~/nltk_data, ...), and only then nltk.download. The result is
+    remembered for the rest of the process.
+
+    Parameters:
+        path (str, optional): Local vader_lexicon.txt file.
+        download (bool, optional): Allow downloading a missing lexicon; by default allowed unless
+            the NLTK_OFFLINE environment variable is set (air-gapped workers).
+
+    Returns:
+        str: Lexicon location accepted by SentimentIntensityAnalyzer(lexicon_file=...).
+    """
+    if download is None:
+        download = not os.environ.get(OFFLINE_ENV)
+    key = (path, download)
+    if key in _resolved_lexicons:
+        return _resolved_lexicons[key]
+
+    path = path or os.environ.get(LEXICON_PATH_ENV)
+    if path:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"VADER lexicon not found at {path}")
+        location = 'file:' + os.path.abspath(path)
+    else:
+        import nltk
+        try:
+            nltk.data.find(VADER_LEXICON_RESOURCE)
+        except LookupError:
+            if not download:
+                raise LookupError(f"VADER lexicon not found in {nltk.data.path}; set {LEXICON_PATH_ENV} "
+                                  f"or install the 'vader_lexicon' nltk package.")
+            nltk.download('vader_lexicon', quiet=True, raise_on_error=True)
+            nltk.data.find(VADER_LEXICON_RESOURCE)
+        location = VADER_LEXICON_RESOURCE
+    _resolved_lexicons[key] = location
+    return location
+
+
+def vader_analyzer(lexicon_path=None):
+    """
+    Builds nltk's VADER SentimentIntensityAnalyzer on a lexicon found by resolve_vader_lexicon.
+    """
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer(lexicon_file=resolve_vader_lexicon(lexicon_path))
+
+
+def nltk_scorer(lexicon_path=None):
+    """
+    Builds a batch scoring function backed by nltk's VADER analyzer.
+
+    Parameters:
+        lexicon_path (str, optional): Local VADER lexicon file, see resolve_vader_lexicon.
+
+    Returns:
+        callable: Function mapping a list of texts to an array of POLARITY_KEYS scores.
+    """
+    return VaderBatchScorer(vader_analyzer(lexicon_path)).score_batch
+
+
+def vader_scorer():
+    """
+    Builds a scoring function backed by the vaderSentiment package's analyzer.
+
+    Returns:
+        callable: Function mapping a list of texts to an array of POLARITY_KEYS scores.
+    """
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    analyzer = SentimentIntensityAnalyzer()
+
+    def score(texts):
+        rows = [analyzer.polarity_scores(text) for text in texts]
+        return np.array([[row[key] for key in POLARITY_KEYS] for row in rows], dtype=float).reshape(-1, 4)
+    return score
+
+
+def _init_worker(scorer_factory):
+    global _worker_score
+    _worker_score = scorer_factory()
+
+
+def _score_shard(texts):
+    return _worker_score(texts)
+
+
+def parallel_score(texts, scorer_factory=nltk_scorer, n_jobs=1, chunksize=DEFAULT_CHUNKSIZE, score=None):
+    """
+    Scores texts in shards across a pool of worker processes.
+
+    Each worker builds its analyzer once through scorer_factory, so only the text shards
+    are sent between processes. Results are reassembled in the original order.
+
+    Parameters:
+        texts (iterable of str): Texts to score.
+        scorer_factory (callable): Picklable function returning a scoring function (see nltk_scorer).
+        n_jobs (int): Number of worker processes; 1 scores in the current process, None or -1 uses all cores.
+        chunksize (int): Number of texts per shard.
+        score (callable, optional): Already built scoring function to use when running in-process.
+
+    Returns:
+        np.ndarray: Array of shape (len(texts), 4) with the columns of POLARITY_KEYS.
+    """
+    texts = list(texts)
+    n_jobs = resolve_n_jobs(n_jobs)
+    if n_jobs == 1 or len(texts) <= chunksize:
+        if score is None:
+            score = scorer_factory()
+        return score(texts)
+
+    shards = [texts[start:start + chunksize] for start in range(0, len(texts), chunksize)]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(shards)), initializer=_init_worker,
+                             initargs=(scorer_factory,)) as executor:
+        results = list(executor.map(_score_shard, shards))
+    return np.vstack(results)
@@ -0,0 +1,166 @@
+# significance.py
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from parallel import resolve_n_jobs
+
+# Largest number of resampled values held in memory at once per ticker (float64)
+MAX_CHUNK_ELEMENTS = 5000000
+
+
+def stock_series(df, columns, date_column='date', stock_column='stock'):
+    """
+    Splits a long frame into per-stock arrays in chronological order.
+
+    Returns:
+        list of tuple: (stock, {column: np.ndarray}) for every stock, in sorted stock order.
+    """
+    ordered = df.sort_values([stock_column, date_column], kind='stable')
+    codes, stocks = pd.factorize(ordered[stock_column], sort=True)
+    bounds = np.searchsorted(codes, np.arange(len(stocks) + 1))
+    arrays = {column: ordered[column].to_numpy(dtype=np.float64) for column in columns}
+    return [(stock, {column: values[bounds[i]:bounds[i + 1]] for column, values in arrays.items()})
+            for i, stock in enumerate(stocks)]
+
+
+def lagged_pairs(x, y, lag):
+    """
+    Pairs x_t with y_(t+lag) (x leads y for positive lags) and drops pairs with a missing value.
+    """
+    if lag > 0:
+        x, y = x[:-lag], y[lag:]
+    elif lag < 0:
+        x, y = x[-lag:], y[:lag]
+    valid = ~(np.isnan(x) | np.isnan(y))
+    return x[valid], y[valid]
+
+
+def _block_sums(columns, size, n_starts):
+    # Sums of every column over the window of `size` positions starting at each of n_starts positions
+    sums = np.zeros((len(columns), n_starts))
+    if size:
+        for i, column in enumerate(columns):
+            cumulative = np.concatenate(([0.0], np.cumsum(column)))
+            sums[i] = cumulative[size:size + n_starts] - cumulative[:n_starts]
+    return sums
+
+
+def _block_bootstrap_correlations(rng, zx, zy, n_trials, block_size):
+    """
+    Pearson correlations of n_trials moving-block bootstrap resamples of the pairs (zx, zy).
+
+    A resample is n // block_size full blocks plus one truncated block, each starting at a random
+    position. Sums of x, y, x^2, y^2 and xy over every possible block are precomputed, so a
+    resample costs a gather of n / block_size block sums instead of n values.
+    """
+    n = len(zx)
+    n_starts = n - block_size + 1
+    n_full, remainder = divmod(n, block_size)
+    columns = (zx, zy, zx * zx, zy * zy, zx * zy)
+    starts = rng.integers(0, n_starts, (n_trials, n_full + (remainder > 0)))
+
+    full_starts = starts[:, :n_full]
+    sums = np.stack([np.take(block, full_starts).sum(axis=1)
+                     for block in _block_sums(columns, block_size, n_starts)])
+    if remainder:
+        sums += _block_sums(columns, remainder, n_starts)[:, starts[:, -1]]
+    sx, sy, sxx, syy, sxy = sums / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (sxy - sx * sy) / np.sqrt((sxx - sx * sx) * (syy - sy * sy))
+
+
+def resample_correlation(x, y, n_resamples=10000, block_size=5, confidence=0.95, seed=None):
+    """
+    Pearson correlation with a block-bootstrap confidence interval and a permutation p-value.
+
+    All trials of a chunk are evaluated as one matrix operation; chunks bound the memory to
+    about MAX_CHUNK_ELEMENTS values.
+
+    Parameters:
+        x, y (np.ndarray): Paired observations without missing values, in time order.
+        n_resamples (int): Number of bootstrap resamples and of permutations.
+        block_size (int): Length of the bootstrap blocks, preserving short-range autocorrelation.
+        confidence (float): Coverage of the confidence interval.
+        seed (int or np.random.SeedSequence, optional): Seed of the random generator.
+
+    Returns:
+        dict: 'n', 'corr', 'ci_low', 'ci_high' and 'p_value' (two-sided).
+    """
+    n = len(x)
+    result = {'n': n, 'corr': np.nan, 'ci_low': np.nan, 'ci_high': np.nan, 'p_value': np.nan}
+    if n < 3 or np.std(x) == 0 or np.std(y) == 0:
+        return result
+
+    rng = np.random.default_rng(seed)
+    zx = (x - x.mean()) / x.std()
+    zy = (y - y.mean()) / y.std()
+    observed = zx @ zy / n
+    block_size = min(int(block_size), n)
+    chunk = max(MAX_CHUNK_ELEMENTS // n, 1)
+
+    bootstrap, exceed = [], 0
+    for start in range(0, n_resamples, chunk):
+        n_trials = min(chunk, n_resamples - start)
+        # Bootstrap: resample (x, y) pairs in blocks
+        bootstrap.append(_block_bootstrap_correlations(rng, zx, zy, n_trials, block_size))
+        # Permutation: shuffle x against y; standardized series make each trial a dot product
+        permuted = rng.permuted(np.broadcast_to(zx, (n_trials, n)), axis=1)
+        exceed += int((np.abs(permuted @ zy / n) >= abs(observed) - 1e-12).sum())
+
+    bootstrap = np.concatenate(bootstrap)
+    tail = (1 - confidence) / 2
+    result.update({
+        'corr': observed,
+        'ci_low': np.nanquantile(bootstrap, tail),
+        'ci_high': np.nanquantile(bootstrap, 1 - tail),
+        'p_value': (exceed + 1) / (n_resamples + 1),
+    })
+    return result
+
+
+def _stock_significance(args):
+    stock, series, x_column, y_column, lags, n_resamples, block_size, confidence, seed = args
+    seeds = seed.spawn(len(lags))
+    rows = []
+    for lag, lag_seed in zip(lags, seeds):
+        x, y = lagged_pairs(series[x_column], series[y_column], lag)
+        rows.append({'stock': stock, 'lag': lag,
+                     **resample_correlation(x, y, n_resamples, block_size, confidence, lag_seed)})
+    return rows
+
+
+def correlation_significance(df, x_column='sentiment', y_column='Price_Change', lags=(0,), n_resamples=10000,
+                             block_size=5, confidence=0.95, seed=0, n_jobs=1, date_column='date', stock_column='stock'):
+    """
+    Per-stock, per-lag correlation between two columns with bootstrap confidence intervals and permutation p-values.
+
+    Parameters:
+        df (pd.DataFrame): Long frame with date, stock and the two value columns, one row per (date, stock).
+        x_column (str): Leading column, e.g. the daily sentiment.
+        y_column (str): Lagging column, e.g. the price change.
+        lags (list of int): Lags in rows; lag k pairs x on day t with y on day t + k.
+        n_resamples (int): Number of bootstrap resamples and permutations per stock and lag.
+        block_size (int): Length of the bootstrap blocks.
+        confidence (float): Coverage of the confidence intervals.
+        seed (int): Seed; every stock gets its own stream so results do not depend on n_jobs.
+        n_jobs (int): Number of worker processes across stocks; None or -1 uses all cores.
+
+    Returns:
+        pd.DataFrame: Columns 'stock', 'lag', 'n', 'corr', 'ci_low', 'ci_high' and 'p_value'.
+    """
+    series = stock_series(df, [x_column, y_column], date_column, stock_column)
+    stock_seeds = np.random.SeedSequence(seed).spawn(len(series))
+    tasks = [(stock, arrays, x_column, y_column, list(lags), n_resamples, block_size, confidence, stock_seed)
+             for (stock, arrays), stock_seed in zip(series, stock_seeds)]
+
+    n_jobs = resolve_n_jobs(n_jobs)
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_stock_significance, tasks))
+    else:
+        results = [_stock_significance(task) for task in tasks]
+
+    return pd.DataFrame([row for rows in results for row in rows],
+                        columns=['stock', 'lag', 'n', 'corr', 'ci_low', 'ci_high', 'p_value'])
@@ -0,0 +1,221 @@
+# streaming_indicators.py
+import copy
+
+import numpy as np
+import pandas as pd
+
+from indicators import pack_groups
+
+
+class SMAState:
+    def __init__(self, period, n_series):
+        """
+        Running simple moving average of n_series series, kept in a ring buffer of the last `period` values.
+        """
+        self.period = int(period)
+        self.buffer = np.zeros((self.period, n_series))
+        self.n_bars = np.zeros(n_series, dtype=np.int64)
+        self.window_sum = np.zeros(n_series)
+        self.window_nans = np.zeros(n_series, dtype=np.int64)
+
+    def update(self, values, idx):
+        """
+        Adds one bar to the series at positions idx and returns their current SMA.
+        """
+        slot = self.n_bars[idx] % self.period
+        full = self.n_bars[idx] >= self.period
+        old = self.buffer[slot, idx]
+        old_nan = np.isnan(old) & full
+        new_nan = np.isnan(values)
+
+        self.window_sum[idx] += np.where(new_nan, 0.0, values) - np.where(full & ~old_nan, old, 0.0)
+        self.window_nans[idx] += new_nan.astype(np.int64) - old_nan
+        self.buffer[slot, idx] = values
+        self.n_bars[idx] += 1
+        ready = (self.n_bars[idx] >= self.period) & (self.window_nans[idx] == 0)
+        return np.where(ready, self.window_sum[idx] / self.period, np.nan)
+
+
+class EMAState:
+    def __init__(self, period, n_series):
+        """
+        Running exponential moving average, seeded with the mean of the first `period` values
+        after any leading NaNs, like indicators.ema.
+        """
+        self.period = int(period)
+        self.alpha = 2 / float(self.period + 1)
+        self.n_valid = np.zeros(n_series, dtype=np.int64)
+        self.seed_sum = np.zeros(n_series)
+        self.value = np.full(n_series, np.nan)
+
+    def update(self, values, idx):
+        """
+        Adds one bar to the series at positions idx and returns their current EMA.
+        """
+        # Leading NaNs are skipped; once a series has started every value counts
+        started = (self.n_valid[idx] > 0) | ~np.isnan(values)
+        self.n_valid[idx] += started
+        n_valid = self.n_valid[idx]
+
+        warming = started & (n_valid <= self.period)
+        self.seed_sum[idx] += np.where(warming, values, 0.0)
+        value = self.value[idx]
+        value = np.where(n_valid == self.period, self.seed_sum[idx] / self.period, value)
+        value = np.where(n_valid > self.period, self.alpha * values + (1 - self.alpha) * value, value)
+        self.value[idx] = value
+        return np.where(n_valid >= self.period, value, np.nan)
+
+
+class RSIState:
+    def __init__(self, period, n_series):
+        """
+        Running Wilder RSI, seeded with the mean gain/loss of the first `period` changes like indicators.rsi.
+        """
+        self.period = int(period)
+        self.n_bars = np.zeros(n_series, dtype=np.int64)
+        self.previous = np.full(n_series, np.nan)
+        self.avg_gain = np.zeros(n_series)
+        self.avg_loss = np.zeros(n_series)
+
+    def update(self, values, idx):
+        """
+        Adds one bar to the series at positions idx and returns their current RSI.
+        """
+        n_changes = self.n_bars[idx]
+        change = values - self.previous[idx]
+        gain = np.maximum(change, 0)
+        loss = np.maximum(-change, 0)
+
+        seeding = (n_changes >= 1) & (n_changes <= self.period)
+        smoothing = n_changes > self.period
+        avg_gain, avg_loss = self.avg_gain[idx], self.avg_loss[idx]
+        # During the seed window the averages hold running sums until the last change
+        avg_gain = np.where(seeding, avg_gain + gain, avg_gain)
+        avg_loss = np.where(seeding, avg_loss + loss, avg_loss)
+        seeded = n_changes == self.period
+        avg_gain = np.where(seeded, avg_gain / self.period, avg_gain)
+        avg_loss = np.where(seeded, avg_loss / self.period, avg_loss)
+        avg_gain = np.where(smoothing, (avg_gain * (self.period - 1) + gain) / self.period, avg_gain)
+        avg_loss = np.where(smoothing, (avg_loss * (self.period - 1) + loss) / self.period, avg_loss)
+
+        self.avg_gain[idx], self.avg_loss[idx] = avg_gain, avg_loss
+        self.previous[idx] = values
+        self.n_bars[idx] += 1
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+        return np.where(n_changes >= self.period, rsi, np.nan)
+
+
+class StreamingIndicators:
+    def __init__(self, tickers, sma_period=50, rsi_period=14, short_period=12, long_period=26, signal_period=9):
+        """
+        Keeps SMA, RSI, MACD and signal line state for a fixed set of tickers so new bars
+        can be added in O(1) per ticker, with the same output as a full recompute.
+
+        Parameters:
+            tickers (list): Ticker symbols tracked by the state.
+            sma_period, rsi_period, short_period, long_period, signal_period (int): Indicator periods.
+        """
+        self.tickers = pd.Index(tickers)
+        n = len(self.tickers)
+        self.sma = SMAState(sma_period, n)
+        self.rsi = RSIState(rsi_period, n)
+        self.ema_short = EMAState(short_period, n)
+        self.ema_long = EMAState(long_period, n)
+        self.signal = EMAState(signal_period, n)
+
+    def _update(self, values, idx):
+        macd_line = self.ema_short.update(values, idx) - self.ema_long.update(values, idx)
+        return {
+            'SMA': self.sma.update(values, idx),
+            'RSI': self.rsi.update(values, idx),
+            'MACD_Line': macd_line,
+            'Signal_Line': self.signal.update(macd_line, idx),
+        }
+
+    def update(self, closes, commit=True):
+        """
+        Adds one new bar per ticker.
+
+        Parameters:
+            closes (pd.Series): Closing prices indexed by ticker; tickers not present keep their state.
+            commit (bool): If False, return the indicators for a provisional (e.g. intraday) bar
+                without changing the state.
+
+        Returns:
+            pd.DataFrame: 'SMA', 'RSI', 'MACD_Line' and 'Signal_Line' indexed by ticker.
+
+        Raises:
+            KeyError: If a ticker is not tracked by the state.
+            ValueError: If a ticker appears more than once, since each update adds a single bar.
+        """
+        if closes.index.has_duplicates:
+            duplicated = closes.index[closes.index.duplicated()].unique()
+            raise ValueError(f"Duplicate tickers in closes: {list(duplicated)}; pass one bar per ticker per update.")
+        idx = self.tickers.get_indexer(closes.index)
+        if (idx < 0).any():
+            raise KeyError(f"Unknown tickers: {list(closes.index[idx < 0])}")
+        state = self if commit else copy.deepcopy(self)
+        values = state._update(closes.to_numpy(dtype=np.float64), idx)
+        return pd.DataFrame(values, index=closes.index)
+
+    @classmethod
+    def from_history(cls, df, price_column='Close', group_column='stock', **periods):
+        """
+        Builds the state by replaying the full price history of every ticker.
+
+        Parameters:
+            df (pd.DataFrame): Price data in long format, each ticker's rows in chronological order.
+            price_column (str): Column holding the prices.
+            group_column (str, optional): Column identifying each ticker; without it the whole frame
+                is one series, tracked under the name of price_column.
+            **periods: Indicator periods passed to StreamingIndicators.
+
+        Returns:
+            StreamingIndicators: State positioned after the last bar of each ticker.
+        """
+        groups = df[group_column].to_numpy() if group_column else None
+        matrix, rows, columns = pack_groups(df[price_column].to_numpy(), groups)
+        # pack_groups numbers the tickers in order of first appearance, like pd.unique
+        state = cls(pd.unique(groups) if group_column else [price_column], **periods)
+        lengths = np.bincount(columns, minlength=matrix.shape[1])
+        # One vectorized step per bar, across all tickers that have that many bars
+        for row in range(len(matrix)):
+            idx = np.flatnonzero(lengths > row)
+            state._update(matrix[row, idx], idx)
+        return state
+
+    def save(self, path):
+        """
+        Checkpoints the state to a NumPy .npz file; string and numeric tickers keep their type.
+        """
+        tickers = self.tickers.to_numpy()
+        if tickers.dtype == object:
+            # Object arrays would need pickling, so string tickers are stored as fixed-width strings
+            if not all(isinstance(ticker, str) for ticker in tickers):
+                raise TypeError("Only string or numeric tickers can be checkpointed.")
+            tickers = tickers.astype(str)
+        arrays = {'tickers': tickers}
+        for name in ('sma', 'rsi', 'ema_short', 'ema_long', 'signal'):
+            for key, value in vars(getattr(self, name)).items():
+                arrays[f"{name}.{key}"] = np.asarray(value)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Restores a state checkpointed with save().
+        """
+        with np.load(path) as data:
+            state = cls.__new__(cls)
+            state.tickers = pd.Index(data['tickers'])
+            for name, state_class in (('sma', SMAState), ('rsi', RSIState), ('ema_short', EMAState),
+                                      ('ema_long', EMAState), ('signal', EMAState)):
+                component = state_class.__new__(state_class)
+                for key in data.files:
+                    if key.startswith(f"{name}."):
+                        value = data[key]
+                        setattr(component, key[len(name) + 1:], value.item() if value.ndim == 0 else value)
+                setattr(state, name, component)
+        return state
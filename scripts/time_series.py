@@ -3,14 +3,17 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 # from EDA import EDA
 from preprocessing import Preprocessing
+from calendar_counts import calendar_counts
+from heavy_hitters import publisher_domains
+from significance import correlation_significance
+from lead_lag import lead_lag_correlation, lead_lag_matrix
 class TimeSeries:
     def __init__(self, dataframe):
         """
         Initializes the TimeSeries class with the provided DataFrame and preprocesses the date column.
         """
         # Use the Preprocessing class to parse the date column
-        date_transformation = Preprocessing()
-        self.dataframe = date_transformation.process_date_column(dataframe, 'date')
+        self.dataframe = Preprocessing.process_date_column(dataframe, 'date')
         
         # preprocessing.process_date_column()  # Assuming this method handles all date parsing logic
         # self.dataframe = preprocessing.dataframe  # Use the preprocessed DataFrame
@@ -47,38 +50,34 @@ class TimeSeries:
         """
         Analyze the publishing times to identify if there's a specific time of day, week, or month when most news is released.
         This can be useful for traders and automated trading systems to identify patterns in market-related news.
-        """
-        # Extract time-related features from the 'date' column
-        self.dataframe['hour'] = self.dataframe['date'].dt.hour
-        self.dataframe['day_of_week'] = self.dataframe['date'].dt.dayofweek
-        self.dataframe['month'] = self.dataframe['date'].dt.month
 
-        # Analyze the publication times based on the hour of the day
-        plt.figure(figsize=(12, 6))
-        sns.countplot(data=self.dataframe, x='hour', palette='viridis')
-        plt.title("Publication Frequency by Hour of the Day")
-        plt.xlabel("Hour of the Day")
-        plt.ylabel("Number of Articles Published")
-        plt.grid(True)
-        plt.show()
+        The hour, weekday, month and hour x weekday counts come from one counting pass over the
+        timestamps (see calendar_counts), without adding columns to the dataframe.
 
-        # Analyze the publication frequency by day of the week
-        plt.figure(figsize=(12, 6))
-        sns.countplot(data=self.dataframe, x='day_of_week', palette='viridis')
-        plt.title("Publication Frequency by Day of the Week")
-        plt.xlabel("Day of the Week")
-        plt.ylabel("Number of Articles Published")
-        plt.grid(True)
-        plt.show()
+        Returns:
+            dict: Article counts per 'daily', 'hour', 'weekday', 'day', 'month', 'year' and 'hour_weekday'.
+        """
+        counts = calendar_counts(self.dataframe['date'])
 
-        # Analyze the publication frequency by month
-        plt.figure(figsize=(12, 6))
-        sns.countplot(data=self.dataframe, x='month', palette='viridis')
-        plt.title("Publication Frequency by Month")
-        plt.xlabel("Month")
-        plt.ylabel("Number of Articles Published")
-        plt.grid(True)
+        for key, title, xlabel in (('hour', "Publication Frequency by Hour of the Day", "Hour of the Day"),
+                                   ('weekday', "Publication Frequency by Day of the Week", "Day of the Week"),
+                                   ('month', "Publication Frequency by Month", "Month")):
+            plt.figure(figsize=(12, 6))
+            counts[key].plot(kind='bar', color=sns.color_palette('viridis', len(counts[key])))
+            plt.title(title)
+            plt.xlabel(xlabel)
+            plt.ylabel("Number of Articles Published")
+            plt.grid(True)
+            plt.show()
+
+        # Analyze the publication frequency by hour within each day of the week
+        plt.figure(figsize=(14, 5))
+        sns.heatmap(counts['hour_weekday'], cmap='viridis')
+        plt.title("Publication Frequency by Day of the Week and Hour")
+        plt.xlabel("Hour of the Day")
+        plt.ylabel("Day of the Week")
         plt.show()
+        return counts
 
     def analyze_publishers(self):
         """
@@ -102,11 +101,10 @@ class TimeSeries:
         plt.grid(True)
         plt.show()
 
-        # If email addresses are used as publisher names, extract unique domains
-        if self.dataframe['publisher'].str.contains('@').any():
-            self.dataframe['publisher_domain'] = self.dataframe['publisher'].apply(
-                lambda x: x.split('@')[-1] if isinstance(x, str) else None
-            )
+        # If email addresses are used as publisher names, extract unique domains, parsing each distinct publisher once
+        publishers = self.dataframe['publisher'].astype('category')
+        if publishers.cat.categories.astype(str).str.contains('@').any():
+            self.dataframe['publisher_domain'] = publisher_domains(publishers)
             domain_counts = self.dataframe['publisher_domain'].value_counts()
 
             # Plot the most frequent publisher domains
@@ -121,7 +119,7 @@ class TimeSeries:
 
         # Analyzing sentiment per publisher to see which publishers have positive, negative, or neutral news
         if 'sentiment' in self.dataframe.columns:
-            publisher_sentiment = self.dataframe.groupby('publisher')['sentiment'].mean()
+            publisher_sentiment = self.dataframe.groupby('publisher', observed=True)['sentiment'].mean()
 
             # Plot the average sentiment of articles by publisher
             plt.figure(figsize=(12, 6))
@@ -162,4 +160,49 @@ class TimeSeries:
         corr_matrix = merged_df[['sentiment', 'Price_Change']].corr()
         sns.heatmap(corr_matrix, annot=True, cmap='coolwarm')
         plt.title("Correlation Between Sentiment and Stock Price Change")
-        plt.show()
\ No newline at end of file
+        plt.show()
+
+    def correlation_significance(self, merged_df, x_column='sentiment', y_column='Price_Change', lags=(0,),
+                                 n_resamples=10000, block_size=5, confidence=0.95, seed=0, n_jobs=1):
+        """
+        Per-stock, per-lag significance of the sentiment / price change correlation.
+
+        Confidence intervals come from a block bootstrap and p-values from a permutation test,
+        each with n_resamples trials evaluated as matrix operations.
+
+        Parameters:
+            merged_df (pd.DataFrame): Frame with 'date', 'stock' and both columns, e.g. the merged frame of analyze_correlation
+                aggregated to one row per date and stock.
+            lags (list of int): Lags in rows; lag k pairs sentiment on day t with the price change on day t + k.
+            n_jobs (int): Number of worker processes across stocks; None or -1 uses all cores.
+
+        Returns:
+            pd.DataFrame: 'stock', 'lag', 'n', 'corr', 'ci_low', 'ci_high' and 'p_value'.
+        """
+        results = correlation_significance(merged_df, x_column, y_column, lags=lags, n_resamples=n_resamples,
+                                           block_size=block_size, confidence=confidence, seed=seed, n_jobs=n_jobs)
+        significant = (results['p_value'] < 1 - confidence).sum()
+        print(f"{significant} of {len(results)} stock/lag correlations are significant at {1 - confidence:.0%}")
+        return results
+
+    def lead_lag_correlation(self, merged_df, max_lag=5, sentiment_column='sentiment_score', plot=True):
+        """
+        Correlate daily sentiment with returns at lags -max_lag..+max_lag for every stock at once.
+
+        Parameters:
+            merged_df (pd.DataFrame): Merged price/sentiment frame with 'date', 'stock', 'Close' and the sentiment column.
+            max_lag (int): Largest lag in trading dates; positive lags pair sentiment with later returns.
+            plot (bool): Show the (stock x lag) correlation heatmap.
+
+        Returns:
+            pd.DataFrame: Tidy frame with 'stock', 'lag', 'corr' and 'n'.
+        """
+        lead_lag = lead_lag_correlation(merged_df, max_lag=max_lag, sentiment_column=sentiment_column)
+        if plot:
+            plt.figure(figsize=(12, 8))
+            sns.heatmap(lead_lag_matrix(lead_lag), cmap='coolwarm', center=0)
+            plt.title("Correlation Between Sentiment and Returns by Lag")
+            plt.xlabel("Lag (trading days, sentiment leads for positive lags)")
+            plt.ylabel("Stock")
+            plt.show()
+        return lead_lag
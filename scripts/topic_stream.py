@@ -0,0 +1,182 @@
+# topic_stream.py
+import os
+
+import numpy as np
+
+from news_stream import iter_news_chunks
+
+# Number of hashed features; collisions stay rare for headline vocabularies
+DEFAULT_N_FEATURES = 2 ** 18
+# Number of headlines vectorized and passed to partial_fit at a time
+DEFAULT_TOPIC_CHUNKSIZE = 50000
+# Parameters of OnlineTopicModel that can change on a saved model, applied to its LDA
+RUNTIME_PARAMS = ('batch_size', 'total_samples', 'learning_decay', 'n_jobs', 'random_state')
+
+
+def iter_text_chunks(texts, chunksize=DEFAULT_TOPIC_CHUNKSIZE):
+    """
+    Splits a sequence of texts into consecutive lists of at most chunksize texts.
+    """
+    for start in range(0, len(texts), chunksize):
+        chunk = texts[start:start + chunksize]
+        yield chunk.tolist() if hasattr(chunk, 'tolist') else list(chunk)
+
+
+class OnlineTopicModel:
+    def __init__(self, num_topics=5, n_features=DEFAULT_N_FEATURES, batch_size=4096, total_samples=1e6,
+                 learning_decay=0.7, n_jobs=1, random_state=42, stop_words='english'):
+        """
+        LDA topic model trained incrementally on streamed chunks of headlines.
+
+        Headlines are turned into term counts with a HashingVectorizer, so no vocabulary is held
+        in memory and new words need no refit. The LDA is trained with online variational Bayes
+        (partial_fit), so a saved model can be updated with each day's headlines only.
+
+        Parameters:
+            num_topics (int): Number of topics.
+            n_features (int): Number of hashed term features.
+            batch_size (int): Number of documents per online update.
+            total_samples (float): Expected total number of documents, which scales each online update.
+            learning_decay (float): Decay of the online learning rate.
+            n_jobs (int): Number of jobs used in the E-step; None or -1 uses all cores.
+            random_state (int): Seed of the LDA initialization.
+            stop_words (str or list): Stop words removed before hashing.
+        """
+        # scikit-learn is imported on first use so importing this module stays cheap
+        from sklearn.decomposition import LatentDirichletAllocation
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.vectorizer = HashingVectorizer(n_features=n_features, stop_words=stop_words, alternate_sign=False,
+                                            norm=None, dtype=np.float64)
+        self.lda = LatentDirichletAllocation(n_components=num_topics, learning_method='online',
+                                             batch_size=batch_size, total_samples=total_samples,
+                                             learning_decay=learning_decay, n_jobs=n_jobs,
+                                             random_state=random_state)
+        self.n_documents = 0
+
+    def partial_fit(self, texts):
+        """
+        Updates the model with a chunk of headlines.
+        """
+        counts = self.vectorizer.transform(texts)
+        # Documents without any hashed term carry no information for the topics
+        counts = counts[counts.getnnz(axis=1) > 0]
+        if counts.shape[0]:
+            self.lda.partial_fit(counts)
+            self.n_documents += counts.shape[0]
+        return self
+
+    def fit_stream(self, chunks):
+        """
+        Updates the model with every chunk of an iterable of headline lists.
+        """
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    def fit_file(self, file_path, text_column='headline', chunksize=DEFAULT_TOPIC_CHUNKSIZE):
+        """
+        Updates the model from a news CSV file read chunk by chunk.
+        """
+        for chunk in iter_news_chunks(file_path, chunksize=chunksize, columns=[text_column]):
+            self.partial_fit(chunk[text_column].fillna('').tolist())
+        return self
+
+    def transform(self, texts, chunksize=DEFAULT_TOPIC_CHUNKSIZE):
+        """
+        Topic distribution of every headline, computed chunk by chunk.
+
+        Returns:
+            np.ndarray: (documents x topics) distribution.
+        """
+        parts = [self.lda.transform(self.vectorizer.transform(chunk)) for chunk in iter_text_chunks(texts, chunksize)]
+        return np.vstack(parts) if parts else np.empty((0, self.lda.n_components))
+
+    def dominant_topics(self, texts, chunksize=DEFAULT_TOPIC_CHUNKSIZE):
+        """
+        Most likely topic of every headline, without holding the full distribution in memory.
+        """
+        topics = [self.lda.transform(self.vectorizer.transform(chunk)).argmax(axis=1)
+                  for chunk in iter_text_chunks(texts, chunksize)]
+        return np.concatenate(topics) if topics else np.empty(0, dtype=np.int64)
+
+    def top_words(self, texts, num_words=10):
+        """
+        Most weighted words of each topic.
+
+        Hashed features have no names, so they are named after the most frequent token of
+        the given headlines (e.g. a recent chunk) that hashes to them.
+
+        Returns:
+            list of list of str: num_words words per topic.
+        """
+        from sklearn.utils import murmurhash3_32
+
+        analyzer = self.vectorizer.build_analyzer()
+        n_features = self.vectorizer.n_features
+        token_counts = {}
+        for text in texts:
+            for token in analyzer(text):
+                token_counts[token] = token_counts.get(token, 0) + 1
+
+        names, best = {}, {}
+        for token, count in token_counts.items():
+            feature = abs(murmurhash3_32(token, seed=0)) % n_features
+            if count > best.get(feature, 0):
+                names[feature], best[feature] = token, count
+
+        words = []
+        for topic in self.lda.components_:
+            ranked = [feature for feature in np.argsort(topic)[::-1] if feature in names]
+            words.append([names[feature] for feature in ranked[:num_words]])
+        return words
+
+    def save(self, path):
+        """
+        Persists the vectorizer settings, the LDA state and the document count.
+        """
+        import joblib
+
+        joblib.dump({'vectorizer': self.vectorizer, 'lda': self.lda, 'n_documents': self.n_documents}, path)
+
+    @classmethod
+    def load(cls, path):
+        import joblib
+
+        state = joblib.load(path)
+        model = cls.__new__(cls)
+        model.vectorizer = state['vectorizer']
+        model.lda = state['lda']
+        model.n_documents = state['n_documents']
+        return model
+
+    @classmethod
+    def load_or_create(cls, path=None, **params):
+        """
+        Loads a saved model, or creates a new one with the given parameters when path is missing.
+
+        On a loaded model, runtime parameters (RUNTIME_PARAMS, e.g. n_jobs) are applied, while
+        parameters that define the model (num_topics, n_features, stop_words) must match it.
+
+        Raises:
+            ValueError: If a model-defining parameter differs from the saved model.
+        """
+        if path is None or not os.path.isfile(path):
+            return cls(**params)
+
+        model = cls.load(path)
+        saved = {
+            'num_topics': model.lda.n_components,
+            'n_features': model.vectorizer.n_features,
+            'stop_words': model.vectorizer.stop_words,
+        }
+        conflicts = [f"{name}={params[name]!r} (saved: {value!r})" for name, value in saved.items()
+                     if name in params and params[name] != value]
+        if conflicts:
+            raise ValueError(f"The model saved in {path} does not match the requested parameters: "
+                             f"{', '.join(conflicts)}. Use another model_path or the saved parameters.")
+        unknown = set(params) - set(saved) - set(RUNTIME_PARAMS)
+        if unknown:
+            raise TypeError(f"Unexpected parameters: {', '.join(sorted(unknown))}.")
+        model.lda.set_params(**{name: params[name] for name in RUNTIME_PARAMS if name in params})
+        return model
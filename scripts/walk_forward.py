@@ -0,0 +1,195 @@
+# walk_forward.py
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.linalg.blas import dger
+
+from parallel import resolve_n_jobs
+from portfolio_optimizer import max_sharpe_weights
+
+
+class RollingMoments:
+    def __init__(self, n_assets, window):
+        """
+        Mean and covariance of the last `window` return vectors, kept up to date with rank-one updates.
+
+        Adding or removing one day costs O(N^2) instead of the O(window * N^2) of recomputing
+        the covariance. Updates use centered (Welford) sums for numerical stability and are
+        applied in place with the BLAS rank-one update (dger).
+
+        Missing returns enter the sums as 0 and are counted per asset, so only assets observed on
+        every day of the window (see eligible) have exact moments.
+        """
+        self.window = int(window)
+        self.count = 0
+        self.mean = np.zeros(n_assets)
+        # Fortran order so dger can update the matrix in place
+        self.scatter = np.zeros((n_assets, n_assets), order='F')
+        self.missing = np.zeros(n_assets, dtype=np.int64)
+
+    def add(self, returns):
+        missing = np.isnan(returns)
+        self.missing += missing
+        returns = np.where(missing, 0.0, returns)
+        self.count += 1
+        delta = returns - self.mean
+        self.mean = self.mean + delta / self.count
+        self.scatter = dger(1.0, delta, returns - self.mean, a=self.scatter, overwrite_a=True)
+
+    def remove(self, returns):
+        missing = np.isnan(returns)
+        self.missing -= missing
+        returns = np.where(missing, 0.0, returns)
+        old_mean = self.mean
+        self.count -= 1
+        self.mean = old_mean - (returns - old_mean) / self.count if self.count else np.zeros_like(old_mean)
+        self.scatter = dger(-1.0, returns - old_mean, returns - self.mean, a=self.scatter, overwrite_a=True)
+
+    def covariance(self):
+        return self.scatter / (self.count - 1)
+
+    @property
+    def ready(self):
+        return self.count >= self.window
+
+    @property
+    def eligible(self):
+        # Assets without any missing return in the window
+        return self.missing == 0
+
+
+class EWMAMoments:
+    def __init__(self, n_assets, halflife, min_periods):
+        """
+        Exponentially weighted mean and covariance of return vectors, updated in O(N^2) per day.
+
+        A missing return leaves the asset's mean unchanged, and an asset's statistics restart
+        from its first return after a gap (e.g. its listing), the way the whole panel starts
+        from its first row; eligible assets have min_periods consecutive returns.
+        """
+        self.alpha = 1 - 0.5 ** (1 / float(halflife))
+        self.min_periods = int(min_periods)
+        self.count = 0
+        self.mean = np.zeros(n_assets)
+        self.cov = np.zeros((n_assets, n_assets), order='F')
+        # Consecutive returns observed per asset
+        self.run = np.zeros(n_assets, dtype=np.int64)
+
+    def add(self, returns):
+        self.count += 1
+        observed = ~np.isnan(returns)
+        restart = observed & (self.run == 0)
+        self.run = np.where(observed, self.run + 1, 0)
+        delta = np.where(observed, returns - self.mean, 0.0)
+        delta[restart] = 0.0
+        self.mean = self.mean + self.alpha * delta
+        # cov = (1 - alpha) * (cov + alpha * delta delta'), in place
+        self.cov *= 1 - self.alpha
+        self.cov = dger((1 - self.alpha) * self.alpha, delta, delta, a=self.cov, overwrite_a=True)
+        if restart.any():
+            self.mean[restart] = returns[restart]
+            self.cov[restart, :] = 0.0
+            self.cov[:, restart] = 0.0
+
+    def covariance(self):
+        return self.cov.copy()
+
+    @property
+    def ready(self):
+        return self.count >= self.min_periods
+
+    @property
+    def eligible(self):
+        return self.run >= self.min_periods
+
+
+def shrink_covariance(cov, shrinkage):
+    """
+    Shrinks a covariance matrix towards a scaled identity: (1 - shrinkage) * cov + shrinkage * (trace / N) * I.
+
+    Parameters:
+        cov (np.ndarray): Sample covariance matrix.
+        shrinkage (float): Shrinkage intensity between 0 and 1.
+    """
+    target = np.trace(cov) / len(cov)
+    shrunk = (1 - shrinkage) * cov
+    shrunk[np.diag_indices_from(shrunk)] += shrinkage * target
+    return shrunk
+
+
+def _solve_rebalance(args):
+    date, mu, cov, eligible, shrinkage, risk_free_rate, previous = args
+    weights = np.zeros(len(mu))
+    if not eligible.any():
+        return weights
+    cov = cov[np.ix_(eligible, eligible)]
+    if shrinkage:
+        cov = shrink_covariance(cov, shrinkage)
+    # Warm start from the previous weights of the assets still eligible
+    initial_weights = None
+    if previous is not None and previous[eligible].sum() > 0:
+        initial_weights = previous[eligible] / previous[eligible].sum()
+    result = max_sharpe_weights(mu[eligible], cov, risk_free_rate=risk_free_rate, initial_weights=initial_weights)
+    if not result.success:
+        raise ValueError(f"Optimization failed at {date}: {result.message}")
+    weights[eligible] = result.x
+    return weights
+
+
+def walk_forward_weights(returns, window=252, rebalance_every=21, estimator='rolling', halflife=63,
+                         shrinkage=None, risk_free_rate=0.01, n_jobs=1):
+    """
+    Re-optimizes max-Sharpe weights on rolling windows of daily returns.
+
+    The mean and covariance are carried forward day by day (rank-one add/remove for a rolling
+    window, or an exponentially weighted estimator) and snapshotted at every rebalance date.
+    Rows without any return are dropped. Assets with missing returns in the window (e.g.
+    before their listing) are left out of that rebalance and get weight 0.
+
+    Parameters:
+        returns (pd.DataFrame): Daily returns, one row per date and one column per asset.
+        window (int): Rolling window length in rows; also the warm-up for estimator='ewma'.
+        rebalance_every (int): Number of rows between rebalances.
+        estimator (str): 'rolling' or 'ewma'.
+        halflife (float): Half-life in rows of the 'ewma' estimator.
+        shrinkage (float, optional): Shrinkage intensity towards a scaled identity.
+        risk_free_rate (float): Risk-free rate in the units of the returns.
+        n_jobs (int): Number of worker processes for the independent solves; 1 solves in the
+            current process, warm-starting each solve from the previous weights.
+
+    Returns:
+        pd.DataFrame: Weights with one row per rebalance date and one column per asset.
+
+    Raises:
+        ValueError: If the optimizer does not converge at a rebalance date.
+    """
+    if estimator not in ('rolling', 'ewma'):
+        raise ValueError("estimator must be 'rolling' or 'ewma'.")
+    returns = returns.dropna(how='all')
+    values = returns.to_numpy(dtype=np.float64)
+    n_assets = values.shape[1]
+    moments = RollingMoments(n_assets, window) if estimator == 'rolling' else EWMAMoments(n_assets, halflife, window)
+
+    dates, problems = [], []
+    for row in range(len(values)):
+        moments.add(values[row])
+        if estimator == 'rolling' and moments.count > window:
+            moments.remove(values[row - window])
+        if moments.ready and (row + 1 - window) % rebalance_every == 0:
+            dates.append(returns.index[row])
+            problems.append((returns.index[row], moments.mean.copy(), moments.covariance(), moments.eligible.copy(),
+                             shrinkage, risk_free_rate))
+
+    n_jobs = resolve_n_jobs(n_jobs)
+    if n_jobs > 1 and len(problems) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            weights = list(executor.map(_solve_rebalance, [problem + (None,) for problem in problems]))
+    else:
+        weights, previous = [], None
+        for problem in problems:
+            previous = _solve_rebalance(problem + (previous,))
+            weights.append(previous)
+
+    return pd.DataFrame(np.array(weights).reshape(len(dates), n_assets), index=pd.Index(dates, name=returns.index.name),
+                        columns=returns.columns)
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from alignment import StockDateIndex, session_days, to_local_times
+
+
+class TestStockDateIndex(unittest.TestCase):
+    def setUp(self):
+        self.prices = pd.DataFrame({
+            'date': ['2020-06-10', '2020-06-11', '2020-06-12', '2020-06-01', '2020-06-02'],
+            'stock': ['AAPL', 'AAPL', 'AAPL', 'MSFT', 'MSFT'],
+        })
+        self.index = StockDateIndex(self.prices)
+
+    def days(self, dates):
+        return session_days(to_local_times(pd.Series(dates)))
+
+    def test_exact_lookup(self):
+        rows = self.index.lookup(['AAPL', 'AAPL', 'MSFT'], self.days(['2020-06-11', '2020-06-13', '2020-06-02']))
+        np.testing.assert_array_equal(rows, [1, -1, 4])
+
+    def test_asof_before_first_bar_respects_max_days(self):
+        # AAPL's first bar is 9 days after the headline, MSFT's first bar starts the index
+        days = self.days(['2020-06-01', '2020-06-08', '2020-05-25'])
+        rows = self.index.lookup(['AAPL', 'AAPL', 'MSFT'], days, how='asof', max_days=3)
+        np.testing.assert_array_equal(rows, [-1, 0, -1])
+
+    def test_asof_before_first_bar_without_limit(self):
+        rows = self.index.lookup(['AAPL', 'MSFT'], self.days(['2020-06-01', '2020-05-25']), how='asof')
+        np.testing.assert_array_equal(rows, [0, 3])
+
+    def test_asof_after_last_bar(self):
+        rows = self.index.lookup(['AAPL', 'MSFT'], self.days(['2020-06-13', '2020-06-03']), how='asof')
+        np.testing.assert_array_equal(rows, [-1, -1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from calendar_counts import calendar_counts
+
+
+class TestCalendarCounts(unittest.TestCase):
+    def test_mixed_offsets_keep_local_time(self):
+        # Raw news dates mix '-04:00' and '-05:00' offsets with naive timestamps
+        dates = pd.Series(['2020-06-05 10:30:54-04:00', '2020-01-06 09:00:00-05:00', '2020-06-05 16:00:00',
+                           'not a date', None])
+        counts = calendar_counts(dates)
+        self.assertEqual(counts['hour'].sum(), 3)
+        self.assertEqual(counts['hour'][10], 1)
+        self.assertEqual(counts['hour'][9], 1)
+        self.assertEqual(counts['hour'][16], 1)
+        self.assertEqual(counts['weekday']['Friday'], 2)
+        self.assertEqual(counts['weekday']['Monday'], 1)
+        self.assertEqual(counts['daily'][pd.Timestamp('2020-06-05')], 2)
+
+    def test_matches_datetime_accessors(self):
+        rng = np.random.default_rng(0)
+        times = pd.Series(pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 5 * 365 * 86400, 10000), unit='s'))
+        counts = calendar_counts(times)
+        expected_hour = times.dt.hour.value_counts().reindex(range(24), fill_value=0)
+        np.testing.assert_array_equal(counts['hour'].to_numpy(), expected_hour.to_numpy())
+        expected_month = times.dt.month.value_counts().reindex(range(1, 13), fill_value=0)
+        np.testing.assert_array_equal(counts['month'].to_numpy(), expected_month.to_numpy())
+        expected_year = times.dt.year.value_counts().sort_index()
+        np.testing.assert_array_equal(counts['year'].to_numpy(), expected_year.to_numpy())
+        np.testing.assert_array_equal(counts['hour_weekday'].to_numpy().sum(), len(times))
+
+
+if __name__ == '__main__':
+    unittest.main()
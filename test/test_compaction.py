@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+import EDA
+from compaction import compact
+
+
+def merged_frame(n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.Timestamp('2020-01-01') + pd.to_timedelta(np.arange(n_rows) // 4, unit='D'),
+        'stock': rng.choice(['AAPL', 'MSFT', 'TSLA', 'NVDA'], n_rows),
+        'headline': [f"Headline {i} about the market" for i in range(n_rows)],
+        'Close': 50 + rng.normal(0, 1, n_rows).cumsum(),
+        'Volume': rng.integers(1000, 30000, n_rows).astype(np.float64),
+        'Dividends': rng.choice([0.0, 0.0, 0.0, 1.0], n_rows),
+        'Stock Splits': np.zeros(n_rows),
+        'sentiment_score': rng.uniform(-1, 1, n_rows),
+        'sentiment': rng.integers(-1, 2, n_rows),
+        'sentiment_category': rng.choice(['positive', 'neutral', 'negative'], n_rows),
+    })
+
+
+class TestCompact(unittest.TestCase):
+    def setUp(self):
+        self.df = merged_frame()
+        self.compacted = compact(self.df, verbose=False)
+
+    def test_values_preserved(self):
+        for column in self.df.columns:
+            with self.subTest(column=column):
+                np.testing.assert_array_equal(self.compacted[column].to_numpy(dtype=self.df[column].dtype),
+                                              self.df[column].to_numpy())
+        self.assertEqual(self.compacted['sentiment'].dtype, np.int8)
+        self.assertIsInstance(self.compacted['stock'].dtype, pd.CategoricalDtype)
+
+    def test_whole_number_floats_stay_float(self):
+        for column in ('Volume', 'Dividends', 'Stock Splits'):
+            self.assertTrue(pd.api.types.is_float_dtype(self.compacted[column].dtype), column)
+        opted_in = compact(self.df, integer_floats=True, verbose=False)
+        self.assertTrue(pd.api.types.is_integer_dtype(opted_in['Volume'].dtype))
+        self.assertTrue(pd.api.types.is_integer_dtype(opted_in['Dividends'].dtype))
+
+
+class TestEDAOnCompactedFrame(unittest.TestCase):
+    def heatmap_data(self, df):
+        with mock.patch.object(EDA.sns, 'heatmap') as heatmap, mock.patch.object(EDA.plt, 'show'):
+            EDA.EDA(df).correlation_heatmap()
+        return heatmap.call_args.args[0]
+
+    def test_correlation_heatmap_keeps_compacted_columns(self):
+        df = merged_frame()
+        for compacted in (compact(df, verbose=False), compact(df, integer_floats=True, verbose=False)):
+            expected = self.heatmap_data(df)
+            result = self.heatmap_data(compacted)
+            self.assertEqual(list(result.columns), list(expected.columns))
+            np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-6)
+
+    def test_numeric_paths_run_on_compacted_frame(self):
+        eda = EDA.EDA(compact(merged_frame(), verbose=False))
+        with mock.patch.object(EDA.plt, 'show'), mock.patch('builtins.print'):
+            eda.display_basic_info()
+            eda.visualize_word_counts()
+        self.assertTrue(pd.api.types.is_integer_dtype(eda.dataframe['word_count'].dtype))
+
+
+if __name__ == '__main__':
+    unittest.main()
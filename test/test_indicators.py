@@ -0,0 +1,44 @@
+import unittest
+from importlib.metadata import PackageNotFoundError, version
+
+import numpy as np
+import pandas as pd
+
+from benchmark import synthetic_price_frame
+from indicators import compute_indicators
+
+
+def _pyti_version():
+    try:
+        return tuple(int(part) for part in version('pyti').split('.')[:2])
+    except PackageNotFoundError:
+        return None
+
+
+@unittest.skipUnless(_pyti_version() and _pyti_version() >= (0, 3), "pyti >= 0.3 (requirements.txt) is not installed")
+class TestIndicatorsMatchPyti(unittest.TestCase):
+    def test_compute_indicators_matches_pyti(self):
+        from pyti.exponential_moving_average import exponential_moving_average as pyti_ema
+        from pyti.moving_average_convergence_divergence import moving_average_convergence_divergence as pyti_macd
+        from pyti.relative_strength_index import relative_strength_index as pyti_rsi
+        from pyti.simple_moving_average import simple_moving_average as pyti_sma
+
+        df = synthetic_price_frame(n_tickers=5, n_bars=300)
+        result = compute_indicators(df, group_column='stock')
+        for stock, group in df.groupby('stock', sort=False):
+            close = group['Close'].tolist()
+            macd_line = pyti_macd(close, short_period=12, long_period=26)
+            expected = pd.DataFrame({
+                'SMA': pyti_sma(close, period=50),
+                'RSI': pyti_rsi(close, period=14),
+                'MACD_Line': macd_line,
+                'Signal_Line': pyti_ema(list(macd_line), period=9),
+            }, index=group.index)
+            for column in expected.columns:
+                with self.subTest(stock=stock, indicator=column):
+                    np.testing.assert_allclose(result.loc[group.index, column], expected[column],
+                                               rtol=1e-9, atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
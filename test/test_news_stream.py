@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from benchmark import write_synthetic_news_file
+from news_stream import aggregate_daily_sentiment, daily_sentiment, merge_into_running, stream_daily_sentiment
+
+# Peak RSS growth allowed while streaming 500k articles in 20k-row chunks (about 60 MB);
+# scoring the whole file in memory takes about 125 MB
+MEMORY_CEILING_MB = 100
+
+
+def _status_mb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) / 1024
+    raise KeyError(field)
+
+
+def _reset_peak_rss():
+    # Writing 5 to clear_refs resets the process's peak RSS (VmHWM) to its current RSS (Linux only)
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class TestStreamDailySentiment(unittest.TestCase):
+    def test_matches_in_memory_pipeline(self):
+        from sentiment import SentimentAnalyzer
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'news.csv')
+            write_synthetic_news_file(file_path, n_rows=5000, n_stocks=5)
+            analyzer = SentimentAnalyzer()
+            streamed = stream_daily_sentiment(file_path, analyzer, chunksize=700)
+            expected = daily_sentiment(pd.read_csv(file_path), analyzer)
+        pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+    def test_merge_into_running(self):
+        chunk = pd.DataFrame({
+            'date': pd.to_datetime(['2020-06-01', '2020-06-01', '2020-06-02']),
+            'stock': ['A', 'B', 'A'],
+            'sentiment_score': [0.5, -0.2, 0.1],
+            'sentiment': [1, -1, 1],
+        })
+        other = chunk.assign(sentiment_score=[-0.4, 0.3, 0.0], sentiment=[-1, 1, 0],
+                             date=pd.to_datetime(['2020-06-01', '2020-06-03', '2020-06-02']))
+        running = merge_into_running(aggregate_daily_sentiment(chunk), aggregate_daily_sentiment(other))
+        expected = aggregate_daily_sentiment(pd.concat([chunk, other]))
+        pd.testing.assert_frame_equal(running.sort_index(), expected.sort_index(), check_dtype=False)
+
+    def test_streaming_peak_memory_under_ceiling(self):
+        from sentiment import SentimentAnalyzer
+
+        n_rows = 500000
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'news.csv')
+            write_synthetic_news_file(file_path, n_rows=n_rows, n_stocks=50)
+            analyzer = SentimentAnalyzer()
+            if not _reset_peak_rss():
+                self.skipTest("Peak RSS cannot be reset on this platform.")
+            baseline_mb = _status_mb('VmRSS')
+            daily = stream_daily_sentiment(file_path, analyzer, chunksize=20000)
+            growth_mb = _status_mb('VmHWM') - baseline_mb
+        self.assertEqual(int(daily['article_count'].sum()), n_rows)
+        self.assertLess(growth_mb, MEMORY_CEILING_MB)
+
+
+if __name__ == '__main__':
+    unittest.main()
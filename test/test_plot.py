@@ -0,0 +1,67 @@
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from downsample import downsample
+from indicators import compute_indicators
+from plot import StockPlot
+
+CHARTS = ('StockPrice50DaySMA', 'RSIPlot', 'MACDPlot')
+MAX_POINTS = 2000
+# Budgets per figure at MAX_POINTS points per trace; the full 200k-bar figures serialize to 6-20 MB
+PAYLOAD_BUDGET_MB = 0.5
+PREP_BUDGET_SECONDS = 2.0
+
+
+def minute_bars(n_bars, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = pd.DataFrame({'Close': 50 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))},
+                          index=pd.date_range('2000-01-03 09:30', periods=n_bars, freq='min', name='date'))
+    df = pd.concat([prices, compute_indicators(prices)], axis=1)
+    return df.rename(columns={'SMA': 'SMA_50', 'RSI': 'RSI_14'})
+
+
+class TestDownsampledRendering(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = minute_bars(200000)
+
+    def test_charts_within_point_and_payload_budget(self):
+        for method in ('lttb', 'minmax'):
+            plot = StockPlot(self.df, max_points=MAX_POINTS, downsample_method=method)
+            for chart in CHARTS:
+                with self.subTest(method=method, chart=chart):
+                    start = time.perf_counter()
+                    fig = getattr(plot, chart)(show=False)
+                    payload = fig.to_json()
+                    seconds = time.perf_counter() - start
+                    for trace in fig.data:
+                        self.assertLessEqual(len(trace.x), MAX_POINTS)
+                        self.assertLessEqual(len(trace.y), MAX_POINTS)
+                    self.assertLess(len(payload) / 2 ** 20, PAYLOAD_BUDGET_MB)
+                    self.assertLess(seconds, PREP_BUDGET_SECONDS)
+
+    def test_lttb_keeps_endpoints(self):
+        x, y = self.df.index, self.df['Close']
+        sampled_x, sampled_y = downsample(x, y, MAX_POINTS, 'lttb')
+        self.assertEqual(len(sampled_y), MAX_POINTS)
+        self.assertEqual(sampled_x[0], x[0])
+        self.assertEqual(sampled_x[-1], x[-1])
+
+    def test_minmax_keeps_extremes(self):
+        y = self.df['Close']
+        _, sampled_y = downsample(self.df.index, y, MAX_POINTS, 'minmax')
+        self.assertLessEqual(len(sampled_y), MAX_POINTS)
+        self.assertEqual(np.max(sampled_y), y.max())
+        self.assertEqual(np.min(sampled_y), y.min())
+
+    def test_short_series_unchanged(self):
+        x, y = self.df.index[:500], self.df['Close'].iloc[:500]
+        sampled_x, sampled_y = downsample(x, y, MAX_POINTS, 'lttb')
+        np.testing.assert_array_equal(np.asarray(sampled_y), y.to_numpy())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from portfolio_analysis import SentimentPortfolioAnalysis
+from portfolio_engine import MIN_NET_SHARE, sentiment_weights
+
+
+class TestSentimentWeights(unittest.TestCase):
+    def setUp(self):
+        self.sentiment = np.array([[0.6, 0.2, -0.2], [0.0, 0.0, 0.0], [0.5, -0.5, 0.0]])
+
+    def test_default_is_gross_normalization(self):
+        weights = sentiment_weights(self.sentiment)
+        np.testing.assert_array_equal(weights, sentiment_weights(self.sentiment, 'gross'))
+        np.testing.assert_allclose(weights[0], [0.6, 0.2, -0.2])
+        np.testing.assert_allclose(weights[2], [0.5, -0.5, 0.0])
+        np.testing.assert_allclose(np.abs(weights).sum(axis=1), [1.0, 0.0, 1.0])
+
+    def test_net_normalization(self):
+        np.testing.assert_allclose(sentiment_weights(self.sentiment, 'net')[0], [1.0, 1 / 3, -1 / 3])
+
+    def test_net_near_zero_sum_holds_no_position(self):
+        weights = sentiment_weights(np.array([[0.3, -0.3000001]]), 'net')
+        np.testing.assert_array_equal(weights, [[0.0, 0.0]])
+        # Small positive net sums would otherwise give a huge gross exposure
+        sentiment = np.array([[0.3, -0.29]])
+        self.assertLessEqual(np.abs(sentiment_weights(sentiment, 'net')).sum(), 1 / MIN_NET_SHARE)
+
+    def test_net_negative_sum_never_goes_long_bearish_names(self):
+        weights = sentiment_weights(np.array([[-0.2, -0.4]]), 'net')
+        np.testing.assert_array_equal(weights, [[0.0, 0.0]])
+        np.testing.assert_allclose(sentiment_weights(np.array([[-0.2, -0.4]]), 'gross'), [[-1 / 3, -2 / 3]])
+
+    def test_zero_total_days_hold_no_position(self):
+        for normalization in ('net', 'gross', 'long_only'):
+            weights = sentiment_weights(self.sentiment, normalization)
+            self.assertTrue(np.isfinite(weights).all())
+            np.testing.assert_array_equal(weights[1], np.zeros(3))
+
+    def test_long_only(self):
+        np.testing.assert_allclose(sentiment_weights(self.sentiment, 'long_only')[2], [1.0, 0.0, 0.0])
+        np.testing.assert_array_equal(sentiment_weights(np.array([[-0.2, -0.4]]), 'long_only'), [[0.0, 0.0]])
+
+
+class TestSentimentPortfolioAnalysis(unittest.TestCase):
+    def test_portfolio_returns_use_gross_weights(self):
+        merged = pd.DataFrame({
+            'date': pd.to_datetime(['2020-06-01', '2020-06-01', '2020-06-02', '2020-06-02']),
+            'stock': ['A', 'B', 'A', 'B'],
+            'Close': [10.0, 20.0, 11.0, 18.0],
+            'sentiment_score': [0.0, 0.0, -0.2, -0.4],
+        })
+        analysis = SentimentPortfolioAnalysis(merged)
+        analysis.calculate_daily_returns()
+        analysis.assign_sentiment_weights()
+        analysis.calculate_portfolio_returns()
+        # Both names are bearish on day 2: short both, (-1/3 * 10%) + (-2/3 * -10%)
+        np.testing.assert_allclose(analysis.portfolio_returns['weighted_return'], [0.0, 0.1 / 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+from benchmark import synthetic_price_frame
+from report import MANIFEST_NAME, TICKER_CHARTS, ReportBuilder
+
+
+# Time a captured method spends before drawing, longer than saving a small figure
+METHOD_DELAY = 0.5
+
+
+class Charts:
+    def two_figures(self):
+        time.sleep(METHOD_DELAY)
+        for values in ([1, 3, 2], [2, 1, 3]):
+            plt.figure()
+            plt.plot(values)
+            plt.show()
+        return 'done'
+
+
+class TestReportBuilder(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.previous_backend = matplotlib.get_backend()
+        # A non-Agg backend standing in for a notebook's inline backend
+        plt.switch_backend('pdf')
+
+    def tearDown(self):
+        plt.switch_backend(self.previous_backend)
+        self.tmp_dir.cleanup()
+
+    def test_tickers_and_method_capture(self):
+        builder = ReportBuilder(self.tmp_dir.name, formats=('png', 'html'), n_jobs=2)
+        self.assertEqual(matplotlib.get_backend(), 'pdf')
+
+        builder.add_ticker_charts(synthetic_price_frame(n_tickers=2, n_bars=300), max_points=100)
+        result = builder.add_method(Charts(), 'two_figures', name='charts')
+        self.assertEqual(result, 'done')
+        self.assertEqual(matplotlib.get_backend(), 'pdf')
+        builder.write_manifest()
+
+        manifest = builder.manifest()
+        # Plotly charts are written as HTML (PNG needs kaleido), captured matplotlib figures as PNG and no HTML
+        ticker_rows = manifest[manifest['stock'].notna()]
+        self.assertEqual(sorted(ticker_rows['stock'].unique()), ['T000', 'T001'])
+        self.assertEqual(set(ticker_rows['chart']), set(TICKER_CHARTS))
+        self.assertGreaterEqual(len(ticker_rows), 2 * len(TICKER_CHARTS))
+        method_rows = manifest[manifest['stock'].isna()]
+        self.assertEqual(list(method_rows['chart']), ['charts_1', 'charts_2'])
+        self.assertEqual(set(method_rows['format']), {'png'})
+
+        for row in manifest.itertuples():
+            self.assertTrue(os.path.isfile(row.path), row.path)
+            self.assertEqual(os.path.getsize(row.path), row.bytes)
+            self.assertEqual(os.path.splitext(row.path)[1][1:], row.format)
+        # Each figure's time is its own save; the method's call time is recorded once
+        self.assertGreaterEqual(builder.method_seconds['charts'], METHOD_DELAY)
+        self.assertTrue((method_rows['seconds'] < METHOD_DELAY).all())
+
+        with open(os.path.join(self.tmp_dir.name, MANIFEST_NAME)) as f:
+            written = json.load(f)
+        self.assertEqual(len(written['files']), len(manifest))
+        self.assertEqual({entry['path'] for entry in written['files']}, set(manifest['path']))
+        self.assertIn('charts', written['method_seconds'])
+        self.assertTrue(np.isfinite(manifest['seconds']).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sentiment import SentimentAnalyzer
+
+
+class TestMergeSentimentStockPrice(unittest.TestCase):
+    def setUp(self):
+        # Dates as read from the price CSV files by load_csv_files
+        self.stock_data = pd.DataFrame({
+            'date': ['2020-06-01', '2020-06-02', '2020-06-03', '2020-06-01'],
+            'stock': ['AAPL', 'AAPL', 'AAPL', 'MSFT'],
+            'Close': [1.0, 2.0, 3.0, 4.0],
+        })
+        self.sentiment_data = pd.DataFrame({
+            'headline': ['a', 'b', 'c', 'd'],
+            'publisher': ['p'] * 4,
+            'date': ['2020-06-01 10:30:54-04:00', '2020-06-01 18:00:00-04:00', '2020-06-03 09:00:00',
+                     '2020-06-01 08:00:00-05:00'],
+            'stock': ['AAPL', 'AAPL', 'AAPL', 'MSFT'],
+            'sentiment_score': [0.5, -0.1, 0.2, -0.6],
+            'sentiment_category': ['positive', 'negative', 'positive', 'negative'],
+            'sentiment': [1, -1, 1, -1],
+        })
+
+    def test_aggregate_with_string_dates(self):
+        merged = SentimentAnalyzer.merge_sentiment_stock_price(self.stock_data, self.sentiment_data, aggregate=True)
+        self.assertEqual(len(merged), len(self.stock_data))
+        pd.testing.assert_series_equal(merged['date'], self.stock_data['date'])
+        np.testing.assert_array_equal(merged['article_count'], [2, 0, 1, 1])
+        np.testing.assert_allclose(merged['sentiment_mean'], [0.2, np.nan, 0.2, -0.6])
+
+    def test_aggregate_with_datetime_dates(self):
+        stock_data = self.stock_data.assign(date=pd.to_datetime(self.stock_data['date']))
+        merged = SentimentAnalyzer.merge_sentiment_stock_price(stock_data, self.sentiment_data, aggregate=True,
+                                                               session_close='16:00')
+        # The 18:00 headline counts towards the next session
+        np.testing.assert_array_equal(merged['article_count'], [1, 1, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
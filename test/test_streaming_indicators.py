@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from benchmark import synthetic_price_frame
+from indicators import compute_indicators
+from streaming_indicators import StreamingIndicators
+
+COLUMNS = ['SMA', 'RSI', 'MACD_Line', 'Signal_Line']
+
+
+class TestStreamingIndicators(unittest.TestCase):
+    def setUp(self):
+        self.df = synthetic_price_frame(n_tickers=4, n_bars=120)
+        self.expected = compute_indicators(self.df, group_column='stock')
+        self.tickers = pd.unique(self.df['stock'])
+        # (bars x tickers) closes and full-recompute indicators
+        self.closes = self.df.pivot(index='date', columns='stock', values='Close')[self.tickers]
+        self.wide = {column: self.df.assign(value=self.expected[column]).pivot(
+            index='date', columns='stock', values='value')[self.tickers] for column in COLUMNS}
+
+    def assert_row(self, result, row, tickers):
+        for column in COLUMNS:
+            np.testing.assert_allclose(result[column].to_numpy(), self.wide[column].iloc[row][tickers].to_numpy(),
+                                       rtol=1e-10, atol=1e-10, err_msg=f"{column} at bar {row}")
+
+    def test_bar_by_bar_matches_full_recompute(self):
+        state = StreamingIndicators(self.tickers)
+        for row in range(len(self.closes)):
+            result = state.update(self.closes.iloc[row])
+            self.assert_row(result, row, self.tickers)
+
+    def test_batches_after_history_match_full_recompute(self):
+        history = self.df[self.df['date'] < self.closes.index[60]]
+        state = StreamingIndicators.from_history(history)
+        first, second = self.tickers[:2], self.tickers[2:]
+        for row in range(60, len(self.closes)):
+            # Each bar arrives in two batches of tickers, the second in reverse order
+            self.assert_row(state.update(self.closes.iloc[row][first]), row, first)
+            self.assert_row(state.update(self.closes.iloc[row][second[::-1]]), row, second[::-1])
+
+    def test_from_history_then_update(self):
+        state = StreamingIndicators.from_history(self.df[self.df['date'] < self.closes.index[-1]])
+        self.assert_row(state.update(self.closes.iloc[-1]), len(self.closes) - 1, self.tickers)
+
+    def test_provisional_update_keeps_state(self):
+        state = StreamingIndicators.from_history(self.df[self.df['date'] < self.closes.index[-1]])
+        state.update(self.closes.iloc[-1] * 1.1, commit=False)
+        self.assert_row(state.update(self.closes.iloc[-1]), len(self.closes) - 1, self.tickers)
+
+    def test_duplicate_tickers_rejected(self):
+        state = StreamingIndicators(self.tickers)
+        closes = pd.Series([1.0, 2.0], index=[self.tickers[0], self.tickers[0]])
+        with self.assertRaises(ValueError):
+            state.update(closes)
+        self.assertTrue((state.sma.n_bars == 0).all())
+
+    def test_save_load_keeps_ticker_dtype(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for tickers in (pd.Index([101, 202, 303]), pd.Index(['AAPL', 'MSFT', 'TSLA'])):
+                with self.subTest(dtype=tickers.dtype):
+                    path = os.path.join(tmp_dir, 'state.npz')
+                    state = StreamingIndicators(tickers)
+                    state.update(pd.Series([1.0, 2.0, 3.0], index=tickers))
+                    state.save(path)
+                    loaded = StreamingIndicators.load(path)
+                    pd.testing.assert_index_equal(loaded.tickers, state.tickers)
+                    closes = pd.Series([1.5, 2.5, 3.5], index=tickers)
+                    pd.testing.assert_frame_equal(loaded.update(closes), state.update(closes))
+
+
+if __name__ == '__main__':
+    unittest.main()
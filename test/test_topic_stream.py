@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from topic_stream import OnlineTopicModel
+
+HEADLINES = [
+    'Apple shares rise after strong iPhone sales',
+    'Tesla stock falls on delivery miss',
+    'Fed raises interest rates again',
+    'Apple announces record quarterly revenue',
+    'Oil prices climb as supply tightens',
+    'Tesla expands factory in Germany',
+] * 20
+
+
+class TestOnlineTopicModel(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'topics.joblib')
+        model = OnlineTopicModel(num_topics=3, n_features=2 ** 10, batch_size=32)
+        model.partial_fit(HEADLINES)
+        model.save(self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_applies_runtime_parameters(self):
+        model = OnlineTopicModel.load_or_create(self.path, num_topics=3, n_jobs=2, batch_size=64)
+        self.assertEqual(model.lda.n_components, 3)
+        self.assertEqual(model.lda.n_jobs, 2)
+        self.assertEqual(model.lda.batch_size, 64)
+        self.assertEqual(model.n_documents, len(HEADLINES))
+
+    def test_load_rejects_conflicting_model_parameters(self):
+        with self.assertRaises(ValueError):
+            OnlineTopicModel.load_or_create(self.path, num_topics=20)
+        with self.assertRaises(ValueError):
+            OnlineTopicModel.load_or_create(self.path, n_features=2 ** 12)
+
+    def test_create_when_missing(self):
+        model = OnlineTopicModel.load_or_create(os.path.join(self.tmp_dir.name, 'missing.joblib'), num_topics=4)
+        self.assertEqual(model.lda.n_components, 4)
+        self.assertEqual(model.n_documents, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import walk_forward
+from walk_forward import EWMAMoments, RollingMoments, walk_forward_weights
+
+
+def synthetic_returns(n_days=400, n_assets=4, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.01, (n_days, n_assets)) + np.linspace(0, 0.001, n_assets)
+    return pd.DataFrame(returns, index=pd.bdate_range('2020-01-01', periods=n_days),
+                        columns=[f"S{i}" for i in range(n_assets)])
+
+
+class TestMoments(unittest.TestCase):
+    def test_rolling_matches_window_covariance(self):
+        values = synthetic_returns().to_numpy()
+        moments = RollingMoments(values.shape[1], 60)
+        for row in range(len(values)):
+            moments.add(values[row])
+            if moments.count > 60:
+                moments.remove(values[row - 60])
+        window = values[-60:]
+        np.testing.assert_allclose(moments.mean, window.mean(axis=0))
+        np.testing.assert_allclose(moments.covariance(), np.cov(window, rowvar=False), atol=1e-12)
+
+    def test_rolling_eligibility_tracks_missing_returns(self):
+        values = synthetic_returns(n_days=100).to_numpy()
+        values[:50, 1] = np.nan
+        moments = RollingMoments(values.shape[1], 30)
+        for row in range(70):
+            moments.add(values[row])
+            if moments.count > 30:
+                moments.remove(values[row - 30])
+        # Rows 40-69 still include missing returns of S1
+        np.testing.assert_array_equal(moments.eligible, [True, False, True, True])
+        np.testing.assert_allclose(moments.covariance()[0, 0], np.var(values[40:70, 0], ddof=1))
+
+    def test_ewma_restarts_listed_asset(self):
+        values = synthetic_returns(n_days=100).to_numpy()
+        values[:60, 2] = np.nan
+        moments = EWMAMoments(values.shape[1], halflife=10, min_periods=30)
+        for row in values:
+            moments.add(row)
+        reference = EWMAMoments(1, halflife=10, min_periods=30)
+        for value in values[60:, 2]:
+            reference.add(np.array([value]))
+        self.assertAlmostEqual(moments.mean[2], reference.mean[0])
+        self.assertAlmostEqual(moments.covariance()[2, 2], reference.covariance()[0, 0])
+        np.testing.assert_array_equal(moments.eligible, [True, True, True, True])
+
+
+class TestWalkForwardWeights(unittest.TestCase):
+    def test_unlisted_asset_excluded(self):
+        returns = synthetic_returns(n_days=600)
+        # Zero-filled, S3 would look riskless before its listing
+        returns.iloc[:300, 3] = np.nan
+        weights = walk_forward_weights(returns, window=120, rebalance_every=60, risk_free_rate=0.0)
+        before_listing = weights.index < returns.index[300 + 120 - 1]
+        self.assertTrue((weights.loc[before_listing, 'S3'] == 0).all())
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0, atol=1e-6)
+
+        expected = walk_forward_weights(returns.iloc[:, :3], window=120, rebalance_every=60, risk_free_rate=0.0)
+        np.testing.assert_allclose(weights.loc[before_listing, ['S0', 'S1', 'S2']],
+                                   expected.loc[weights.index[before_listing]], atol=1e-6)
+
+    def test_all_missing_rows_dropped(self):
+        returns = synthetic_returns(n_days=200)
+        with_gaps = returns.copy()
+        # A holiday row without any return
+        with_gaps.loc[pd.Timestamp('2020-03-01')] = np.nan
+        with_gaps = with_gaps.sort_index()
+        np.testing.assert_allclose(walk_forward_weights(with_gaps, window=60, rebalance_every=20),
+                                   walk_forward_weights(returns, window=60, rebalance_every=20))
+
+    def test_failed_solve_raises(self):
+        failed = SimpleNamespace(success=False, message='Iteration limit reached', x=np.full(4, 0.25))
+        with mock.patch.object(walk_forward, 'max_sharpe_weights', return_value=failed):
+            with self.assertRaises(ValueError):
+                walk_forward_weights(synthetic_returns(n_days=100), window=60, rebalance_every=20)
+
+
+if __name__ == '__main__':
+    unittest.main()